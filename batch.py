@@ -0,0 +1,237 @@
+# batch.py — Headless batch simulation over a grid of scenarios
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from bond_patterns import BOND_TYPES
+from wall import Wall
+from stride_optimiser import StrideOptimiser
+import instrumentation
+from robot_config import DEFAULT_CONFIG, ROBOT_FIELDS, add_robot_arguments
+
+# Column order for CSV output (JSONL uses the same keys)
+RESULT_FIELDS = [
+    "index", "bond_type", "rows", "wall_width", "stride_width", "stride_height", "seed", "robots",
+    *ROBOT_FIELDS,
+    "bricks", "strides", "avg_per_stride",
+    "stride_time", "stride_energy", "sequential_time", "sequential_energy",
+    "crew_makespan", "crew_energy", "crew_speedup",
+    "elapsed",
+]
+
+
+def scenario_config(scenario):
+    """
+    Returns the RobotConfig of a scenario; robot fields it leaves out keep their defaults.
+    """
+    values = {name: scenario[name] for name in ROBOT_FIELDS if name in scenario}
+    return DEFAULT_CONFIG._replace(max_stride_width_mm=scenario["stride_width"],
+                                   max_stride_height_mm=scenario["stride_height"], **values)
+
+
+def run_scenario(scenario):
+    """
+    Generates a wall, assigns strides and estimates time/energy for one scenario.
+
+    Args:
+        scenario (dict): bond_type, rows, wall_width, stride_width, stride_height, seed, robots, index,
+                         and optionally any of ROBOT_FIELDS
+
+    Returns:
+        dict with the scenario parameters (including its full robot config) and its results
+    """
+    start = time.perf_counter()
+    config = scenario_config(scenario)
+    wall = Wall(num_rows=scenario["rows"], bond_type=scenario["bond_type"],
+                wall_width=scenario["wall_width"], seed=scenario["seed"])
+    optimiser = StrideOptimiser(wall.wall_map, wall.wall_width, wall.wall_height, config=config)
+    bricks, strides, avg = optimiser.get_stride_metrics()
+    stride_time, stride_energy = optimiser.estimate_time_and_energy("stride")
+    sequential_time, sequential_energy = optimiser.estimate_time_and_energy("sequential")
+    # Every crew size, one robot included, goes through the same crew model so the
+    # crew columns compare like with like (a crew of one is scheduled only once)
+    crew = optimiser.plan_crew(scenario["robots"])
+
+    result = dict(scenario)
+    result.update({name: getattr(config, name) for name in ROBOT_FIELDS})
+    result.update(
+        bricks=bricks,
+        strides=strides,
+        avg_per_stride=round(avg, 4),
+        stride_time=stride_time,
+        stride_energy=round(stride_energy, 4),
+        sequential_time=sequential_time,
+        sequential_energy=round(sequential_energy, 4),
+        crew_makespan=crew.makespan,
+        crew_energy=round(crew.energy, 4),
+        crew_speedup=round(crew.speedup, 4),
+        elapsed=round(time.perf_counter() - start, 6),
+    )
+    return result
+
+
+def check_scenario(scenario):
+    """
+    Raises ValueError for a scenario that cannot be run.
+    """
+    robots = scenario["robots"]
+    if not isinstance(robots, int) or isinstance(robots, bool) or robots < 1:
+        where = f"scenario {scenario['index']}: " if "index" in scenario else ""
+        raise ValueError(f"{where}robots must be a whole number of at least 1, got {robots!r}")
+
+
+def build_grid(bond_types, rows, widths, stride_widths, stride_heights, seeds, robots=(1,), **robot_values):
+    """
+    Returns the cartesian product of all parameter lists as scenario dicts.
+    robot_values maps ROBOT_FIELDS names to lists of values; fields not
+    given take their DEFAULT_CONFIG value.
+
+    Example:
+        build_grid(["wild"], [20], [2300], [800], [1300], [1], brick_placement_time=[1.5, 2])
+    """
+    unknown = set(robot_values) - set(ROBOT_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown robot parameters: {', '.join(sorted(unknown))}")
+    robot_lists = [robot_values.get(name, [getattr(DEFAULT_CONFIG, name)]) for name in ROBOT_FIELDS]
+    for crew_size in robots:
+        check_scenario({"robots": crew_size})
+    grid = itertools.product(bond_types, rows, widths, stride_widths, stride_heights, seeds, robots, *robot_lists)
+    return [
+        {
+            "index": index,
+            "bond_type": bond_type,
+            "rows": num_rows,
+            "wall_width": width,
+            "stride_width": stride_width,
+            "stride_height": stride_height,
+            "seed": seed,
+            "robots": crew_size,
+            **dict(zip(ROBOT_FIELDS, robot)),
+        }
+        for index, (bond_type, num_rows, width, stride_width, stride_height, seed, crew_size, *robot)
+        in enumerate(grid)
+    ]
+
+
+def load_scenarios(path):
+    """
+    Reads explicit scenarios from a JSONL file, filling missing fields with defaults.
+    """
+    defaults = {
+        "bond_type": "stretcher", "rows": 20, "wall_width": 2300,
+        "stride_width": DEFAULT_CONFIG.max_stride_width_mm, "stride_height": DEFAULT_CONFIG.max_stride_height_mm,
+        "seed": 0, "robots": 1, **{name: getattr(DEFAULT_CONFIG, name) for name in ROBOT_FIELDS},
+    }
+    scenarios = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                scenario = dict(defaults, **json.loads(line))
+                scenario["index"] = len(scenarios)
+                check_scenario(scenario)
+                scenarios.append(scenario)
+    return scenarios
+
+
+def iter_results(scenarios, workers=None, ordered=False):
+    """
+    Runs scenarios across a process pool and yields results as they finish.
+    With ordered=True results are yielded in scenario order instead.
+    A single worker runs everything in-process.
+    """
+    if workers == 1:
+        yield from map(run_scenario, scenarios)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        if ordered:
+            chunksize = max(1, len(scenarios) // (4 * (workers or os.cpu_count() or 1)))
+            yield from pool.map(run_scenario, scenarios, chunksize=chunksize)
+        else:
+            futures = [pool.submit(run_scenario, s) for s in scenarios]
+            for future in as_completed(futures):
+                yield future.result()
+
+
+def write_results(results, out, fmt):
+    """
+    Streams results to an open file as CSV or JSONL. Returns the number written.
+    """
+    count = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(out, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+        for result in results:
+            writer.writerow(result)
+            out.flush()
+            count += 1
+    else:
+        for result in results:
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+            count += 1
+    return count
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run wall simulations headlessly over a grid of scenarios.")
+    parser.add_argument("--bond", nargs="+", choices=BOND_TYPES, default=["stretcher"], help="bond types")
+    parser.add_argument("--rows", nargs="+", type=int, default=[20], help="wall heights in rows")
+    parser.add_argument("--width", nargs="+", type=int, default=[2300], help="wall widths in mm")
+    parser.add_argument("--stride-width", nargs="+", type=int, default=[DEFAULT_CONFIG.max_stride_width_mm],
+                        help="robot stride widths in mm")
+    parser.add_argument("--stride-height", nargs="+", type=int, default=[DEFAULT_CONFIG.max_stride_height_mm],
+                        help="robot stride heights in mm")
+    add_robot_arguments(parser)
+    parser.add_argument("--seed", nargs="+", type=int, default=[0], help="random seeds (wild bond)")
+    parser.add_argument("--robots", nargs="+", type=int, default=[1], help="crew sizes for multi-robot planning")
+    parser.add_argument("--scenarios", help="JSONL file of explicit scenarios (overrides the grid options)")
+    parser.add_argument("--format", choices=("jsonl", "csv"), default="jsonl", help="output format")
+    parser.add_argument("--output", "-o", help="output file (default: stdout)")
+    parser.add_argument("--workers", type=int, default=None, help="process pool size (1 = in-process)")
+    parser.add_argument("--ordered", action="store_true", help="emit results in scenario order")
+    parser.add_argument("--instrument", action="store_true",
+                        help="print per-phase timings and counters to stderr (runs in-process)")
+    parser.add_argument("--profile", metavar="FILE", help="also write cProfile stats to FILE (runs in-process)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        if args.scenarios:
+            scenarios = load_scenarios(args.scenarios)
+        else:
+            scenarios = build_grid(args.bond, args.rows, args.width, args.stride_width, args.stride_height,
+                                   args.seed, args.robots, **{name: getattr(args, name) for name in ROBOT_FIELDS})
+    except ValueError as error:
+        sys.exit(f"batch.py: error: {error}")
+
+    workers = args.workers
+    if args.instrument or args.profile:
+        instrumentation.enable(args.profile)
+    if instrumentation.is_enabled():
+        workers = 1            # Timers and the profiler only see the current process
+
+    out = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    start = time.perf_counter()
+    try:
+        count = write_results(iter_results(scenarios, workers, args.ordered), out, args.format)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - start
+
+    rate = count / elapsed if elapsed > 0 else float("inf")
+    print(f"{count} scenarios in {elapsed:.2f} s ({rate:.1f} scenarios/sec)", file=sys.stderr)
+    instrumentation.report()
+
+
+if __name__ == "__main__":
+    main()
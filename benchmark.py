@@ -0,0 +1,205 @@
+# benchmark.py — Scaling benchmarks for generation, planning, rendering and progress tracking
+
+import argparse
+import io
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+
+from bond_patterns import BOND_TYPES
+from wall import Wall
+from stride_optimiser import StrideOptimiser
+
+# Named wall sizes as (rows, width in mm), from the default quest wall up to facade scale
+SIZES = {
+    "small": (10, 2300),
+    "medium": (50, 10000),
+    "large": (200, 30000),
+    "facade": (1000, 100000),
+}
+
+SEED = 1
+
+
+def _generate(bond_type, rows, width):
+    def run(_):
+        Wall(num_rows=rows, bond_type=bond_type, wall_width=width, seed=SEED)
+    return None, run
+
+
+def _assign_strides(bond_type, rows, width):
+    wall = Wall(num_rows=rows, bond_type=bond_type, wall_width=width, seed=SEED)
+    optimiser = StrideOptimiser(wall.wall_map, wall.wall_width, wall.wall_height)
+    return None, lambda _: optimiser.assign_strides()
+
+
+def _stride_order(bond_type, rows, width):
+    wall = Wall(num_rows=rows, bond_type=bond_type, wall_width=width, seed=SEED)
+    optimiser = StrideOptimiser(wall.wall_map, wall.wall_width, wall.wall_height)
+    # Drop the cached index so every run pays for the full ordering
+    return optimiser.invalidate, lambda _: optimiser.get_stride_order()
+
+
+def _display(bond_type, rows, width):
+    wall = Wall(num_rows=rows, bond_type=bond_type, wall_width=width, seed=SEED)
+
+    def run(_):
+        with redirect_stdout(io.StringIO()):
+            wall.display()
+    return None, run
+
+
+def _mark_next(bond_type, rows, width):
+    wall = Wall(num_rows=rows, bond_type=bond_type, wall_width=width, seed=SEED)
+
+    def run(_):
+        while wall.mark_next_brick_built():
+            pass
+    return wall.progress.reset, run
+
+
+# Operation name -> factory returning (untimed setup or None, timed run(state))
+OPERATIONS = {
+    "generate": _generate,
+    "assign_strides": _assign_strides,
+    "stride_order": _stride_order,
+    "display": _display,
+    "mark_next": _mark_next,
+}
+
+
+def measure(setup, run, repeat, min_time=0.0):
+    """
+    Times run() at least repeat times (best of) with tracing off, adding runs
+    until their total is at least min_time seconds so fast cases are not
+    judged on a handful of sub-millisecond samples. Then runs once more under
+    tracemalloc to record its peak memory.
+
+    Returns:
+        (best seconds, peak bytes, timed runs)
+    """
+    best = float("inf")
+    runs = total = 0
+    while runs < repeat or total < min_time:
+        state = setup() if setup else None
+        start = time.perf_counter()
+        run(state)
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        total += elapsed
+        runs += 1
+
+    state = setup() if setup else None
+    tracemalloc.start()
+    try:
+        run(state)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak, runs
+
+
+def run_benchmarks(bond_types, sizes, operations, repeat=3, log=None, min_time=0.0):
+    """
+    Runs every operation for every bond type and size. Yields one result dict per case.
+    """
+    for size in sizes:
+        rows, width = SIZES[size]
+        for bond_type in bond_types:
+            bricks = Wall(num_rows=rows, bond_type=bond_type, wall_width=width, seed=SEED).progress.total_bricks
+            for name in operations:
+                setup, run = OPERATIONS[name](bond_type, rows, width)
+                seconds, peak, runs = measure(setup, run, repeat, min_time)
+                result = {
+                    "operation": name, "bond_type": bond_type, "size": size,
+                    "rows": rows, "wall_width": width, "bricks": bricks,
+                    "seconds": round(seconds, 6),
+                    "runs": runs,
+                    "peak_kb": round(peak / 1024, 1),
+                    "bricks_per_sec": round(bricks / seconds, 1) if seconds > 0 else None,
+                }
+                if log:
+                    print(f"{name:<15}{bond_type:<10}{size:<8}{seconds * 1000:>10.2f} ms"
+                          f"{result['peak_kb']:>12.1f} KiB{result['bricks_per_sec'] or 0:>14.0f} bricks/s", file=log)
+                yield result
+
+
+def case_key(result):
+    return result["operation"], result["bond_type"], result["rows"], result["wall_width"]
+
+
+def compare(results, baseline, threshold, min_delta=0.0):
+    """
+    Compares results with a baseline run. A case only counts as a regression
+    if it is both more than threshold (relative) and more than min_delta
+    seconds (absolute) slower, so timer noise on very fast cases is ignored.
+
+    Returns:
+        List of (result, baseline seconds, ratio) for cases slower than (1 + threshold) x baseline
+    """
+    previous = {case_key(r): r for r in baseline["results"]}
+    regressions = []
+    for result in results:
+        before = previous.get(case_key(result))
+        if before is None or not before["seconds"]:
+            continue
+        ratio = result["seconds"] / before["seconds"]
+        if ratio > 1 + threshold and result["seconds"] - before["seconds"] > min_delta:
+            regressions.append((result, before["seconds"], ratio))
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark wall generation, stride planning, rendering and progress.")
+    parser.add_argument("--bond", nargs="+", choices=BOND_TYPES, default=list(BOND_TYPES), help="bond types")
+    parser.add_argument("--sizes", nargs="+", choices=tuple(SIZES), default=["small", "medium", "large"],
+                        help="wall sizes (add 'facade' for the largest)")
+    parser.add_argument("--ops", nargs="+", choices=tuple(OPERATIONS), default=list(OPERATIONS),
+                        help="operations to benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="minimum timed runs per case (best is kept)")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="keep repeating a case until its timed runs add up to this many seconds")
+    parser.add_argument("--output", "-o", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed slowdown over the baseline before a case counts as a regression")
+    parser.add_argument("--min-delta", type=float, default=0.001,
+                        help="smallest absolute slowdown in seconds that can count as a regression")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = list(run_benchmarks(args.bond, args.sizes, args.ops, args.repeat, log=sys.stderr,
+                                  min_time=args.min_time))
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "repeat": args.repeat,
+        "min_time": args.min_time,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.min_delta)
+        for result, before, ratio in regressions:
+            print(f"REGRESSION {result['operation']} {result['bond_type']} {result['size']}: "
+                  f"{before * 1000:.2f} ms -> {result['seconds'] * 1000:.2f} ms ({ratio:.2f}x)", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} (and {args.min_delta * 1000:g} ms) of baseline.",
+              file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+# bond_patterns.py — Course layouts for the periodic bonds and their template cache
+
+from array import array
+from collections import namedtuple
+from functools import lru_cache
+from brick import BRICK_LENGTH, HALF_BRICK_LENGTH, HEAD_JOINT
+from wall_store import FULL, HALF, FRONT
+
+# Every bond a Wall can generate
+BOND_TYPES = ("stretcher", "flemish", "wild")
+
+# Bonds whose courses repeat with period 2 (even / odd row)
+PERIODIC_BONDS = ("stretcher", "flemish")
+
+# One course as parallel typed arrays, matching the WallStore column types
+CourseTemplate = namedtuple("CourseTemplate", ["types", "xs", "lengths"])
+
+
+def stretcher_course(row_index, width):
+    """
+    Standard brick pattern with a half-brick offset on odd rows.
+    Returns (types, xs, lengths) lists for one course.
+    """
+    types, xs, lengths = [], [], []
+    offset = HALF_BRICK_LENGTH + HEAD_JOINT if row_index % 2 == 1 else 0
+    remaining = width - offset
+
+    if offset > 0:
+        types.append(HALF); xs.append(0); lengths.append(HALF_BRICK_LENGTH)
+
+    while remaining >= BRICK_LENGTH + HEAD_JOINT:
+        types.append(FULL); xs.append(width - remaining)
+        lengths.append(BRICK_LENGTH)
+        remaining -= (BRICK_LENGTH + HEAD_JOINT)
+
+    # Optionally add trailing half-brick if it fits
+    if row_index % 2 == 1 and remaining >= HALF_BRICK_LENGTH:
+        types.append(HALF); xs.append(width - remaining)
+        lengths.append(HALF_BRICK_LENGTH)
+
+    return types, xs, lengths
+
+
+def flemish_course(row_index, width):
+    """
+    Alternates between full bricks and headers ("front" bricks),
+    staggered every row like Flemish bond. Returns (types, xs, lengths) lists.
+    """
+    types, xs, lengths = [], [], []
+    current_pos = 0
+
+    # Alternate offset for even/odd rows
+    offset = HALF_BRICK_LENGTH + HEAD_JOINT if row_index % 2 == 1 else 0
+    if offset > 0:
+        types.append(HALF); xs.append(0); lengths.append(HALF_BRICK_LENGTH)
+        current_pos += offset
+
+    # Alternate between stretcher and header
+    while current_pos + BRICK_LENGTH + HEAD_JOINT <= width:
+        xs.append(current_pos)
+        if (len(types) + row_index) % 2 == 0:
+            types.append(FULL); lengths.append(BRICK_LENGTH)
+            current_pos += BRICK_LENGTH + HEAD_JOINT
+        else:
+            types.append(FRONT); lengths.append(HALF_BRICK_LENGTH)
+            current_pos += HALF_BRICK_LENGTH + HEAD_JOINT
+
+    # Add any trailing brick if fits
+    remaining = width - current_pos
+    if remaining >= BRICK_LENGTH:
+        types.append(FULL); xs.append(current_pos); lengths.append(BRICK_LENGTH)
+    elif remaining >= HALF_BRICK_LENGTH:
+        types.append(HALF); xs.append(current_pos); lengths.append(HALF_BRICK_LENGTH)
+
+    return types, xs, lengths
+
+
+COURSE_BUILDERS = {
+    "stretcher": stretcher_course,
+    "flemish": flemish_course,
+}
+
+
+@lru_cache(maxsize=64)
+def _templates(bond_type, width, geometry):
+    build = COURSE_BUILDERS[bond_type]
+    templates = []
+    for row_index in (0, 1):
+        types, xs, lengths = build(row_index, width)
+        templates.append(CourseTemplate(array("b", types), array("l", xs), array("H", lengths)))
+    return tuple(templates)
+
+
+def course_templates(bond_type, width):
+    """
+    Returns the (even, odd) CourseTemplate pair for a periodic bond.
+    Templates are computed once per (bond type, width, brick geometry) and
+    shared by every wall that uses them, so they must be treated as read-only.
+    """
+    return _templates(bond_type, width, (BRICK_LENGTH, HALF_BRICK_LENGTH, HEAD_JOINT))
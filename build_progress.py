@@ -0,0 +1,185 @@
+# build_progress.py — Incremental build-progress tracking over a WallStore
+
+from array import array
+from wall_store import GAP
+
+
+class BuildProgress:
+    """
+    Tracks which bricks of a wall have been placed.
+    Keeps a persistent cursor to the first unbuilt brick plus built-count
+    counters per row and per stride, so marking and progress queries never
+    rescan the wall.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.cursor = 0                                  # No unbuilt brick before this index
+        self.history = []                                # Brick indices in the order they were built
+        self.epoch = 0                                   # Bumped whenever bricks are un-built (undo / reset)
+        self.row_totals = array("L", [0] * store.num_rows)
+        self.row_built = array("L", [0] * store.num_rows)
+        self.total_bricks = 0
+        self.built_count = 0
+        self._stride_totals = None                       # Built lazily on first stride query
+        self._stride_built = None
+        self._stride_members = None
+        self._stride_cursors = None
+        self._stride_version = None
+        self._count_rows()
+
+    def _count_rows(self):
+        """
+        One-off pass that fills the per-row counters from the store.
+        """
+        store = self.store
+        types, built = store.type, store.built
+        for row_index in range(store.num_rows):
+            start, end = store.row_range(row_index)
+            # Gap entries are pre-built whitespace, not bricks (type codes are single bytes)
+            gaps = types[start:end].tobytes().count(GAP)
+            total = end - start - gaps
+            done = sum(built[start:end]) - gaps
+            self.row_totals[row_index] = total
+            self.row_built[row_index] = done
+            self.total_bricks += total
+            self.built_count += done
+
+    def _stride_state(self):
+        """
+        Returns per-stride totals, built counts, members and cursors,
+        rebuilding them if the store's stride assignment has changed.
+        """
+        store = self.store
+        if self._stride_version != store.stride_version:
+            totals, done, members = {}, {}, {}
+            types, built, strides = store.type, store.built, store.stride
+            for i, sid in enumerate(strides):
+                if types[i] == GAP:
+                    continue
+                totals[sid] = totals.get(sid, 0) + 1
+                done[sid] = done.get(sid, 0) + built[i]
+                members.setdefault(sid, array("L")).append(i)
+            self._stride_totals = totals
+            self._stride_built = done
+            self._stride_members = members
+            self._stride_cursors = dict.fromkeys(members, 0)
+            self._stride_version = store.stride_version
+        return self._stride_totals, self._stride_built, self._stride_members, self._stride_cursors
+
+    def _set_built(self, index):
+        store = self.store
+        store.built[index] = 1
+        self.history.append(index)
+        self.row_built[store.row[index]] += 1
+        self.built_count += 1
+        if self._stride_version == store.stride_version:
+            sid = store.stride[index]
+            self._stride_built[sid] += 1
+
+    def mark(self, index):
+        """
+        Marks a specific brick as built. Returns False if it was already built.
+        """
+        if self.store.built[index]:
+            return False
+        self._set_built(index)
+        return True
+
+    def mark_next(self):
+        """
+        Marks the next unbuilt brick in row order as built.
+        Returns its index, or None once the wall is complete.
+        """
+        built = self.store.built
+        cursor = self.cursor
+        end = len(built)
+        while cursor < end and built[cursor]:
+            cursor += 1
+        self.cursor = cursor
+        if cursor == end:
+            return None
+        self._set_built(cursor)
+        return cursor
+
+    def mark_next_in_stride(self, sid):
+        """
+        Marks the next unbuilt brick of the given stride key as built.
+        Returns its index, or None once the stride is complete.
+        """
+        _, _, members, cursors = self._stride_state()
+        bricks = members.get(sid)
+        if bricks is None:
+            return None
+        built = self.store.built
+        pos = cursors[sid]
+        while pos < len(bricks) and built[bricks[pos]]:
+            pos += 1
+        cursors[sid] = pos
+        if pos == len(bricks):
+            return None
+        self._set_built(bricks[pos])
+        return bricks[pos]
+
+    def undo(self):
+        """
+        Un-builds the most recently placed brick. Returns its index, or None if nothing was built.
+        """
+        if not self.history:
+            return None
+        store = self.store
+        index = self.history.pop()
+        store.built[index] = 0
+        self.epoch += 1
+        self.row_built[store.row[index]] -= 1
+        self.built_count -= 1
+        self.cursor = min(self.cursor, index)
+        if self._stride_version == store.stride_version:
+            sid = store.stride[index]
+            self._stride_built[sid] -= 1
+            members = self._stride_members[sid]
+            # Members are stored in index order, so the cursor can only move back
+            pos = self._stride_cursors[sid]
+            while pos > 0 and members[pos - 1] >= index:
+                pos -= 1
+            self._stride_cursors[sid] = pos
+        return index
+
+    def reset(self):
+        """
+        Marks every brick as unbuilt again. Gap entries stay built.
+        """
+        store = self.store
+        types, built = store.type, store.built
+        for i in range(len(built)):
+            built[i] = 1 if types[i] == GAP else 0
+        self.cursor = 0
+        self.history.clear()
+        self.row_built = array("L", [0] * store.num_rows)
+        self.built_count = 0
+        self.epoch += 1
+        self._stride_version = None
+
+    def is_complete(self):
+        return self.built_count == self.total_bricks
+
+    def percent_complete(self):
+        """
+        Returns overall build progress as a percentage.
+        """
+        return 100.0 * self.built_count / self.total_bricks if self.total_bricks else 100.0
+
+    def row_percent(self, row_index):
+        """
+        Returns build progress of a single course as a percentage.
+        """
+        total = self.row_totals[row_index]
+        return 100.0 * self.row_built[row_index] / total if total else 100.0
+
+    def stride_percent(self, sid):
+        """
+        Returns build progress of a single stride (by stride key) as a percentage.
+        """
+        totals, done, _, _ = self._stride_state()
+        total = totals.get(sid, 0)
+        return 100.0 * done.get(sid, 0) / total if total else 100.0
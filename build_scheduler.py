@@ -0,0 +1,168 @@
+# build_scheduler.py — Support-aware build ordering with robot move costs
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from heapq import heapify, heappop, heappush
+from operator import sub
+from robot_config import DEFAULT_CONFIG
+from wall_store import GAP, stride_parts
+
+# Result of scheduling: brick indices in build order plus the robot moves it needs
+BuildSchedule = namedtuple("BuildSchedule", ["order", "horizontal_moves", "vertical_moves", "move_time"])
+
+
+def _row_extents(store, row_index):
+    """
+    Returns (first brick index, starts, ends) for a course, skipping any gap entry.
+    """
+    start, end = store.row_range(row_index)
+    if start < end and store.type[start] == GAP:
+        start += 1
+    xs = store.x[start:end]
+    ends = [x + ln for x, ln in zip(xs, store.length[start:end])]
+    return start, xs, ends
+
+
+def support_ranges(store, first_row=0):
+    """
+    Builds the support DAG of a wall from brick x-extents between adjacent courses.
+    A brick rests on every brick of the course below whose extent overlaps its own;
+    because courses are sorted by x, those always form one contiguous index range.
+    With first_row, only courses from first_row up (and the links down to the
+    course beneath it) are filled in; entries below stay zero.
+
+    Returns:
+        (below_lo, below_hi, above_lo, above_hi) arrays: for brick i, the bricks
+        supporting it are below_lo[i]..below_hi[i] - 1 and the bricks resting on
+        it are above_lo[i]..above_hi[i] - 1.
+    """
+    size = len(store)
+    below_lo, below_hi = array("L", [0]) * size, array("L", [0]) * size
+    above_lo, above_hi = array("L", [0]) * size, array("L", [0]) * size
+
+    lower = _row_extents(store, first_row - 1) if first_row > 0 else None
+    for row_index in range(first_row, store.num_rows):
+        upper = _row_extents(store, row_index)
+        if lower is not None:
+            low_first, low_xs, low_ends = lower
+            up_first, up_xs, up_ends = upper
+            # Overlap test a.x < b.end and a.end > b.x, found by bisection on each side
+            for k, (x, end) in enumerate(zip(up_xs, up_ends)):
+                below_lo[up_first + k] = low_first + bisect_right(low_ends, x)
+                below_hi[up_first + k] = low_first + bisect_left(low_xs, end)
+            for k, (x, end) in enumerate(zip(low_xs, low_ends)):
+                above_lo[low_first + k] = up_first + bisect_right(up_ends, x)
+                above_hi[low_first + k] = up_first + bisect_left(up_xs, end)
+        lower = upper
+
+    return below_lo, below_hi, above_lo, above_hi
+
+
+def _next_stride(current, direction, ready):
+    """
+    Picks the stride to move to once the current one has no ready bricks.
+    Returns (stride key, sweep direction).
+    """
+    block, col = stride_parts(current)
+    lowest = min(stride_parts(sid)[0] for sid in ready)
+    candidates = [sid for sid in ready if stride_parts(sid)[0] == lowest]
+    if lowest == block:
+        ahead = [sid for sid in candidates if (stride_parts(sid)[1] - col) * direction > 0]
+        if not ahead:
+            direction = -direction
+            ahead = candidates
+        candidates = ahead
+    next_key = min(candidates, key=lambda sid: (abs(stride_parts(sid)[1] - col), sid))
+    return next_key, direction
+
+
+def schedule_build(store, first_row=0, skip_built=False, config=DEFAULT_CONFIG):
+    """
+    Produces a build order that never places a brick before the bricks it rests on,
+    while keeping robot repositioning cheap.
+
+    Uses incremental topological ordering: each brick keeps a count of unplaced
+    supports and becomes ready when it drops to zero. The robot keeps building
+    its current stride while it has ready bricks (lowest course first). It then
+    stays in the lowest vertical block that has ready bricks, sweeping back and
+    forth across it and moving to the nearest ready stride in its direction of
+    travel, which avoids costly vertical moves between partly built blocks.
+
+    With skip_built, built bricks count as already placed and are left out of
+    the order, and courses below first_row (which must be complete) are not
+    visited, so re-planning the top of a mostly built wall only costs the
+    remaining courses.
+
+    move_time is costed with the given RobotConfig.
+
+    Returns:
+        BuildSchedule(order, horizontal_moves, vertical_moves, move_time)
+    """
+    types, strides, built = store.type, store.stride, store.built
+    below_lo, below_hi, above_lo, above_hi = support_ranges(store, first_row)
+    pending = array("L", map(sub, below_hi, below_lo))
+    first = store.row_range(first_row)[0] if first_row < store.num_rows else len(store)
+
+    # Ready bricks grouped by stride, each group a min-heap of brick indices
+    ready = {}
+    for i in range(first, len(store)):
+        if types[i] == GAP or (skip_built and built[i]):
+            continue
+        if skip_built and pending[i]:
+            pending[i] -= sum(built[below_lo[i]:below_hi[i]])
+        if pending[i] == 0:
+            ready.setdefault(strides[i], []).append(i)
+    for heap in ready.values():
+        heapify(heap)
+
+    order = array("L")
+    horizontal_moves = vertical_moves = 0
+    current = None
+    direction = 1               # +1 sweeping right, -1 sweeping left
+    while ready:
+        if current not in ready:
+            if current is None:
+                current = min(ready)
+            else:
+                next_key, direction = _next_stride(current, direction, ready)
+                from_block, from_col = stride_parts(current)
+                to_block, to_col = stride_parts(next_key)
+                horizontal_moves += abs(to_col - from_col)
+                vertical_moves += abs(to_block - from_block)
+                current = next_key
+
+        heap = ready[current]
+        i = heappop(heap)
+        if not heap:
+            del ready[current]
+        order.append(i)
+
+        for j in range(above_lo[i], above_hi[i]):
+            if skip_built and built[j]:
+                continue            # Already in place (e.g. built out of order), never scheduled
+            pending[j] -= 1
+            if pending[j] == 0:
+                heap = ready.get(strides[j])
+                if heap is None:
+                    ready[strides[j]] = [j]
+                else:
+                    heappush(heap, j)
+
+    move_time = horizontal_moves * config.horizontal_move_time + vertical_moves * config.vertical_move_time
+    return BuildSchedule(order, horizontal_moves, vertical_moves, move_time)
+
+
+def validate_order(store, order):
+    """
+    Checks that every brick in the order comes after all of its supports.
+    Returns the index of the first offending brick, or None if the order is valid.
+    """
+    below_lo, below_hi, _, _ = support_ranges(store)
+    placed = bytearray(len(store))
+    for i in order:
+        for k in range(below_lo[i], below_hi[i]):
+            if not placed[k]:
+                return i
+        placed[i] = 1
+    return None
@@ -0,0 +1,179 @@
+# crew_planner.py — Splits a stride plan across several robots working one facade
+
+from collections import namedtuple
+from heapq import heappop, heappush
+from robot_config import DEFAULT_CONFIG
+from build_scheduler import support_ranges
+from wall_store import GAP_STRIDE, stride_parts, stride_label
+
+# One stride built by one robot, with start / end times in seconds
+RobotTask = namedtuple("RobotTask", ["stride", "label", "start", "end"])
+
+# Result of crew planning; timelines holds one list of RobotTask per robot
+CrewPlan = namedtuple("CrewPlan", [
+    "robots", "timelines", "makespan", "energy", "single_robot_makespan", "speedup",
+])
+
+
+def stride_tasks(index):
+    """
+    Returns {stride key: (x_min, x_max, bricks)} for every stride of a StrideIndex.
+    """
+    store = index.store
+    xs, lengths = store.x, store.length
+    tasks = {}
+    for sid in index.keys:
+        ranges = index.ranges[sid]
+        x_min = min(xs[start] for start, _ in ranges)
+        x_max = max(xs[end - 1] + lengths[end - 1] for _, end in ranges)
+        tasks[sid] = (x_min, x_max, index.counts[sid])
+    return tasks
+
+
+def block_dependencies(store):
+    """
+    Returns {stride key: set of stride keys in lower blocks it rests on}.
+    Derived from the brick support DAG, so only strides that actually carry
+    a brick of the next block up become prerequisites.
+    """
+    below_lo, below_hi, _, _ = support_ranges(store)
+    strides = store.stride
+    depends = {}
+    for i, sid in enumerate(strides):
+        if sid == GAP_STRIDE or below_lo[i] == below_hi[i]:
+            continue
+        block = stride_parts(sid)[0]
+        for k in range(below_lo[i], below_hi[i]):
+            support = strides[k]
+            if support != GAP_STRIDE and stride_parts(support)[0] != block:
+                depends.setdefault(sid, set()).add(support)
+    return depends
+
+
+def _too_close(extent, running, min_separation):
+    """
+    True if a stride's x-extent comes within min_separation of any running stride.
+    """
+    x_min, x_max = extent
+    for other_min, other_max in running:
+        if max(x_min, other_min) - min(x_max, other_max) < min_separation:
+            return True
+    return False
+
+
+def _move_time(from_key, to_key, config):
+    """
+    Repositioning time into a stride: one horizontal move, plus a vertical
+    move if the robot changes block. A robot's first stride needs no vertical move.
+    """
+    if from_key is None or stride_parts(from_key)[0] == stride_parts(to_key)[0]:
+        return config.horizontal_move_time
+    return config.horizontal_move_time + config.vertical_move_time
+
+
+def _schedule(tasks, depends, robots, min_separation, config):
+    """
+    Event-driven list scheduling. Whenever robots are idle they take the ready
+    stride in the lowest block closest to their last stride, provided it keeps
+    min_separation mm clear of every stride being built at that moment.
+
+    Returns:
+        (timelines, makespan, busy seconds, number of moves)
+    """
+    pending = {sid: len(depends.get(sid, ())) for sid in tasks}
+    dependents = {}
+    for sid, supports in depends.items():
+        for support in supports:
+            dependents.setdefault(support, []).append(sid)
+    ready = {sid for sid, waiting in pending.items() if waiting == 0}
+
+    timelines = [[] for _ in range(robots)]
+    position = [None] * robots      # Last stride each robot built
+    idle = list(range(robots))
+    running = {}                    # Robot -> x-extent of the stride it is building
+    events = []                     # (finish time, robot, stride key)
+    clock = 0
+    busy = moves = 0
+
+    while ready or events:
+        for robot in sorted(idle):
+            here = position[robot]
+            best = None
+            for sid in ready:
+                x_min, x_max, _ = tasks[sid]
+                if _too_close((x_min, x_max), running.values(), min_separation):
+                    continue
+                block, col = stride_parts(sid)
+                near = abs(col - stride_parts(here)[1]) if here is not None else col
+                rank = (block, near, sid)
+                if best is None or rank < best:
+                    best = rank
+            if best is None:
+                continue
+            sid = best[2]
+            ready.discard(sid)
+            duration = _move_time(here, sid, config) + tasks[sid][2] * config.brick_placement_time
+            moves += 1
+            busy += duration
+            timelines[robot].append(RobotTask(sid, stride_label(sid), clock, clock + duration))
+            position[robot] = sid
+            running[robot] = tasks[sid][:2]
+            idle.remove(robot)
+            heappush(events, (clock + duration, robot, sid))
+
+        if not events:
+            break
+        clock, robot, sid = heappop(events)
+        finished = [(robot, sid)]
+        # Release every robot finishing at the same instant before reassigning
+        while events and events[0][0] == clock:
+            _, other, other_sid = heappop(events)
+            finished.append((other, other_sid))
+        for robot, sid in finished:
+            del running[robot]
+            idle.append(robot)
+            for above in dependents.get(sid, ()):
+                pending[above] -= 1
+                if pending[above] == 0:
+                    ready.add(above)
+
+    return timelines, clock, busy, moves
+
+
+def plan_crew(index, robots=2, min_separation=None, config=DEFAULT_CONFIG):
+    """
+    Splits the strides of an assigned wall across several robots.
+
+    Each stride is one task: a repositioning move (plus a vertical move when the
+    robot changes block) followed by its brick placements. A stride may start
+    only once every lower-block stride its bricks rest on is finished, and two
+    robots never work on strides closer than min_separation mm horizontally.
+
+    Args:
+        index: StrideIndex of the wall (see StrideOptimiser.stride_index)
+        robots (int): Crew size
+        min_separation (int): Horizontal clearance (mm) kept between working robots
+                              (default: the config's max stride width)
+        config (RobotConfig): Robot timing and energy parameters
+
+    Returns:
+        CrewPlan with per-robot timelines, makespan (s), energy (kWh),
+        the single-robot makespan under the same model and the speedup over it.
+    """
+    if robots < 1:
+        raise ValueError("Crew needs at least one robot")
+    if min_separation is None:
+        min_separation = config.max_stride_width_mm
+    tasks = stride_tasks(index)
+    depends = block_dependencies(index.store)
+
+    timelines, makespan, busy, moves = _schedule(tasks, depends, robots, min_separation, config)
+    # Robots only draw power while working, so crew energy follows total busy time
+    energy = busy * config.energy_per_second + moves * config.move_energy_kwh
+
+    if robots == 1:
+        single = makespan
+    else:
+        _, single, _, _ = _schedule(tasks, depends, 1, min_separation, config)
+    speedup = single / makespan if makespan else 1.0
+    return CrewPlan(robots, timelines, makespan, energy, single, speedup)
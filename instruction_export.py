@@ -0,0 +1,301 @@
+# instruction_export.py — Streaming pick-and-place instruction export (JSONL or binary)
+
+import argparse
+import json
+import struct
+import sys
+import time
+import zlib
+from collections import namedtuple
+
+from bond_patterns import BOND_TYPES
+from brick import COURSE_HEIGHT
+from plan_format import PREFIX, load_plan
+from robot_config import DEFAULT_CONFIG
+from simulation import move_time
+from stride_optimiser import ENGINES, StrideOptimiser
+from wall import Wall
+from wall_store import GAP, TYPE_NAMES, stride_key, stride_label, stride_parts
+
+# Binary layout:
+#   prefix   magic, format version, header length (same prefix struct as plan files)
+#   header   UTF-8 JSON: wall geometry, record size, first segment
+#   records  fixed-size RECORD structs, little-endian:
+#              op, brick type, block, stride column, (pad), seq, brick, x, y, move time
+#            For OP_CHECKSUM records, seq holds the segment's instruction count,
+#            brick its CRC-32, and x the segment number.
+#   trailer  one OP_END record: seq holds the total number of segments in the
+#            plan, brick the number of instructions in this file
+MAGIC = b"WALLCMDS"
+VERSION = 2
+RECORD = struct.Struct("<BBHHxxIIddf")
+
+OP_PLACE = 1
+OP_MOVE = 2
+OP_CHECKSUM = 3
+OP_END = 4
+OP_NAMES = {OP_PLACE: "place", OP_MOVE: "move", OP_CHECKSUM: "checksum", OP_END: "end"}
+
+BUFFER_SIZE = 1 << 20                  # Bytes collected before each bulk write
+
+# One controller command. x / y are absolute wall coordinates in mm (brick
+# bottom-left); for a move they are the first brick of the target stride.
+Instruction = namedtuple("Instruction", ["op", "seq", "brick", "brick_type", "block", "col", "x", "y", "time"])
+
+# Closes a segment: a run of instructions within one vertical block
+Checksum = namedtuple("Checksum", ["segment", "block", "count", "crc32"])
+
+# Ends a stream: total segments of the plan and instructions in this stream,
+# so a truncated file can be told from a complete one
+End = namedtuple("End", ["segments", "instructions"])
+
+# Result of an export
+ExportSummary = namedtuple("ExportSummary", ["instructions", "segments", "bytes", "seconds"])
+
+
+def encode(instruction):
+    """
+    Packs an Instruction into its binary record.
+    """
+    return RECORD.pack(instruction.op, instruction.brick_type, instruction.block, instruction.col,
+                       instruction.seq, instruction.brick, instruction.x, instruction.y, instruction.time)
+
+
+def iter_instructions(store, order, start_segment=0, skip_built=True, config=DEFAULT_CONFIG):
+    """
+    Walks a build order and yields Instructions, closing every segment (a
+    run of consecutive bricks in the same vertical block) with a Checksum
+    over the binary records of its instructions. Only the running segment
+    state is kept, so memory does not grow with the plan.
+
+    Args:
+        store: WallStore with assigned strides
+        order: brick indices in build order (e.g. BuildSchedule.order)
+        start_segment (int): resume point; earlier segments are walked but not
+                             yielded, so seq numbers and checksums match a full export
+        skip_built (bool): leave out bricks already marked built
+        config (RobotConfig): robot parameters used for move times
+
+    Yields:
+        Instruction and Checksum records, then one End record
+    """
+    types, xs, rows, strides, built = store.type, store.x, store.row, store.stride, store.built
+    seq = segment = count = crc = written = 0
+    block = current = None
+
+    for i in order:
+        if types[i] == GAP or (skip_built and built[i]):
+            continue
+        sid = strides[i]
+        sid_block, col = stride_parts(sid)
+        if block is not None and sid_block != block:
+            if segment >= start_segment:
+                yield Checksum(segment, block, count, crc)
+            segment += 1
+            count = crc = 0
+        block = sid_block
+        x, y = float(xs[i]), rows[i] * COURSE_HEIGHT
+
+        steps = []
+        if sid != current:
+            steps.append(Instruction(OP_MOVE, seq, i, 0, sid_block, col, x, y, move_time(current, sid, config)))
+            seq += 1
+            current = sid
+        steps.append(Instruction(OP_PLACE, seq, i, types[i], sid_block, col, x, y, 0.0))
+        seq += 1
+
+        for instruction in steps:
+            crc = zlib.crc32(encode(instruction), crc)
+            count += 1
+            if segment >= start_segment:
+                written += 1
+                yield instruction
+
+    if block is not None:
+        if segment >= start_segment:
+            yield Checksum(segment, block, count, crc)
+        segment += 1
+    yield End(segment, written)
+
+
+def _json_record(record):
+    if isinstance(record, Checksum):
+        return {"op": "checksum", **record._asdict()}
+    if isinstance(record, End):
+        return {"op": "end", **record._asdict()}
+    data = {"op": OP_NAMES[record.op], "seq": record.seq, "brick": record.brick,
+            "stride": stride_label(stride_key(record.block, record.col)), "x": record.x, "y": record.y}
+    if record.op == OP_PLACE:
+        data["type"] = TYPE_NAMES[record.brick_type]
+    else:
+        data["time"] = record.time
+    return data
+
+
+def _binary_record(record):
+    if isinstance(record, Checksum):
+        return RECORD.pack(OP_CHECKSUM, 0, record.block, 0, record.count, record.crc32,
+                           float(record.segment), 0.0, 0.0)
+    if isinstance(record, End):
+        return RECORD.pack(OP_END, 0, 0, 0, record.segments, record.instructions, 0.0, 0.0, 0.0)
+    return encode(record)
+
+
+def write_instructions(out, records, header, fmt="jsonl"):
+    """
+    Writes a header and a stream of records to a binary file object, buffering
+    BUFFER_SIZE bytes per write.
+
+    Returns:
+        (instructions written, segments closed, bytes written)
+    """
+    if fmt == "binary":
+        header_bytes = json.dumps(dict(header, record_size=RECORD.size)).encode("utf-8")
+        buffer = bytearray(PREFIX.pack(MAGIC, VERSION, len(header_bytes)) + header_bytes)
+        to_bytes = _binary_record
+    else:
+        buffer = bytearray(json.dumps({"op": "header", **header}).encode("utf-8") + b"\n")
+        to_bytes = lambda record: json.dumps(_json_record(record)).encode("utf-8") + b"\n"
+
+    instructions = segments = written = 0
+    for record in records:
+        buffer += to_bytes(record)
+        if isinstance(record, Checksum):
+            segments += 1
+        elif isinstance(record, Instruction):
+            instructions += 1
+        if len(buffer) >= BUFFER_SIZE:
+            out.write(buffer)
+            written += len(buffer)
+            buffer.clear()
+    out.write(buffer)
+    written += len(buffer)
+    return instructions, segments, written
+
+
+def export_instructions(path, wall, optimiser, fmt="jsonl", start_segment=0):
+    """
+    Exports a wall's scheduled build order as controller instructions.
+
+    Returns:
+        ExportSummary
+    """
+    start = time.perf_counter()
+    order = optimiser.get_build_schedule().order
+    header = {
+        "bond_type": wall.bond_type, "wall_width": wall.wall_width, "rows": wall.rows,
+        "seed": wall.seed, "course_height": COURSE_HEIGHT, "start_segment": start_segment,
+    }
+    records = iter_instructions(wall.store, order, start_segment, config=optimiser.config)
+    with open(path, "wb") as out:
+        instructions, segments, written = write_instructions(out, records, header, fmt)
+    return ExportSummary(instructions, segments, written, time.perf_counter() - start)
+
+
+def read_binary(path):
+    """
+    Reads a binary instruction file. Returns its header and a generator of
+    Instruction / Checksum / End records, decoded one buffered chunk at a time.
+    """
+    f = open(path, "rb")
+    magic, version, header_size = PREFIX.unpack(f.read(PREFIX.size))
+    if magic != MAGIC or version != VERSION:
+        f.close()
+        raise ValueError(f"{path} is not a version {VERSION} instruction file")
+    header = json.loads(f.read(header_size))
+
+    def records():
+        with f:
+            chunk_size = RECORD.size * (BUFFER_SIZE // RECORD.size)
+            while chunk := f.read(chunk_size):
+                chunk = chunk[:len(chunk) - len(chunk) % RECORD.size]     # Ignore a torn final record
+                for op, brick_type, block, col, seq, brick, x, y, move in RECORD.iter_unpack(chunk):
+                    if op == OP_CHECKSUM:
+                        yield Checksum(int(x), block, seq, brick)
+                    elif op == OP_END:
+                        yield End(seq, brick)
+                    else:
+                        yield Instruction(op, seq, brick, brick_type, block, col, x, y, move)
+
+    return header, records()
+
+
+def verify_segments(records, start_segment=0):
+    """
+    Recomputes each segment's checksum from its instructions.
+    Yields (segment, block, ok) per segment from start_segment on; a
+    controller resumes from the first segment that is not ok.
+
+    Besides checksum mismatches, a stream is reported as failed where it is
+    incomplete: instructions after the last Checksum, segments missing
+    before the End record's total, or no End record at all. Such segments
+    are yielded with block None if it is unknown.
+    """
+    expected = start_segment          # Next segment number due
+    count = crc = seen = 0
+    block = None
+    for record in records:
+        if isinstance(record, Checksum):
+            for missing in range(expected, record.segment):
+                yield missing, None, False
+            yield record.segment, record.block, (count, crc) == (record.count, record.crc32)
+            expected = record.segment + 1
+            count = crc = 0
+            block = None
+        elif isinstance(record, End):
+            incomplete = bool(count) or expected < record.segments
+            if count:
+                yield expected, block, False          # Instructions with no checksum
+                expected += 1
+            for missing in range(expected, record.segments):
+                yield missing, None, False
+            if not incomplete and seen != record.instructions:
+                yield max(start_segment, record.segments - 1), None, False
+            return
+        else:
+            crc = zlib.crc32(encode(record), crc)
+            count += 1
+            seen += 1
+            block = record.block
+    # No End record: the stream was cut short
+    yield expected, block, False
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Export the build order as robot pick-and-place instructions.")
+    parser.add_argument("--plan", help="saved plan file to export (see plan_format.py)")
+    parser.add_argument("--bond", choices=BOND_TYPES, default="stretcher", help="bond type")
+    parser.add_argument("--rows", type=int, default=20, help="wall height in rows")
+    parser.add_argument("--width", type=int, default=2300, help="wall width in mm")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (wild bond)")
+    parser.add_argument("--engine", choices=ENGINES, default="batched", help="stride assignment engine")
+    parser.add_argument("--format", choices=("jsonl", "binary"), default="jsonl", help="output format")
+    parser.add_argument("--resume-from", type=int, default=0, metavar="SEGMENT",
+                        help="first segment to write (earlier ones are assumed done)")
+    parser.add_argument("--verify", metavar="FILE", help="check the segment checksums of a binary export")
+    parser.add_argument("--output", "-o", default="instructions.jsonl", help="output file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.verify:
+        header, records = read_binary(args.verify)
+        failed = [segment for segment, _, ok in verify_segments(records, header["start_segment"]) if not ok]
+        print(f"{len(failed)} corrupt or missing segment(s)" + (f"; resume from {failed[0]}" if failed else ""))
+        sys.exit(1 if failed else 0)
+
+    if args.plan:
+        wall, optimiser = load_plan(args.plan)
+        if optimiser is None:
+            optimiser = StrideOptimiser(wall.wall_map, wall.wall_width, wall.wall_height, engine=args.engine)
+    else:
+        wall = Wall(num_rows=args.rows, bond_type=args.bond, wall_width=args.width, seed=args.seed)
+        optimiser = StrideOptimiser(wall.wall_map, wall.wall_width, wall.wall_height, engine=args.engine)
+    summary = export_instructions(args.output, wall, optimiser, args.format, args.resume_from)
+    print(f"{summary.instructions} instructions in {summary.segments} segments, "
+          f"{summary.bytes / 1e6:.1f} MB in {summary.seconds:.2f} s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
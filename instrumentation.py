@@ -0,0 +1,121 @@
+# instrumentation.py — Opt-in phase timers, counters and cProfile capture
+
+import cProfile
+import functools
+import os
+import sys
+import time
+
+# Set WALL_INSTRUMENT=1 to collect phase timings and counters, or
+# WALL_PROFILE=path to also capture a cProfile run dumped as pstats to that path
+ENV_ENABLE = "WALL_INSTRUMENT"
+ENV_PROFILE = "WALL_PROFILE"
+
+_enabled = False
+_profiler = None
+_profile_path = None
+_timings = {}          # Phase -> [calls, total seconds, max seconds]
+_counters = {}         # Counter name -> total
+
+
+def enable(profile_path=None):
+    """
+    Turns instrumentation on. With profile_path, also starts a cProfile run
+    whose stats are written there by report().
+    """
+    global _enabled, _profiler, _profile_path
+    _enabled = True
+    if profile_path and _profiler is None:
+        _profile_path = profile_path
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    """
+    Clears all recorded timings and counters.
+    """
+    _timings.clear()
+    _counters.clear()
+
+
+def record(phase, seconds):
+    entry = _timings.get(phase)
+    if entry is None:
+        _timings[phase] = [1, seconds, seconds]
+    else:
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] = max(entry[2], seconds)
+
+
+def count(name, amount=1):
+    """
+    Adds to a named counter (bricks processed, frames rendered, ...). No-op when disabled.
+    """
+    if _enabled:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+def timed(phase):
+    """
+    Decorator that records the duration of each call under a phase name.
+    When instrumentation is off the only cost is one flag check per call,
+    so it belongs on coarse operations, not per-brick loops. Nested phases
+    are timed inclusively.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(phase, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+def summary():
+    """
+    Returns (timings, counters): {phase: (calls, total s, max s)} and {name: total}.
+    """
+    return {phase: tuple(entry) for phase, entry in _timings.items()}, dict(_counters)
+
+
+def format_summary():
+    timings, counters = summary()
+    lines = [f"{'phase':<20}{'calls':>8}{'total ms':>12}{'mean ms':>12}{'max ms':>12}"]
+    for phase, (calls, total, longest) in sorted(timings.items(), key=lambda item: -item[1][1]):
+        lines.append(f"{phase:<20}{calls:>8}{total * 1000:>12.2f}{total * 1000 / calls:>12.3f}{longest * 1000:>12.2f}")
+    if counters:
+        lines.append("")
+        lines.append(f"{'counter':<20}{'total':>8}")
+        for name, total in sorted(counters.items()):
+            lines.append(f"{name:<20}{total:>8}")
+    return "\n".join(lines)
+
+
+def report(out=sys.stderr):
+    """
+    Prints the summary table and writes the cProfile stats file, if any.
+    Does nothing when instrumentation is off.
+    """
+    if not _enabled:
+        return
+    print("\n" + format_summary(), file=out)
+    if _profiler is not None:
+        _profiler.disable()
+        _profiler.dump_stats(_profile_path)
+        print(f"cProfile stats written to {_profile_path} (view with python -m pstats)", file=out)
+        _profiler.enable()
+
+
+if os.environ.get(ENV_ENABLE) or os.environ.get(ENV_PROFILE):
+    enable(os.environ.get(ENV_PROFILE))
@@ -0,0 +1,85 @@
+# joints.py — Head-joint (perpend) index and alignment checks between courses
+
+from bisect import bisect_left
+from brick import HALF_BRICK_LENGTH
+from wall_store import GAP
+
+# Perpends in adjacent courses closer than this (mm) count as aligned:
+# bricks must lap the joint below by at least a quarter brick
+MIN_LAP = HALF_BRICK_LENGTH // 2
+
+
+def course_joints(types, xs, lengths):
+    """
+    Returns the sorted x-positions of a course's head joints (the end of
+    every brick that has another brick after it). Gap entries are skipped.
+    """
+    start = 1 if types and types[0] == GAP else 0
+    return [x + ln for x, ln in zip(xs[start:-1], lengths[start:-1])]
+
+
+def is_aligned(joints, x, min_lap=MIN_LAP):
+    """
+    True if x lies within min_lap of any joint in a sorted joint list (bisection).
+    """
+    pos = bisect_left(joints, x)
+    return (pos < len(joints) and joints[pos] - x < min_lap) or (pos > 0 and x - joints[pos - 1] < min_lap)
+
+
+def aligned_joints(lower, upper, min_lap=MIN_LAP):
+    """
+    Merge-scans two sorted joint lists of adjacent courses and returns the
+    upper-course joints that line up with a joint below.
+    """
+    aligned = []
+    i, count = 0, len(lower)
+    for x in upper:
+        # Skip lower joints too far left to matter for this or any later x
+        while i < count and lower[i] <= x - min_lap:
+            i += 1
+        if i < count and lower[i] - x < min_lap:
+            aligned.append(x)
+    return aligned
+
+
+class JointIndex:
+    """
+    Sorted head-joint positions per course, built incrementally. Adding a
+    course only compares it with the course below, so a wall can be checked
+    (or generated under the constraint) in one pass.
+    """
+
+    def __init__(self, min_lap=MIN_LAP):
+        self.min_lap = min_lap
+        self.joints = []              # One sorted list of joint x-positions per course
+        self.violations = []          # (row, x) of every aligned joint found so far
+
+    @classmethod
+    def from_store(cls, store, min_lap=MIN_LAP):
+        index = cls(min_lap)
+        for row_index in range(store.num_rows):
+            start, end = store.row_range(row_index)
+            index.add_course(store.type[start:end], store.x[start:end], store.length[start:end])
+        return index
+
+    @classmethod
+    def from_courses(cls, courses, min_lap=MIN_LAP):
+        index = cls(min_lap)
+        for types, xs, lengths in courses:
+            index.add_course(types, xs, lengths)
+        return index
+
+    def add_course(self, types, xs, lengths):
+        """
+        Indexes the next course up. Returns the x-positions of its joints that
+        align with the course below.
+        """
+        joints = course_joints(types, xs, lengths)
+        aligned = aligned_joints(self.joints[-1], joints, self.min_lap) if self.joints else []
+        row_index = len(self.joints)
+        self.violations.extend((row_index, x) for x in aligned)
+        self.joints.append(joints)
+        return aligned
+
+    def is_valid(self):
+        return not self.violations
@@ -3,12 +3,17 @@
 import time
 import os
 import sys
+from functools import partial
 
 # Import core modules of the simulator
 from wall import Wall
 from stride_optimiser import StrideOptimiser
 from robot_config import MAX_STRIDE_HEIGHT_MM, MAX_STRIDE_WIDTH_MM
 from brick import COURSE_HEIGHT, BRICK_LENGTH, HEAD_JOINT
+from renderer import move_to
+from viewport import VIEW_COMMANDS, Viewport, fits_terminal
+from playback import play
+import instrumentation
 
 
 # Clears the terminal screen using ANSI escape codes
@@ -76,30 +81,76 @@ def prompt_settings():
     print("\nAuto-build mode (for magical speed)? (y/n):")
     auto = input("> ").strip().lower() == "y"
 
+    # Playback settings for auto mode; bricks are always simulated exactly, only frames are skipped
+    playback = {"fps": 1 / 0.3}
+    if auto:
+        print("\nChoose playback speed:")
+        print("  [1] Classic (one brick every 0.3 s)")
+        print("  [2] Fit to a total duration (many bricks per frame)")
+        print("  [3] One stride (or course) per frame")
+        speed_choice = input("Enter choice (1–3): ").strip()
+        if speed_choice == "2":
+            seconds = input("Playback duration in seconds [10]: ").strip()
+            playback = {"fps": 30, "duration": float(seconds or 10)}
+        elif speed_choice == "3":
+            playback = {"fps": 4, "per_stride": True}
+
     rows = int(input(f"\nEnter number of wall rows (recommended ≤ {max_rows}): ").strip())
     if rows > max_rows:
         print(f"\n⚠ Robot arm cannot reach above row {max_rows}.")
         print("   The wall will be split into vertical strides automatically.\n")
 
-    return bond_type, use_stride, auto, rows
+    return bond_type, use_stride, auto, rows, playback
+
+
+# Draws the wall incrementally: a full redraw on the first frame, changed bricks only afterwards
+def draw_wall_frame(wall):
+    renderer = wall.renderer
+    if renderer.frames == 0:
+        clear_screen()
+        print("The top of the wall.")
+        renderer.origin_line = 2
+    status_line = renderer.line_of(-1) + 1
+    # Redraw changed bricks, then clear and rewrite the status area below the wall
+    sys.stdout.write(renderer.render_frame() + move_to(status_line, 1) + "\033[J")
+    print(f"Progress: {wall.progress.percent_complete():.1f}%")
+
+
+# Lists the view keys when the wall is shown through a viewport
+def print_view_help(wall):
+    if isinstance(wall.renderer, Viewport):
+        keys = "  ".join(f"[{key}] {action}" for key, action in VIEW_COMMANDS.items())
+        print(f"View: {keys} (then ENTER)")
+
+
+# Reads the ENTER for the next step; view keys pan / zoom and redraw instead
+def wait_for_step(wall, redraw):
+    view = wall.renderer if isinstance(wall.renderer, Viewport) else None
+    while True:
+        text = input()
+        if view is None or not view.apply_command(text):
+            return
+        redraw()
 
 
 # Displays the current wall layout with brick placement prompt
 def display_wall_with_prompt(wall, auto=False):
-    clear_screen()
-    print("The top of the wall.")
-    wall.display(colour_by_stride=True)
+    draw_wall_frame(wall)
     if not auto:
         print("\n✦ Press ENTER to place a brick. Ctrl+C to flee the quest. ✦\n")
+        print_view_help(wall)
+    sys.stdout.flush()
 
 
 # Displays wall layout during stride-based building, highlighting current stride
 def display_wall_stride_prompt(wall, stride_name, auto=False):
-    clear_screen()
-    print("The top of the wall.")
-    wall.display(colour_by_stride=True)
+    draw_wall_frame(wall)
     if not auto:
         print(f"\n✦ Press ENTER to build by stride. Ctrl+C to abandon the quest. (Now building: {stride_name}) ✦\n")
+        print_view_help(wall)
+    else:
+        print(f"Now building: {stride_name}")
+    sys.stdout.flush()
 
 
 # Shows a summary report with time, energy, and performance grade
@@ -141,32 +192,47 @@ def show_efficiency_report(optimiser, mode="stride", delay=0.03):
     input("Press ENTER to return from your quest...")
 
 
+# Reports achieved frame and brick rates after an auto-mode playback
+def show_playback_stats(stats):
+    print(f"\nPlayback: {stats.frames} frames in {stats.seconds:.1f} s "
+          f"({stats.fps:.1f} frames/sec, {stats.bricks_per_sec:.1f} bricks/sec)")
+
+
 # Handles manual sequential brick-by-brick building
-def run_manual(wall, auto=False):
+def run_manual(wall, auto=False, playback=None):
     show_banner()
-    while wall.mark_next_brick_built():
-        display_wall_with_prompt(wall, auto)
-        if auto:
-            time.sleep(0.3)
-        else:
-            input()
+    if auto:
+        # Row order is index order; the course number groups frames in per-stride playback
+        store, progress = wall.store, wall.progress
+        steps = ((store.row[i], partial(progress.mark, i)) for i in range(len(store)) if not store.built[i])
+        total = progress.total_bricks - progress.built_count
+        show_playback_stats(play(steps, lambda _: display_wall_with_prompt(wall, auto), total, **playback))
+    else:
+        while wall.mark_next_brick_built():
+            display_wall_with_prompt(wall, auto)
+            wait_for_step(wall, lambda: display_wall_with_prompt(wall, auto))
     retro_print("\n★ All bricks built! Quest complete. ★\n", delay=0.01)
     optimiser = StrideOptimiser(wall.wall_map, wall.wall_width, wall.wall_height)
     show_efficiency_report(optimiser, mode="sequential")
 
 
 # Handles optimised robot building by strides
-def run_stride(wall, auto=False):
+def run_stride(wall, auto=False, playback=None):
     optimiser = StrideOptimiser(wall.wall_map, wall.wall_width, wall.wall_height)
-    build_order = optimiser.get_stride_order()
+    build_order = optimiser.get_build_order()
     show_banner()
-    for brick in build_order:
-        brick["built"] = True
-        display_wall_stride_prompt(wall, brick["stride"], auto)
-        if auto:
-            time.sleep(0.3)
-        else:
-            input()
+    if auto:
+        progress = wall.progress
+        steps = [(brick["stride"], partial(progress.mark, brick.index))
+                 for brick in build_order if not brick["built"]]
+        draw = lambda stride_name: display_wall_stride_prompt(wall, stride_name, auto)
+        show_playback_stats(play(steps, draw, len(steps), **playback))
+    else:
+        for brick in build_order:
+            if not wall.progress.mark(brick.index):
+                continue  # Gap entries and already-placed bricks need no frame
+            display_wall_stride_prompt(wall, brick["stride"], auto)
+            wait_for_step(wall, partial(display_wall_stride_prompt, wall, brick["stride"], auto))
     retro_print("\n★ All bricks built! Quest complete. ★\n", delay=0.01)
     show_efficiency_report(optimiser, mode="stride")
 
@@ -179,14 +245,20 @@ def start_wall_quest(skip_intro=False):
         show_banner(animated=False)
 
     # Get simulation parameters from player
-    bond_type, use_stride, auto, rows = prompt_settings()
+    bond_type, use_stride, auto, rows, playback = prompt_settings()
     wall = Wall(num_rows=rows, bond_type=bond_type)
+    if not fits_terminal(wall):
+        # Too big for the screen: show a window that follows the build (pan / zoom in manual mode)
+        wall.renderer = Viewport(wall)
 
     # Run appropriate build method
     if use_stride:
-        run_stride(wall, auto)
+        run_stride(wall, auto, playback)
     else:
-        run_manual(wall, auto)
+        run_manual(wall, auto, playback)
+
+    # Phase timings / profile, when enabled via WALL_INSTRUMENT or WALL_PROFILE
+    instrumentation.report()
 
 
 # Starts the game loop
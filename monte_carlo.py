@@ -0,0 +1,174 @@
+# monte_carlo.py — Monte Carlo build-cost statistics over many seeded wild bond walls
+
+import argparse
+import json
+import math
+import random
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist, fmean, quantiles, stdev
+
+from robot_config import DEFAULT_CONFIG
+from stride_optimiser import ENGINES, StrideOptimiser
+from wall import Wall
+
+# Per-sample figures, in the order run_sample returns them
+METRICS = ("bricks", "strides", "time", "energy")
+
+# Metrics whose confidence interval decides when sampling can stop
+PRECISION_METRICS = ("time", "energy")
+
+# Distribution summary of one metric; ci_low / ci_high bound the mean
+MetricSummary = namedtuple("MetricSummary", ["mean", "stdev", "p5", "p50", "p95", "ci_low", "ci_high"])
+
+# Result of a Monte Carlo run; metrics maps each METRICS name to its MetricSummary
+MonteCarloResult = namedtuple("MonteCarloResult", [
+    "samples", "converged", "master_seed", "confidence", "metrics", "seconds",
+])
+
+
+def sample_seed(master_seed, index):
+    """
+    Wall seed of sample `index`, derived from the master seed alone, so a run
+    is reproducible whatever the worker count or completion order.
+    """
+    return random.Random(f"{master_seed}:sample:{index}").randrange(2 ** 32)
+
+
+def run_sample(task):
+    """
+    Generates one wild wall, assigns strides and estimates its stride-mode cost.
+
+    Args:
+        task (tuple): (rows, wall_width, config, engine, seed)
+
+    Returns:
+        Tuple of METRICS values
+    """
+    rows, wall_width, config, engine, seed = task
+    wall = Wall(num_rows=rows, bond_type="wild", wall_width=wall_width, seed=seed)
+    optimiser = StrideOptimiser(wall.wall_map, wall.wall_width, wall.wall_height,
+                                engine=engine, config=config)
+    bricks, strides, _ = optimiser.get_stride_metrics()
+    build_time, energy = optimiser.estimate_time_and_energy("stride")
+    return bricks, strides, build_time, energy
+
+
+def summarise(values, confidence=0.95):
+    """
+    Returns the MetricSummary of a list of samples, with a normal-approximation
+    confidence interval for the mean.
+    """
+    mean = fmean(values)
+    spread = stdev(values) if len(values) > 1 else 0.0
+    if len(values) > 1:
+        p5, p50, p95 = (quantiles(values, n=20, method="inclusive")[k] for k in (0, 9, 18))
+    else:
+        p5 = p50 = p95 = values[0]
+    half_width = NormalDist().inv_cdf(0.5 + confidence / 2) * spread / math.sqrt(len(values))
+    return MetricSummary(mean, spread, p5, p50, p95, mean - half_width, mean + half_width)
+
+
+def is_precise(summary, precision):
+    """
+    True once the confidence interval half-width is within `precision` of the mean (relative).
+    """
+    half_width = (summary.ci_high - summary.ci_low) / 2
+    return half_width <= precision * abs(summary.mean)
+
+
+def monte_carlo(rows=20, wall_width=2300, master_seed=0, config=DEFAULT_CONFIG, engine="batched",
+                precision=0.01, confidence=0.95, min_samples=30, max_samples=10_000,
+                batch_size=64, workers=None):
+    """
+    Samples seeded wild walls in batches across a process pool until the
+    confidence interval of mean time and energy is within `precision`
+    (relative), or max_samples is reached.
+
+    Batches have a fixed size and results are kept in sample order, so the
+    stopping point and every statistic depend only on the master seed and the
+    settings, never on scheduling. A single worker runs in-process.
+
+    Returns:
+        MonteCarloResult
+    """
+    start = time.perf_counter()
+    samples = {name: [] for name in METRICS}
+    converged = False
+    pool = ProcessPoolExecutor(max_workers=workers) if workers != 1 else None
+    try:
+        while not converged and len(samples["time"]) < max_samples:
+            first = len(samples["time"])
+            count = min(batch_size, max_samples - first)
+            tasks = [(rows, wall_width, config, engine, sample_seed(master_seed, index))
+                     for index in range(first, first + count)]
+            results = pool.map(run_sample, tasks) if pool else map(run_sample, tasks)
+            for values in results:
+                for name, value in zip(METRICS, values):
+                    samples[name].append(value)
+
+            if len(samples["time"]) >= min_samples:
+                converged = all(is_precise(summarise(samples[name], confidence), precision)
+                                for name in PRECISION_METRICS)
+    finally:
+        if pool:
+            pool.shutdown()
+
+    metrics = {name: summarise(values, confidence) for name, values in samples.items()}
+    return MonteCarloResult(len(samples["time"]), converged, master_seed, confidence, metrics,
+                            time.perf_counter() - start)
+
+
+def format_result(result):
+    """
+    Formats a MonteCarloResult as a plain-text table.
+    """
+    level = f"{result.confidence:.0%} CI"
+    lines = [
+        f"{result.samples} wild walls (master seed {result.master_seed}), "
+        + ("converged" if result.converged else "sample limit reached")
+        + f" in {result.seconds:.1f} s",
+        f"{'metric':<8} {'mean':>12} {'stdev':>10} {'p5':>10} {'p50':>10} {'p95':>10}   {level}",
+    ]
+    for name, s in result.metrics.items():
+        lines.append(f"{name:<8} {s.mean:>12.1f} {s.stdev:>10.1f} {s.p5:>10.1f} {s.p50:>10.1f} {s.p95:>10.1f}"
+                     f"   [{s.ci_low:.1f}, {s.ci_high:.1f}]")
+    return "\n".join(lines)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo build-cost statistics for wild bond walls.")
+    parser.add_argument("--rows", type=int, default=20, help="wall height in rows")
+    parser.add_argument("--width", type=int, default=2300, help="wall width in mm")
+    parser.add_argument("--master-seed", type=int, default=0, help="seed from which every wall seed is derived")
+    parser.add_argument("--engine", choices=ENGINES, default="batched", help="stride assignment engine")
+    parser.add_argument("--precision", type=float, default=0.01,
+                        help="stop once the CI half-width of mean time and energy is within this fraction")
+    parser.add_argument("--confidence", type=float, default=0.95, help="confidence level of the intervals")
+    parser.add_argument("--min-samples", type=int, default=30, help="samples before stopping is considered")
+    parser.add_argument("--max-samples", type=int, default=10_000, help="upper limit on samples")
+    parser.add_argument("--batch-size", type=int, default=64, help="samples per batch between precision checks")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--format", choices=("text", "json"), default="text", help="output format")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    result = monte_carlo(args.rows, args.width, args.master_seed, engine=args.engine,
+                         precision=args.precision, confidence=args.confidence,
+                         min_samples=args.min_samples, max_samples=args.max_samples,
+                         batch_size=args.batch_size, workers=args.workers)
+    if args.format == "json":
+        data = result._asdict()
+        data["metrics"] = {name: s._asdict() for name, s in result.metrics.items()}
+        json.dump(data, sys.stdout, indent=2)
+        print()
+    else:
+        print(format_result(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+# plan_format.py — Binary, memory-mapped wall plans and JSON export
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+
+from robot_config import RobotConfig
+from stride_optimiser import StrideOptimiser
+from wall import Wall
+from wall_store import WallStore, TYPE_NAMES, column_typecode, stride_label
+
+# File layout:
+#   prefix   magic, format version, header length (little-endian)
+#   header   UTF-8 JSON: wall geometry, stride settings, robot config and a column table
+#   columns  raw WallStore arrays plus the build history, each 8-byte aligned
+# Column offsets in the header are relative to the start of the column data.
+MAGIC = b"WALLPLAN"
+VERSION = 1
+PREFIX = struct.Struct("<8sHxxI")
+ALIGN = 8
+
+# WallStore columns saved as-is, in file order
+STORE_COLUMNS = ("type", "x", "length", "row", "stride", "built", "row_start")
+
+
+def _aligned(size):
+    return -(-size // ALIGN) * ALIGN
+
+
+def save_plan(path, wall, optimiser=None):
+    """
+    Writes a wall's bricks, stride ids and build state to a binary plan file.
+    Stride settings and the robot config are taken from the optimiser that
+    assigned them, if given. Walls loaded from a plan can be saved again.
+    """
+    store = wall.store
+    columns = [(name, getattr(store, name)) for name in STORE_COLUMNS]
+    columns.append(("history", array("L", wall.progress.history)))
+
+    table, offset = [], 0
+    for name, column in columns:
+        size = len(column) * column.itemsize
+        table.append({"name": name, "typecode": column_typecode(column), "itemsize": column.itemsize,
+                      "offset": offset, "count": len(column)})
+        offset = _aligned(offset + size)
+
+    header = {
+        "bond_type": wall.bond_type,
+        "wall_width": wall.wall_width,
+        "rows": wall.rows,
+        "seed": wall.seed,
+        "constrained": wall.constrained,
+        "byteorder": sys.byteorder,
+        "columns": table,
+    }
+    if optimiser is not None:
+        header.update(stride_width=optimiser.stride_width, stride_height=optimiser.stride_height,
+                      engine=optimiser.engine, block_origin=optimiser.block_origin,
+                      config=optimiser.config._asdict())
+    header_bytes = json.dumps(header).encode("utf-8")
+    data_start = _aligned(PREFIX.size + len(header_bytes))
+
+    with open(path, "wb") as f:
+        f.write(PREFIX.pack(MAGIC, VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        f.write(bytes(data_start - f.tell()))
+        for (_, column), entry in zip(columns, table):
+            f.write(bytes(data_start + entry["offset"] - f.tell()))
+            f.write(column)
+
+
+def read_header(buffer):
+    """
+    Parses the prefix and JSON header of a plan. Returns (header dict, data start offset).
+    """
+    magic, version, header_size = PREFIX.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a wall plan file")
+    if version != VERSION:
+        raise ValueError(f"Unsupported plan format version {version}")
+    header = json.loads(bytes(buffer[PREFIX.size:PREFIX.size + header_size]).decode("utf-8"))
+    return header, _aligned(PREFIX.size + header_size)
+
+
+def map_plan(path):
+    """
+    Memory-maps a plan file and returns (header, {column name: memoryview}).
+
+    The columns are zero-copy views typed like the arrays they were saved from.
+    The mapping is copy-on-write: marking bricks built or reassigning strides
+    works in memory and never modifies the file (use save_plan to persist).
+    """
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    header, data_start = read_header(buffer)
+    if header["byteorder"] != sys.byteorder:
+        raise ValueError("Plan was saved with a different byte order")
+
+    view = memoryview(buffer)
+    columns = {}
+    for entry in header["columns"]:
+        typecode, itemsize = entry["typecode"], entry["itemsize"]
+        if array(typecode).itemsize != itemsize:
+            raise ValueError(f"Column '{entry['name']}' uses {itemsize}-byte '{typecode}' items, "
+                             f"which this platform stores differently")
+        start = data_start + entry["offset"]
+        columns[entry["name"]] = view[start:start + entry["count"] * itemsize].cast(typecode)
+    return header, columns
+
+
+def load_plan(path):
+    """
+    Reopens a saved plan without generating or assigning anything.
+
+    Returns:
+        (wall, optimiser): a Wall backed by the mapped columns, with its build
+        progress restored, and a StrideOptimiser over the saved stride ids and
+        robot config (None if the plan was saved without one).
+    """
+    header, columns = map_plan(path)
+    store = WallStore()
+    for name in STORE_COLUMNS:
+        setattr(store, name, columns[name])
+
+    wall = Wall(num_rows=header["rows"], bond_type=header["bond_type"],
+                wall_width=header["wall_width"], lazy=True, seed=header["seed"],
+                constrained=header.get("constrained", False))
+    wall.attach_store(store, history=columns["history"])
+
+    optimiser = None
+    if "stride_width" in header:
+        optimiser = StrideOptimiser(wall.wall_map, wall.wall_width, wall.wall_height,
+                                    stride_width=header["stride_width"],
+                                    stride_height=header["stride_height"],
+                                    engine=header["engine"], assigned=True,
+                                    config=RobotConfig(**header["config"]) if "config" in header else None)
+        optimiser.block_origin = tuple(header.get("block_origin", (0, 1)))
+    return wall, optimiser
+
+
+def export_json(path, wall, max_bricks=100_000):
+    """
+    Writes a human-readable JSON dump of a (small) plan for debugging:
+    geometry, then one list of bricks per course with their stride labels.
+    """
+    store = wall.store
+    if len(store) > max_bricks:
+        raise ValueError(f"Plan has {len(store)} bricks; JSON export is limited to {max_bricks}")
+    courses = []
+    for row_index in range(store.num_rows):
+        start, end = store.row_range(row_index)
+        courses.append([
+            {
+                "index": i,
+                "type": TYPE_NAMES[store.type[i]],
+                "x": store.x[i],
+                "length": store.length[i],
+                "stride": stride_label(store.stride[i]),
+                "built": bool(store.built[i]),
+            }
+            for i in range(start, end)
+        ])
+    plan = {
+        "bond_type": wall.bond_type,
+        "wall_width": wall.wall_width,
+        "rows": wall.rows,
+        "seed": wall.seed,
+        "constrained": wall.constrained,
+        "history": list(wall.progress.history),
+        "courses": courses,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(plan, f, indent=1)
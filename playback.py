@@ -0,0 +1,78 @@
+# playback.py — Frame-budgeted auto-build playback
+
+import math
+import time
+from collections import namedtuple
+
+# Summary of a playback run
+PlaybackStats = namedtuple("PlaybackStats", ["frames", "bricks", "seconds", "fps", "bricks_per_sec"])
+
+
+def play(steps, draw, total, fps=30, duration=None, per_stride=False,
+         clock=time.perf_counter, sleep=time.sleep):
+    """
+    Runs a build to completion while drawing at most `fps` frames per second.
+
+    Every step is executed, in order, exactly as in a brick-by-brick run;
+    only the frames in between are dropped. Each frame covers:
+      - with per_stride, every brick of one stride (one stride per frame);
+      - with duration, as many bricks as needed to finish `total` bricks in
+        about `duration` seconds;
+      - otherwise a single brick (one brick per frame at the target rate).
+
+    Args:
+        steps: iterable of (label, place) pairs; place() builds one brick and
+               label (e.g. its stride) is passed to draw
+        draw: callable(label) that renders the current state
+        total (int): number of steps
+        fps (float): maximum frames per second
+        duration (float): target playback duration in seconds
+
+    Returns:
+        PlaybackStats with achieved frames/sec and bricks/sec
+    """
+    steps = iter(steps)
+    interval = 1.0 / fps
+    start = clock()
+    deadline = start + interval          # When the current frame should be shown
+    frames = placed = 0
+    carry = None                         # Step that opens the next stride, not yet placed
+    finished = False
+
+    while not finished:
+        if duration:
+            target = min(total, math.ceil(total * (deadline - start) / duration))
+        else:
+            target = placed + 1
+        label, in_frame = None, 0
+        while per_stride or not in_frame or placed < target:
+            step = carry or next(steps, None)
+            carry = None
+            if step is None:
+                finished = True
+                break
+            if per_stride and in_frame and step[0] != label:
+                carry = step
+                break
+            label, place = step
+            place()
+            placed += 1
+            in_frame += 1
+
+        # Done once the last step is placed; no need to wait for another frame
+        finished = finished or (carry is None and placed >= total)
+        if in_frame:
+            draw(label)
+            frames += 1
+        now = clock()
+        if not finished:
+            if now < deadline:
+                sleep(deadline - now)
+                deadline += interval
+            else:
+                deadline = now + interval    # Running behind: drop frames rather than catch up
+
+    seconds = clock() - start
+    rate = frames / seconds if seconds > 0 else float("inf")
+    speed = placed / seconds if seconds > 0 else float("inf")
+    return PlaybackStats(frames, placed, seconds, rate, speed)
@@ -0,0 +1,181 @@
+# renderer.py — Incremental, diff-based terminal rendering of a wall
+
+from array import array
+from ansi_colors import STRIDE_COLOR_PAIRS, RESET
+from brick import (
+    FULL_BRICK_CHAR, HALF_BRICK_CHAR,
+    BUILT_FULL_CHAR, BUILT_HALF_CHAR,
+    BUILT_FRONT_CHAR, FRONT_BRICK_CHAR,
+)
+from instrumentation import count, timed
+from wall_store import GAP, FULL, HALF, FRONT
+
+# Unbuilt / built characters per brick type code
+BRICK_CHARS = {
+    FULL: (FULL_BRICK_CHAR, BUILT_FULL_CHAR),
+    HALF: (HALF_BRICK_CHAR, BUILT_HALF_CHAR),
+    FRONT: (FRONT_BRICK_CHAR, BUILT_FRONT_CHAR),
+}
+
+# ANSI cursor control
+CLEAR_TO_EOL = "\033[K"
+
+
+def move_to(line, column):
+    """
+    Returns the ANSI escape that moves the cursor to a 1-based line and column.
+    """
+    return f"\033[{line};{column}H"
+
+
+def stride_run_parity(store, row_index):
+    """
+    Returns the colour parity of each brick in a course: its position, mod 2,
+    among the bricks of its stride in that course, so that neighbouring
+    bricks of one stride alternate between the two shades of its colour pair.
+    Gap entries get 0.
+    """
+    start, end = store.row_range(row_index)
+    types, strides = store.type, store.stride
+    parity = array("B", bytes(end - start))
+    runs = {}
+    for i in range(start, end):
+        if types[i] == GAP:
+            continue
+        count = runs.get(strides[i], 0)
+        parity[i - start] = count % 2
+        runs[strides[i]] = count + 1
+    return parity
+
+
+class WallRenderer:
+    """
+    Renders a wall to the terminal, caching every brick cell so that each
+    frame only redraws the cells that changed since the previous one.
+    Stride colours are assigned once per stride and kept for the whole build.
+    """
+
+    def __init__(self, wall, colour_by_stride=True, origin_line=1):
+        self.wall = wall
+        self.store = wall.store
+        self.colour_by_stride = colour_by_stride
+        self.origin_line = origin_line       # Terminal line of the top course
+        self.stride_color_map = {}           # Stride key -> colour pair, stable across frames
+        self.frames = 0
+        self._cells = None                   # Last rendered string per brick
+        self._columns = None                 # 1-based terminal column per brick
+        self._parity = None                  # Position of a brick within its stride run in a row
+        self._layout_version = None
+        self._history_pos = 0                # How much of the build history has been drawn
+        self._epoch = None                   # BuildProgress.epoch when that history was drawn
+
+    def _layout(self):
+        """
+        Recomputes brick columns and colour parity if strides were (re)assigned.
+        Returns True when the layout changed and a full redraw is needed.
+        """
+        store = self.store
+        if self._layout_version == store.stride_version and self._cells is not None:
+            return False
+
+        types, lengths = store.type, store.length
+        columns = array("L", [0]) * len(store)
+        parity = array("B")
+        for row_index in range(store.num_rows):
+            start, end = store.row_range(row_index)
+            column = 1
+            for i in range(start, end):
+                columns[i] = column
+                if types[i] == GAP:
+                    column += lengths[i]
+                else:
+                    column += len(BRICK_CHARS[types[i]][0])
+            parity.extend(stride_run_parity(store, row_index))
+
+        self._columns = columns
+        self._parity = parity
+        self._cells = [None] * len(store)
+        self._layout_version = store.stride_version
+        return True
+
+    def _cell(self, i):
+        """
+        Returns the (possibly coloured) string for a single brick.
+        """
+        store = self.store
+        typ = store.type[i]
+        if typ == GAP:
+            return " " * store.length[i]
+        built = store.built[i]
+        char = BRICK_CHARS[typ][built]
+        if self.colour_by_stride and built:
+            sid = store.stride[i]
+            pair = self.stride_color_map.get(sid)
+            if pair is None:
+                pair = STRIDE_COLOR_PAIRS[len(self.stride_color_map) % len(STRIDE_COLOR_PAIRS)]
+                self.stride_color_map[sid] = pair
+            char = f"{pair[self._parity[i]]}{char}{RESET}"
+        return char
+
+    def line_of(self, row_index):
+        """
+        Returns the terminal line a course is drawn on (top course first).
+        """
+        return self.origin_line + self.store.num_rows - 1 - row_index
+
+    @timed("render")
+    def render_rows(self):
+        """
+        Renders every course, top to bottom, refreshing the cell cache.
+        """
+        self._layout()
+        store = self.store
+        cells = self._cells
+        lines = []
+        for row_index in range(store.num_rows - 1, -1, -1):
+            start, end = store.row_range(row_index)
+            for i in range(start, end):
+                cells[i] = self._cell(i)
+            lines.append("".join(cells[start:end]))
+        self._history_pos = len(self.wall.progress.history)
+        self._epoch = self.wall.progress.epoch
+        return lines
+
+    @timed("render_frame")
+    def render_frame(self):
+        """
+        Returns the escape sequence that brings the terminal up to date.
+        The first frame (and any frame after a re-layout, undo or reset) redraws
+        every course; later frames only touch bricks built since the last one.
+        An undo is detected by the progress epoch rather than the history
+        length, which an undo followed by a new brick leaves unchanged.
+        """
+        progress = self.wall.progress
+        history = progress.history
+        full = self._layout() or self.frames == 0 or progress.epoch != self._epoch
+        self.frames += 1
+        count("frames_rendered")
+
+        if full:
+            lines = self.render_rows()
+            return "".join(
+                f"{move_to(self.origin_line + n, 1)}{line}{CLEAR_TO_EOL}"
+                for n, line in enumerate(lines)
+            )
+
+        store, cells, columns = self.store, self._cells, self._columns
+        out = []
+        for i in history[self._history_pos:]:
+            cell = self._cell(i)
+            if cell != cells[i]:
+                cells[i] = cell
+                out.append(f"{move_to(self.line_of(store.row[i]), columns[i])}{cell}")
+        self._history_pos = len(history)
+        return "".join(out)
+
+    def invalidate(self):
+        """
+        Forces the next frame to be a full redraw, e.g. after the screen was cleared
+        or bricks were changed without going through BuildProgress.
+        """
+        self.frames = 0
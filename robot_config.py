@@ -1,5 +1,7 @@
 # robot_config.py — Robot parameters for time and energy estimation
 
+from collections import namedtuple
+
 # === Time Constants (in seconds) ===
 
 BRICK_PLACEMENT_TIME = 2            # Time to place one brick
@@ -15,3 +17,59 @@ MOVE_ENERGY_KWH = 0.05              # Discrete energy cost per movement (in kWh)
 
 MAX_STRIDE_HEIGHT_MM = 1300         # Max vertical reach of the robot arm (≈20 courses)
 MAX_STRIDE_WIDTH_MM = 800           # Max horizontal reach per stride
+
+# === Configuration Object ===
+# The constants above are the default rig. A RobotConfig bundles them so a
+# different rig can be evaluated without editing this file, e.g.
+# DEFAULT_CONFIG._replace(brick_placement_time=1.5).
+
+RobotConfig = namedtuple("RobotConfig", [
+    "brick_placement_time",
+    "horizontal_move_time",
+    "vertical_move_time",
+    "energy_per_second",
+    "move_energy_kwh",
+    "max_stride_height_mm",
+    "max_stride_width_mm",
+])
+
+DEFAULT_CONFIG = RobotConfig(
+    brick_placement_time=BRICK_PLACEMENT_TIME,
+    horizontal_move_time=HORIZONTAL_MOVE_TIME,
+    vertical_move_time=VERTICAL_MOVE_TIME,
+    energy_per_second=ENERGY_PER_SECOND,
+    move_energy_kwh=MOVE_ENERGY_KWH,
+    max_stride_height_mm=MAX_STRIDE_HEIGHT_MM,
+    max_stride_width_mm=MAX_STRIDE_WIDTH_MM,
+)
+
+# === Command-Line Options ===
+# Timing and energy fields a run may vary; the stride limits are set per
+# tool, as they also change the plan. Each entry is (field, flag, help).
+
+ROBOT_FIELDS = (
+    "brick_placement_time",
+    "horizontal_move_time",
+    "vertical_move_time",
+    "energy_per_second",
+    "move_energy_kwh",
+)
+
+ROBOT_OPTIONS = (
+    ("brick_placement_time", "--placement-time", "seconds per brick"),
+    ("horizontal_move_time", "--horizontal-move-time", "seconds per horizontal move"),
+    ("vertical_move_time", "--vertical-move-time", "seconds per vertical move"),
+    ("energy_per_second", "--energy-per-second", "working draw in kWh/s"),
+    ("move_energy_kwh", "--move-energy", "kWh per move"),
+)
+
+
+def add_robot_arguments(parser):
+    """
+    Adds one option per ROBOT_FIELDS entry to an argparse parser. Each takes
+    one or more values, stored under the field name, and defaults to the
+    DEFAULT_CONFIG value.
+    """
+    for name, flag, help_text in ROBOT_OPTIONS:
+        parser.add_argument(flag, nargs="+", type=float, dest=name,
+                            default=[getattr(DEFAULT_CONFIG, name)], help=help_text)
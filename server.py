@@ -0,0 +1,298 @@
+# server.py — Local asyncio server streaming live build progress as NDJSON or SSE
+
+import argparse
+import asyncio
+import itertools
+import json
+import time
+from urllib.parse import parse_qs, urlsplit
+
+from bond_patterns import BOND_TYPES
+from brick import BRICK_LENGTH
+from wall import Wall
+from stride_optimiser import ENGINES, StrideOptimiser
+from wall_store import stride_label
+
+# Parameters accepted when starting a simulation, with their defaults
+SIMULATION_DEFAULTS = {
+    "bond_type": "stretcher",
+    "rows": 20,
+    "wall_width": 2300,
+    "seed": None,
+    "engine": "batched",
+    "bricks_per_second": 50,        # 0 = as fast as possible
+}
+
+TICK = 0.05                         # Seconds between simulation steps when paced
+UNPACED_STEP = 200                  # Bricks per step when bricks_per_second is 0
+MAX_BODY = 64 * 1024
+
+
+def validate_params(params):
+    """
+    Checks simulation parameters and returns them merged over SIMULATION_DEFAULTS.
+    Raises ValueError describing the first problem found.
+    """
+    if not isinstance(params, dict):
+        raise ValueError("Request body must be a JSON object")
+    unknown = set(params) - set(SIMULATION_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown parameters: {', '.join(sorted(unknown))}")
+    params = dict(SIMULATION_DEFAULTS, **params)
+
+    def is_int(value):
+        return isinstance(value, int) and not isinstance(value, bool)
+
+    if params["bond_type"] not in BOND_TYPES:
+        raise ValueError(f"bond_type must be one of {', '.join(BOND_TYPES)}")
+    if params["engine"] not in ENGINES:
+        raise ValueError(f"engine must be one of {', '.join(ENGINES)}")
+    if not is_int(params["rows"]) or params["rows"] < 1:
+        raise ValueError("rows must be a positive integer")
+    if not is_int(params["wall_width"]) or params["wall_width"] < BRICK_LENGTH:
+        raise ValueError(f"wall_width must be an integer of at least {BRICK_LENGTH} mm")
+    if params["seed"] is not None and not is_int(params["seed"]):
+        raise ValueError("seed must be an integer or null")
+    speed = params["bricks_per_second"]
+    if not isinstance(speed, (int, float)) or isinstance(speed, bool) or not 0 <= speed < float("inf"):
+        raise ValueError("bricks_per_second must be a non-negative number")
+    return params
+
+
+class Subscriber:
+    """
+    One streaming client. Events are queued without ever blocking the
+    publisher; a client that falls too far behind has its backlog discarded
+    and receives a 'dropped' notice followed by the newest event instead.
+    """
+
+    def __init__(self, sim_id=None, queue_size=1000):
+        self.sim_id = sim_id                  # Only events of this simulation, or all if None
+        self.queue = asyncio.Queue(max(2, queue_size))     # Room for a drop notice plus one event
+        self.dropped = 0
+
+    def offer(self, event):
+        if self.sim_id is not None and event["sim"] != self.sim_id:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            discarded = 0
+            while not self.queue.empty():
+                self.queue.get_nowait()
+                discarded += 1
+            self.dropped += discarded
+            self.queue.put_nowait({"type": "dropped", "sim": event["sim"], "count": discarded,
+                                   "total_dropped": self.dropped})
+            self.queue.put_nowait(event)
+
+
+class BuildServer:
+    """
+    Runs several wall simulations concurrently on one event loop and fans
+    their progress events out to every subscribed client.
+    """
+
+    def __init__(self, queue_size=1000):
+        self.queue_size = queue_size
+        self.simulations = {}                 # Simulation id -> latest status
+        self.final_events = {}                # Simulation id -> its 'finished' or 'failed' event
+        self.subscribers = set()
+        self._ids = itertools.count(1)
+        self._tasks = set()
+
+    def publish(self, event):
+        for subscriber in tuple(self.subscribers):
+            subscriber.offer(event)
+
+    def start_simulation(self, params):
+        """
+        Validates parameters, schedules the simulation and returns its id.
+        """
+        params = validate_params(params)
+        sim_id = next(self._ids)
+        self.simulations[sim_id] = {"sim": sim_id, "state": "planning", "params": params}
+        task = asyncio.get_running_loop().create_task(self.run_simulation(sim_id, params))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return sim_id
+
+    async def run_simulation(self, sim_id, params):
+        """
+        Plans a wall off the event loop, then builds it in paced steps,
+        publishing brick, stride and metrics events.
+        """
+        status = self.simulations[sim_id]
+        start = time.perf_counter()
+
+        def plan():
+            wall = Wall(num_rows=params["rows"], bond_type=params["bond_type"],
+                        wall_width=params["wall_width"], seed=params["seed"])
+            optimiser = StrideOptimiser(wall.wall_map, wall.wall_width, wall.wall_height,
+                                        engine=params["engine"])
+            return wall, optimiser, optimiser.get_build_schedule().order
+
+        try:
+            wall, optimiser, order = await asyncio.to_thread(plan)
+        except Exception as error:
+            status.update(state="failed", error=str(error))
+            self.final_events[sim_id] = {"type": "failed", "sim": sim_id, "error": str(error)}
+            self.publish(self.final_events[sim_id])
+            return
+
+        bricks, strides, avg = optimiser.get_stride_metrics()
+        stride_time, stride_energy = optimiser.estimate_time_and_energy("stride")
+        metrics = {"type": "metrics", "sim": sim_id, "bricks": bricks, "strides": strides,
+                   "avg_per_stride": round(avg, 2), "stride_time": stride_time,
+                   "stride_energy": round(stride_energy, 2), "seed": wall.seed}
+        status.update(state="building", built=0, bricks=bricks)
+        self.publish({"type": "started", "sim": sim_id, "params": params})
+        self.publish(metrics)
+
+        store, progress = wall.store, wall.progress
+        speed = params["bricks_per_second"]
+        budget, last = 0.0, time.monotonic()      # Bricks owed so far, carried between ticks
+        current = None
+        position = 0
+        while position < len(order):
+            if speed:
+                now = time.monotonic()
+                budget += speed * (now - last)
+                last = now
+                step = int(budget)
+                budget -= step
+            else:
+                step = UNPACED_STEP
+            for index in order[position:position + step]:
+                if not progress.mark(index):
+                    continue
+                sid = store.stride[index]
+                if sid != current:
+                    current = sid
+                    self.publish({"type": "stride", "sim": sim_id, "stride": stride_label(sid)})
+                self.publish({"type": "brick", "sim": sim_id, "index": index, "row": store.row[index],
+                              "built": progress.built_count,
+                              "progress": round(progress.percent_complete(), 2)})
+            position += step
+            status["built"] = progress.built_count
+            # Yield to the loop every step so clients and other simulations keep running;
+            # the time this step took is paid for by the next budget, not lost
+            await asyncio.sleep(TICK if speed else 0)
+
+        status["state"] = "finished"
+        self.final_events[sim_id] = dict(metrics, type="finished", elapsed=round(time.perf_counter() - start, 3))
+        self.publish(self.final_events[sim_id])
+
+    @staticmethod
+    def _write_event(writer, event, fmt):
+        payload = json.dumps(event)
+        if fmt == "sse":
+            writer.write(f"event: {event['type']}\ndata: {payload}\n\n".encode())
+        else:
+            writer.write(payload.encode() + b"\n")
+
+    async def stream(self, writer, subscriber, fmt):
+        """
+        Writes a subscriber's events to its client until it disconnects or,
+        for a single-simulation stream, until that simulation finishes.
+        """
+        while True:
+            event = await subscriber.queue.get()
+            self._write_event(writer, event, fmt)
+            await writer.drain()            # Only this client's task waits on a slow socket
+            if subscriber.sim_id is not None and event["type"] in ("finished", "failed"):
+                return
+
+    async def handle(self, reader, writer):
+        """
+        Minimal HTTP/1.1 handling:
+            POST /simulations            JSON body of parameters -> {"id": n}
+            GET  /simulations            statuses of all simulations
+            GET  /events[?sim=n][&format=sse|ndjson]   live event stream; for a
+                                         simulation that has ended, just its final event
+        """
+        try:
+            request = await reader.readline()
+            method, target, _ = request.decode("latin-1").split(" ", 2)
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            url = urlsplit(target)
+            query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+            if method == "POST" and url.path == "/simulations":
+                size = int(headers.get("content-length", 0))
+                if size > MAX_BODY:
+                    raise ValueError("Request body too large")
+                body = await reader.readexactly(size) if size else b"{}"
+                sim_id = self.start_simulation(json.loads(body))
+                await self._respond(writer, 201, {"id": sim_id})
+            elif method == "GET" and url.path == "/simulations":
+                await self._respond(writer, 200, list(self.simulations.values()))
+            elif method == "GET" and url.path == "/events":
+                fmt = query.get("format", "ndjson")
+                sim_id = int(query["sim"]) if "sim" in query else None
+                if sim_id is not None and sim_id not in self.simulations:
+                    await self._respond(writer, 404, {"error": f"no simulation {sim_id}"})
+                    return
+                content_type = "text/event-stream" if fmt == "sse" else "application/x-ndjson"
+                writer.write(f"HTTP/1.1 200 OK\r\nContent-Type: {content_type}\r\n"
+                             f"Cache-Control: no-cache\r\nConnection: close\r\n\r\n".encode())
+                if sim_id is not None and self.simulations[sim_id]["state"] in ("finished", "failed"):
+                    self._write_event(writer, self.final_events[sim_id], fmt)
+                    await writer.drain()
+                    return
+                subscriber = Subscriber(sim_id, self.queue_size)
+                self.subscribers.add(subscriber)
+                try:
+                    await self.stream(writer, subscriber, fmt)
+                finally:
+                    self.subscribers.discard(subscriber)
+            else:
+                await self._respond(writer, 404, {"error": "not found"})
+        except (ValueError, KeyError, json.JSONDecodeError) as error:
+            await self._respond(writer, 400, {"error": str(error)})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass                            # Client went away
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer, status, body):
+        reasons = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found"}
+        payload = json.dumps(body).encode()
+        writer.write(f"HTTP/1.1 {status} {reasons[status]}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode() + payload)
+        await writer.drain()
+
+    async def serve(self, host="127.0.0.1", port=8765):
+        server = await asyncio.start_server(self.handle, host, port)
+        async with server:
+            await server.serve_forever()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Serve live wall build progress over a localhost socket.")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to bind (default: localhost only)")
+    parser.add_argument("--port", type=int, default=8765, help="port to listen on")
+    parser.add_argument("--queue-size", type=int, default=1000,
+                        help="events buffered per client before its backlog is dropped")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    server = BuildServer(queue_size=args.queue_size)
+    print(f"Serving on http://{args.host}:{args.port} (POST /simulations, GET /events)")
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
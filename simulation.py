@@ -0,0 +1,177 @@
+# simulation.py — Discrete-event build simulation with per-event time and energy
+
+import argparse
+import itertools
+from collections import namedtuple
+from heapq import heappop, heappush
+from bond_patterns import BOND_TYPES
+from robot_config import DEFAULT_CONFIG
+from stride_optimiser import StrideOptimiser
+from wall import Wall
+from wall_store import stride_parts, stride_label
+
+# One simulated event. kind is 'move', 'idle' or 'place'; brick is None for moves / idles
+SimEvent = namedtuple("SimEvent", ["time", "kind", "duration", "energy", "brick", "stride"])
+
+# Event kinds, in the order they appear in reports
+EVENT_KINDS = ("place", "move", "idle")
+
+
+def move_time(from_key, to_key, config=DEFAULT_CONFIG):
+    """
+    Travel time between two strides: one horizontal move per stride column
+    crossed and one vertical move per block. Entering the first stride counts
+    as a single horizontal positioning move.
+    """
+    if from_key is None:
+        return config.horizontal_move_time
+    from_block, from_col = stride_parts(from_key)
+    to_block, to_col = stride_parts(to_key)
+    return (abs(to_col - from_col) * config.horizontal_move_time
+            + abs(to_block - from_block) * config.vertical_move_time)
+
+
+def simulate(store, order, supply_interval=0, idle_power=0.0, skip_built=True, config=DEFAULT_CONFIG):
+    """
+    Steps a single robot through a build order on a priority-queue clock and
+    yields SimEvents as they happen. Events are generated lazily, so arbitrarily
+    long builds run in constant memory.
+
+    Two processes share the clock: the robot (move to a brick's stride, then
+    place it) and the brick supply, which delivers one brick every
+    supply_interval seconds. A robot that is ready before its next brick has
+    arrived idles until the delivery.
+
+    Args:
+        store: WallStore with assigned strides
+        order: brick indices in build order (e.g. BuildSchedule.order)
+        supply_interval (float): seconds between brick deliveries; 0 means always stocked
+        idle_power (float): energy use while idle (kWh/s); working draw is config.energy_per_second
+        skip_built (bool): leave out bricks already built, to simulate a partial wall
+        config (RobotConfig): robot timing and energy parameters
+    """
+    strides, built = store.stride, store.built
+    place_time, power = config.brick_placement_time, config.energy_per_second
+    bricks = (i for i in order if not (skip_built and built[i]))
+    sequence = itertools.count()      # Tie-break so simultaneous events keep insertion order
+    clock = [(0, next(sequence), "robot")]
+    stock = None                      # Delivered but unplaced bricks; None = always stocked
+    if supply_interval:
+        stock = 0
+        heappush(clock, (supply_interval, next(sequence), "supply"))
+
+    brick = next(bricks, None)        # Brick the robot is working towards
+    position = None                   # Stride the robot is in
+    idle_since = None
+    while brick is not None:
+        now, _, process = heappop(clock)
+        if process == "supply":
+            stock += 1
+            heappush(clock, (now + supply_interval, next(sequence), "supply"))
+            if idle_since is None:
+                continue
+            # The robot was waiting for this delivery and resumes at once
+            yield SimEvent(idle_since, "idle", now - idle_since, (now - idle_since) * idle_power, None, position)
+            idle_since = None
+
+        sid = strides[brick]
+        if sid != position:
+            duration = move_time(position, sid, config)
+            yield SimEvent(now, "move", duration, duration * power + config.move_energy_kwh, None, sid)
+            position = sid
+            heappush(clock, (now + duration, next(sequence), "robot"))
+            continue
+        if stock == 0:
+            idle_since = now          # Woken by the next supply event
+            continue
+        if stock is not None:
+            stock -= 1
+        yield SimEvent(now, "place", place_time, place_time * power, brick, sid)
+        heappush(clock, (now + place_time, next(sequence), "robot"))
+        brick = next(bricks, None)
+
+
+def summarise(events):
+    """
+    Consumes an event stream and returns per-kind totals plus the finish time.
+
+    Returns:
+        dict with 'time', 'energy', 'moves', and '<kind>_time' / '<kind>_energy' per event kind
+    """
+    summary = {"time": 0, "energy": 0.0, "moves": 0}
+    for kind in EVENT_KINDS:
+        summary[f"{kind}_time"] = 0
+        summary[f"{kind}_energy"] = 0.0
+    for event in events:
+        summary[f"{event.kind}_time"] += event.duration
+        summary[f"{event.kind}_energy"] += event.energy
+        summary["energy"] += event.energy
+        summary["moves"] += event.kind == "move"
+        summary["time"] = max(summary["time"], event.time + event.duration)
+    return summary
+
+
+def divergence_report(optimiser, supply_interval=0, idle_power=0.0):
+    """
+    Compares the closed-form 'stride' estimate with a simulation of the actual
+    build schedule, component by component, both with the optimiser's config.
+
+    Returns:
+        List of (component, estimated, simulated, difference) rows
+    """
+    index = optimiser.stride_index
+    est_time, est_energy = optimiser.estimate_time_and_energy("stride")
+    est_place = index.total_bricks * optimiser.config.brick_placement_time
+    est_moves = index.total_strides
+
+    order = optimiser.get_build_schedule().order
+    sim = summarise(simulate(optimiser.store, order, supply_interval, idle_power, skip_built=False,
+                             config=optimiser.config))
+
+    rows = [
+        ("placement time (s)", est_place, sim["place_time"]),
+        ("move time (s)", est_time - est_place, sim["move_time"]),
+        ("idle time (s)", 0, sim["idle_time"]),
+        ("moves", est_moves, sim["moves"]),
+        ("total time (s)", est_time, sim["time"]),
+        ("energy (kWh)", est_energy, sim["energy"]),
+    ]
+    return [(name, estimated, simulated, simulated - estimated) for name, estimated, simulated in rows]
+
+
+def format_report(rows):
+    lines = [f"{'component':<20}{'estimate':>12}{'simulated':>12}{'diff':>12}{'diff %':>9}"]
+    for name, estimated, simulated, difference in rows:
+        percent = f"{100.0 * difference / estimated:+.1f}" if estimated else "—"
+        lines.append(f"{name:<20}{estimated:>12.1f}{simulated:>12.1f}{difference:>+12.1f}{percent:>9}")
+    return "\n".join(lines)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate a wall build event by event and compare with the estimate.")
+    parser.add_argument("--bond", choices=BOND_TYPES, default="stretcher", help="bond type")
+    parser.add_argument("--rows", type=int, default=20, help="wall height in rows")
+    parser.add_argument("--width", type=int, default=2300, help="wall width in mm")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (wild bond)")
+    parser.add_argument("--engine", choices=("batched", "reference", "global"), default="batched",
+                        help="stride assignment engine")
+    parser.add_argument("--supply-interval", type=float, default=0, help="seconds between brick deliveries")
+    parser.add_argument("--idle-power", type=float, default=0.0, help="energy use while idle (kWh/s)")
+    parser.add_argument("--trace", action="store_true", help="stream every event before the report")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    wall = Wall(num_rows=args.rows, bond_type=args.bond, wall_width=args.width, seed=args.seed)
+    optimiser = StrideOptimiser(wall.wall_map, wall.wall_width, wall.wall_height, engine=args.engine)
+    if args.trace:
+        order = optimiser.get_build_schedule().order
+        for event in simulate(wall.store, order, args.supply_interval, args.idle_power, config=optimiser.config):
+            print(f"{event.time:>10.1f}  {event.kind:<5} {event.duration:>6.1f} s  {event.energy:>8.3f} kWh  "
+                  f"{stride_label(event.stride)}" + (f"  brick {event.brick}" if event.brick is not None else ""))
+    print(format_report(divergence_report(optimiser, args.supply_interval, args.idle_power)))
+
+
+if __name__ == "__main__":
+    main()
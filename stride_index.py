@@ -0,0 +1,99 @@
+# stride_index.py — One-pass index of brick ranges per stride
+
+from bisect import bisect_right
+from wall_store import GAP_STRIDE
+
+
+class StrideIndex:
+    """
+    Maps each stride key to the brick index ranges it covers, built in a single
+    pass over an assigned WallStore. Keys sort numerically by (vertical block,
+    horizontal stride), so iterating them gives the correct build order.
+    Gap entries are visual offsets, not bricks, and are left out.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.stride_version = store.stride_version
+        self.size = len(store)
+        self.ranges = {}          # Stride key -> list of (start, end) brick ranges, bottom row first
+        self.counts = {}          # Stride key -> number of bricks
+        self._build()
+        self.keys = sorted(self.ranges)
+        self.total_bricks = sum(self.counts.values())
+
+    def _build(self, rows=None):
+        store = self.store
+        strides = store.stride
+        ranges, counts = self.ranges, self.counts
+        for row_index in rows if rows is not None else range(store.num_rows):
+            start, end = store.row_range(row_index)
+            run_start = start
+            # Bricks of one stride are contiguous within a row, so record runs
+            for i in range(start, end + 1):
+                if i < end and strides[i] == strides[run_start]:
+                    continue
+                if i > run_start:
+                    sid = strides[run_start]
+                    if sid != GAP_STRIDE:
+                        ranges.setdefault(sid, []).append((run_start, i))
+                        counts[sid] = counts.get(sid, 0) + i - run_start
+                run_start = i
+
+    def refresh_rows(self, rows, old_keys):
+        """
+        Re-indexes the given courses after their strides were reassigned in
+        place (see StrideOptimiser.replan). old_keys are the stride keys those
+        courses held before; entries of every other course are kept.
+        """
+        store = self.store
+        rows = sorted(rows)
+        spans = [store.row_range(row_index) for row_index in rows]
+        starts = [start for start, _ in spans]
+
+        def outside(run):
+            k = bisect_right(starts, run[0]) - 1
+            return k < 0 or run[0] >= spans[k][1]
+
+        for sid in old_keys & self.ranges.keys():
+            kept = [run for run in self.ranges[sid] if outside(run)]
+            if kept:
+                self.ranges[sid] = kept
+                self.counts[sid] = sum(end - start for start, end in kept)
+            else:
+                del self.ranges[sid], self.counts[sid]
+
+        self._build(rows)
+        touched = set()
+        for start, end in spans:
+            touched.update(store.stride[start:end])
+        for sid in touched & self.ranges.keys():
+            self.ranges[sid].sort()           # Keep bottom row first
+        self.keys = sorted(self.ranges)
+        self.total_bricks = sum(self.counts.values())
+        self.stride_version = store.stride_version
+
+    def is_current(self):
+        """
+        True while the store has not been regrown or had its strides reassigned.
+        """
+        return self.stride_version == self.store.stride_version and self.size == len(self.store)
+
+    @property
+    def total_strides(self):
+        return len(self.keys)
+
+    def iter_order(self):
+        """
+        Yields brick indices stride by stride, in numeric stride order.
+        """
+        for sid in self.keys:
+            for start, end in self.ranges[sid]:
+                yield from range(start, end)
+
+    def stride_bricks(self, sid):
+        """
+        Yields the brick indices of one stride, bottom row first.
+        """
+        for start, end in self.ranges.get(sid, ()):
+            yield from range(start, end)
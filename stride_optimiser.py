@@ -1,25 +1,322 @@
 # stride_optimiser.py - Optimised build order by stride
 
+from array import array
+from bisect import bisect_right
+from collections import namedtuple
+from functools import lru_cache
+from itertools import accumulate, chain, repeat
+from operator import add, sub
+from bond_patterns import PERIODIC_BONDS, course_templates
 from brick import *
-from robot_config import *
+from robot_config import DEFAULT_CONFIG, MAX_STRIDE_HEIGHT_MM, MAX_STRIDE_WIDTH_MM
+from build_scheduler import schedule_build
+from crew_planner import plan_crew
+from instrumentation import count, timed
+from stride_index import StrideIndex
+from stride_packing import pack_wall
+from wall_store import GAP, GAP_STRIDE, stride_key, stride_parts, BrickView
+
+# Stride assignment engines: 'batched' is the fast default, 'reference' is the
+# original brick-by-brick greedy loop kept for equivalence checks, and 'global'
+# shares stride boundaries across each vertical block (see stride_packing.py)
+ENGINES = ("batched", "reference", "global")
+
+# Result of StrideOptimiser.replan: blocks re-planned and the updated stride-mode estimate
+Replan = namedtuple("Replan", [
+    "dirty_blocks", "bricks_reassigned", "stride_delta", "time", "energy", "time_delta", "energy_delta",
+])
+
+
+def row_stride_cuts(lengths, gap_length, stride_width, min_remaining=HALF_BRICK_LENGTH):
+    """
+    Finds where each horizontal stride starts in one row (brick lengths after
+    any gap), using prefix sums and bisection instead of a per-brick loop.
+
+    Returns a list of brick positions, one per stride in order; stride k covers
+    positions cuts[k] up to cuts[k + 1] (or the row end).
+    Matches the greedy rule: a brick opens a new stride if it does not fit in
+    the remaining width, or if it would leave less than min_remaining while
+    more bricks follow.
+    """
+    count = len(lengths)
+    if not count:
+        return []
+    # ends[k]: offset of brick k's far edge from the row start (prefix sum of
+    # brick lengths plus one head joint per preceding brick)
+    ends = list(map(add, accumulate(lengths), range(0, HEAD_JOINT * count, HEAD_JOINT)))
+    last = count - 1
+    look_ahead_limit = stride_width - min_remaining
+
+    cuts = [0]
+    base = -gap_length      # Offset at which the current stride began
+    check = 0               # First brick not yet tested against the current stride
+    while True:
+        j = bisect_right(ends, base + look_ahead_limit, check)
+        if j >= last:
+            # The last brick needs no look-ahead, only a plain fit check
+            if j == last and ends[last] > base + stride_width:
+                cuts.append(last)
+            return cuts
+        # If j == 0 the first brick overflows the gap-shifted stride, leaving stride 1 empty
+        cuts.append(j)
+        base = ends[j] - lengths[j]
+        check = j + 1
+
+
+def course_stride_usage(lengths, gap_length, stride_width):
+    """
+    Returns the set of horizontal stride numbers that receive bricks in one
+    course (brick lengths after any gap).
+    """
+    cuts = row_stride_cuts(lengths, gap_length, stride_width)
+    ends = cuts[1:] + [len(lengths)]
+    return frozenset(n for n, (a, b) in enumerate(zip(cuts, ends), start=1) if b > a)
+
+
+@lru_cache(maxsize=256)
+def template_stride_usage(bond_type, width, stride_width):
+    """
+    Stride numbers used by the (even, odd) course templates of a periodic bond,
+    computed once per bond type, wall width and stride width.
+    """
+    return tuple(
+        course_stride_usage(template.lengths, 0, stride_width)
+        for template in course_templates(bond_type, width)
+    )
+
+
+def periodic_stride_metrics(bond_type, width, rows,
+                            stride_width=MAX_STRIDE_WIDTH_MM, stride_height=MAX_STRIDE_HEIGHT_MM):
+    """
+    Closed-form brick and stride counts for a periodic (stretcher or Flemish) wall,
+    derived from its two course templates without generating any bricks.
+
+    Returns:
+        Tuple (total bricks, total strides, average bricks per stride)
+    """
+    even, odd = course_templates(bond_type, width)
+    used = template_stride_usage(bond_type, width, stride_width)
+    total_bricks, total_strides = template_stride_counts((even, odd), used, rows, stride_height)
+    avg_per_stride = total_bricks / total_strides if total_strides else 0
+    return total_bricks, total_strides, avg_per_stride
+
+
+def template_stride_counts(templates, used, rows, stride_height):
+    """
+    Brick and stride counts of `rows` courses alternating between two gap-free
+    course templates, given the stride numbers each template uses.
+
+    Args:
+        templates: (even, odd) course templates
+        used: (even, odd) sets of stride numbers, see course_stride_usage
+
+    Returns:
+        Tuple (total bricks, total strides)
+    """
+    (even, odd), (used_even, used_odd) = templates, used
+    even_rows, odd_rows = (rows + 1) // 2, rows // 2
+    total_bricks = len(even.types) * even_rows + len(odd.types) * odd_rows
+
+    courses_per_stride = int(stride_height // COURSE_HEIGHT)
+    if courses_per_stride == 1:
+        total_strides = len(used_even) * even_rows + len(used_odd) * odd_rows
+    else:
+        # Any block of two or more courses contains both an even and an odd course
+        full_blocks, leftover = divmod(rows, courses_per_stride)
+        both = len(used_even | used_odd)
+        total_strides = full_blocks * both
+        if leftover >= 2:
+            total_strides += both
+        elif leftover == 1:
+            total_strides += len(used_odd if (rows - 1) % 2 else used_even)
+    return total_bricks, total_strides
+
+
+def estimate_from_counts(total_bricks, total_strides, rows, wall_height_mm, stride_height, mode,
+                         config=DEFAULT_CONFIG):
+    """
+    Closed-form time and energy estimate from brick, stride and row counts.
+
+    Args:
+        mode (str): Either 'stride' or 'sequential'
+        config (RobotConfig): Robot timing and energy parameters
+
+    Returns:
+        Tuple (time in seconds, energy in kWh)
+    """
+    vertical_blocks = int(wall_height_mm // stride_height)
+
+    # Time spent placing bricks and moving vertically
+    time = (
+        total_bricks * config.brick_placement_time +
+        vertical_blocks * config.vertical_move_time
+    )
+
+    # Additional movement time and energy based on mode
+    if mode == "stride":
+        movement_time = total_strides * config.horizontal_move_time
+        movement_energy = total_strides * config.move_energy_kwh
+    elif mode == "sequential":
+        movement_time = rows * 2 * config.horizontal_move_time  # L–R–L zigzag
+        movement_energy = rows * 2 * config.move_energy_kwh
+    else:
+        raise ValueError("Invalid mode: use 'stride' or 'sequential'")
+
+    time += movement_time
+    energy = time * config.energy_per_second + movement_energy
+
+    return time, energy
+
 
 class StrideOptimiser:
-    def __init__(self, wall_map, wall_width_mm, wall_height_mm):
+    def __init__(self, wall_map, wall_width_mm, wall_height_mm,
+                 stride_width=None, stride_height=None,
+                 engine="batched", time_budget=None, assigned=False, config=None):
+        self.config = config or DEFAULT_CONFIG    # Robot timing, energy and reach parameters
+        if stride_width is None:
+            stride_width = self.config.max_stride_width_mm
+        if stride_height is None:
+            stride_height = self.config.max_stride_height_mm
         self.wall_map = wall_map
+        self.store = wall_map.store               # Struct-of-arrays brick storage
         self.wall_width_mm = wall_width_mm
         self.wall_height_mm = wall_height_mm
-        self.stride_width = MAX_STRIDE_WIDTH_MM   # Horizontal limit per robot stride
-        self.stride_height = MAX_STRIDE_HEIGHT_MM # Vertical limit per robot stride
+        self._stride_width = stride_width         # Horizontal limit per robot stride
+        self._stride_height = stride_height       # Vertical limit per robot stride
         self.course_height = COURSE_HEIGHT        # Height per row (brick + joint)
-        self.assign_strides()                     # Automatically assign strides at init
+        self.engine = engine                      # Stride assignment engine, see ENGINES
+        self.time_budget = time_budget            # Seconds allowed for the 'global' engine
+        self.fallback_blocks = 0                  # Blocks the 'global' engine left to greedy
+        self._index = None                        # Cached StrideIndex, built on demand
+        self._schedule = None                     # Cached BuildSchedule, built on demand
+        self._schedule_version = None
+        self._assigned = assigned                 # True if the store already holds a plan
+        self._greedy_version = None               # stride_version right after a greedy assignment
+        self.block_origin = (0, 1)                # (first row, block number) of the vertical block grid
+        if not assigned:
+            self.assign_strides()                 # Automatically assign strides at init
+
+    @property
+    def stride_width(self):
+        return self._stride_width
+
+    @stride_width.setter
+    def stride_width(self, value):
+        self._stride_width = value
+        self.invalidate(reassign=True)
+
+    @property
+    def stride_height(self):
+        return self._stride_height
 
-    def assign_strides(self):
+    @stride_height.setter
+    def stride_height(self, value):
+        self._stride_height = value
+        self.invalidate(reassign=True)
+
+    def invalidate(self, reassign=False):
+        """
+        Drops the cached stride index and schedule. With reassign=True (e.g. after
+        a config change) strides are also reassigned before the next query.
+        """
+        self._index = None
+        self._schedule = None
+        if reassign:
+            self._assigned = False
+
+    @property
+    def stride_index(self):
+        """
+        Returns the StrideIndex for the current assignment, rebuilding it only
+        if the wall or the stride configuration changed since it was built.
+        """
+        if not self._assigned:
+            self.assign_strides()
+        if self._index is None or not self._index.is_current():
+            self._index = StrideIndex(self.store)
+        return self._index
+
+    @timed("assign_strides")
+    def assign_strides(self, engine=None):
         """
         Assigns a stride ID to each brick depending on its horizontal and vertical group.
         Tries to pack as many bricks as possible into each stride, without exceeding limits.
+
+        Args:
+            engine (str): 'batched', 'reference' or 'global'; defaults to the optimiser's engine
         """
+        engine = engine or self.engine
+        if engine == "batched":
+            self._assign_strides_batched()
+        elif engine == "global":
+            self._assign_strides_global()
+        elif engine == "reference":
+            self._assign_strides_reference()
+        else:
+            raise ValueError(f"Invalid engine: use one of {', '.join(ENGINES)}")
+        self.store.stride_version += 1
+        self._assigned = True
+        self._greedy_version = self.store.stride_version if engine != "global" else None
+        self.block_origin = (0, 1)
+        count("bricks_assigned", len(self.store))
+        self._index = None
+        self._schedule = None
+
+    def _assign_strides_global(self):
+        """
+        Global engine: one set of stride boundaries per vertical block, chosen by
+        dynamic programming to minimise horizontal robot movement under the
+        optimiser's config (see stride_packing.block_cut_positions). Blocks that
+        do not fit in the time budget fall back to the batched greedy engine.
+        """
+        courses_per_stride = int(self.stride_height // self.course_height)
+        leftover = pack_wall(self.store, self.stride_width, courses_per_stride, self.time_budget, self.config)
+        self.fallback_blocks = len(leftover)
+        if leftover:
+            self._assign_strides_batched(first_row=leftover[0][0])
+
+    def _assign_strides_batched(self, first_row=0):
+        """
+        Batched engine: derives stride boundaries per row with prefix sums and
+        writes integer stride keys in bulk. Rows with identical brick layouts
+        (every other course in stretcher and Flemish bonds) share one computation.
+        Rows below first_row are left untouched.
+        """
+        store = self.store
+        types, lengths, strides = store.type, store.length, store.stride
+        courses_per_stride = int(self.stride_height // self.course_height)
+        min_remaining = HALF_BRICK_LENGTH
+        run_cache = {}
+
+        for row_idx in range(first_row, store.num_rows):
+            start, end = store.row_range(row_idx)
+            gap_length = 0
+            if start < end and types[start] == GAP:
+                strides[start] = GAP_STRIDE
+                gap_length = lengths[start]
+                start += 1
+
+            row_lengths = lengths[start:end]
+            signature = (gap_length, row_lengths.tobytes())
+            run_sizes = run_cache.get(signature)
+            if run_sizes is None:
+                cuts = row_stride_cuts(row_lengths, gap_length, self.stride_width, min_remaining)
+                run_sizes = list(map(sub, cuts[1:] + [len(row_lengths)], cuts))
+                run_cache[signature] = run_sizes
+
+            # One bulk write per row: stride key k repeated over the k-th run
+            first_key = stride_key(row_idx // courses_per_stride + 1, 1)
+            keys = range(first_key, first_key + len(run_sizes))
+            strides[start:end] = array("l", chain.from_iterable(map(repeat, keys, run_sizes)))
+
+    def _assign_strides_reference(self):
+        """
+        Reference engine: the original brick-by-brick greedy loop with look-ahead.
+        """
+        store = self.store
+        types, lengths, strides = store.type, store.length, store.stride
         stride_id = 1
-        total_rows = len(self.wall_map)
+        total_rows = store.num_rows
         courses_per_stride = int(self.stride_height // self.course_height)
         min_remaining = HALF_BRICK_LENGTH  # Prevent tiny leftover space that breaks flow
 
@@ -27,28 +324,21 @@ class StrideOptimiser:
         for start_row in range(0, total_rows, courses_per_stride):
             end_row = min(start_row + courses_per_stride, total_rows)
             for row_idx in range(start_row, end_row):
-                row = self.wall_map[row_idx]
+                i, row_end = store.row_range(row_idx)
                 current_stride = 1
                 cumulative_length = 0
 
-                i = 0
-                if row and row[0]["type"] == "gap":
+                if i < row_end and types[i] == GAP:
                     # Assign visual offset 'gap' to dummy stride
-                    row[0]["stride"] = "GAP"
-                    cumulative_length = row[0]["length"]
-                    i = 1
+                    strides[i] = GAP_STRIDE
+                    cumulative_length = lengths[i]
+                    i += 1
 
-                bricks = row[i:]
-                j = 0
-                while j < len(bricks):
-                    brick = bricks[j]
-                    brick_len = BRICK_LENGTH if brick["type"] == "full" else HALF_BRICK_LENGTH
+                while i < row_end:
+                    brick_len = lengths[i]
 
                     # Look ahead to see if the next brick will also fit
-                    next_len = 0
-                    if j + 1 < len(bricks):
-                        next_type = bricks[j + 1]["type"]
-                        next_len = BRICK_LENGTH if next_type == "full" else HALF_BRICK_LENGTH
+                    next_len = lengths[i + 1] if i + 1 < row_end else 0
 
                     remaining_space = self.stride_width - cumulative_length
 
@@ -58,83 +348,309 @@ class StrideOptimiser:
                         current_stride += 1
                         cumulative_length = 0
 
-                    # Assign stride label and update length tracker
-                    brick["stride"] = f"S{stride_id}_{current_stride}"
+                    # Assign stride key and update length tracker
+                    strides[i] = stride_key(stride_id, current_stride)
                     cumulative_length += brick_len + HEAD_JOINT
-                    j += 1
+                    i += 1
 
             stride_id += 1
 
+    @timed("replan")
+    def replan(self, stride_width=None, stride_height=None, config=None):
+        """
+        Re-plans the unbuilt part of the wall in place, e.g. after a robot
+        parameter changed mid-job or bricks were built out of plan order.
+
+        Built bricks keep their strides. A vertical block is dirty if it has
+        unbuilt bricks and either the stride size changed or some of its bricks
+        are built; only the unbuilt bricks of dirty blocks are packed into new
+        strides (same greedy rule as the batched engine). A new stride height
+        re-blocks every course from the lowest unfinished one up. The stride
+        index is patched for the dirty courses only, the remaining bricks are
+        rescheduled from the lowest unfinished course (get_build_schedule then
+        covers unbuilt bricks only), and the estimate follows from the patched
+        stride count.
+
+        Args:
+            stride_width, stride_height: new stride limits in mm
+                (default: the config's if one is given, else unchanged)
+            config (RobotConfig): new robot parameters for this optimiser
+
+        Returns:
+            Replan
+        """
+        index = self.stride_index
+        old_time, old_energy = self.estimate_time_and_energy("stride")
+        old_strides = index.total_strides
+        if config is not None:
+            self.config = config
+            stride_width = stride_width or config.max_stride_width_mm
+            stride_height = stride_height or config.max_stride_height_mm
+        stride_width = stride_width or self._stride_width
+        stride_height = stride_height or self._stride_height
+        resized = stride_width != self._stride_width
+        reblocked = stride_height != self._stride_height
+        self._stride_width, self._stride_height = stride_width, stride_height
+
+        store = self.store
+        types, built, strides = store.type, store.built, store.stride
+        # Built flags are single bytes, so unbuilt bricks are counted with bytes.count
+        unbuilt_in = lambda start, end: built[start:end].tobytes().count(0)
+        first_row = next((r for r in range(store.num_rows) if unbuilt_in(*store.row_range(r))), store.num_rows)
+        if reblocked:
+            # New blocks start at the lowest unfinished course, numbered above every existing block
+            top_block = stride_parts(index.keys[-1])[0] if index.keys else 0
+            self.block_origin = (first_row, top_block + 1)
+        origin_row, origin_block = self.block_origin
+        courses_per_stride = int(stride_height // self.course_height)
+
+        # Rows of every block from the one holding the lowest unfinished course up
+        blocks = {}
+        block_start = origin_row + max(0, first_row - origin_row) // courses_per_stride * courses_per_stride
+        for row_index in range(block_start, store.num_rows):
+            blocks.setdefault(origin_block + (row_index - origin_row) // courses_per_stride, []).append(row_index)
+
+        dirty, dirty_rows, old_keys, reassigned = [], [], set(), 0
+        for block, rows in blocks.items():
+            spans = [store.row_range(row_index) for row_index in rows]
+            unbuilt = sum(unbuilt_in(start, end) for start, end in spans)
+            bricks = sum(end - start - (start < end and types[start] == GAP) for start, end in spans)
+            if not unbuilt or not (resized or reblocked or unbuilt < bricks):
+                continue
+            # New stride numbers follow those of bricks already built in this block
+            offset = max((stride_parts(strides[i])[1] for start, end in spans for i in range(start, end)
+                          if built[i] and types[i] != GAP and stride_parts(strides[i])[0] == block), default=0)
+            for row_index, (start, end) in zip(rows, spans):
+                old_keys.update(strides[start:end])
+                reassigned += self._reassign_unbuilt(row_index, block, offset)
+            dirty.append(block)
+            dirty_rows.extend(rows)
+
+        store.stride_version += 1
+        if dirty_rows:
+            index.refresh_rows(dirty_rows, old_keys)
+        index.stride_version = store.stride_version
+        self._schedule = schedule_build(store, first_row, skip_built=True, config=self.config)
+        self._schedule_version = store.stride_version
+        count("bricks_assigned", reassigned)
+
+        new_time, new_energy = self.estimate_time_and_energy("stride")
+        return Replan(tuple(dirty), reassigned, index.total_strides - old_strides,
+                      new_time, new_energy, new_time - old_time, new_energy - old_energy)
+
+    def _reassign_unbuilt(self, row_index, block, offset):
+        """
+        Packs each run of consecutive unbuilt bricks in a course into strides
+        of the given block, numbered from offset + 1. Returns the bricks assigned.
+        """
+        store = self.store
+        types, lengths, built, strides = store.type, store.length, store.built, store.stride
+        start, end = store.row_range(row_index)
+        gap_length = 0
+        if start < end and types[start] == GAP:
+            gap_length = lengths[start]
+            start += 1
+
+        assigned = 0
+        next_key = stride_key(block, offset + 1)
+        i = start
+        while i < end:
+            if built[i]:
+                i += 1
+                continue
+            j = i
+            while j < end and not built[j]:
+                j += 1
+            run_lengths = lengths[i:j]
+            cuts = row_stride_cuts(run_lengths, gap_length if i == start else 0, self.stride_width)
+            run_sizes = list(map(sub, cuts[1:] + [len(run_lengths)], cuts))
+            keys = range(next_key, next_key + len(run_sizes))
+            strides[i:j] = array("l", chain.from_iterable(map(repeat, keys, run_sizes)))
+            next_key += len(run_sizes)
+            assigned += j - i
+            i = j
+        return assigned
+
+    @timed("stride_order")
     def get_stride_order(self):
         """
-        Returns all bricks ordered by stride label, for optimal build sequence.
+        Returns all bricks ordered by stride (vertical block, then horizontal stride),
+        for optimal build sequence.
         """
-        bricks_in_order = []
-        stride_blocks = {}
+        store = self.store
+        return [BrickView(store, i) for i in self.stride_index.iter_order()]
 
-        # Group bricks by their stride ID
-        for row in self.wall_map:
-            for brick in row:
-                sid = brick.get("stride", "S0_0")
-                if sid not in stride_blocks:
-                    stride_blocks[sid] = []
-                stride_blocks[sid].append(brick)
+    @timed("build_schedule")
+    def get_build_schedule(self):
+        """
+        Returns a BuildSchedule whose order respects brick support (every brick
+        after the bricks it rests on) and keeps robot moves between strides cheap.
+        """
+        index = self.stride_index     # Ensures strides are assigned and current
+        if self._schedule is None or self._schedule_version != index.stride_version:
+            self._schedule = schedule_build(self.store, config=self.config)
+            self._schedule_version = index.stride_version
+        return self._schedule
 
-        # Sort strides and flatten into one list
-        for stride_id in sorted(stride_blocks.keys()):
-            bricks_in_order.extend(stride_blocks[stride_id])
+    def get_build_order(self):
+        """
+        Returns all bricks in support-respecting scheduled build order.
+        """
+        store = self.store
+        return [BrickView(store, i) for i in self.get_build_schedule().order]
 
-        return bricks_in_order
+    def plan_crew(self, robots, min_separation=None):
+        """
+        Splits the stride plan across several robots (see crew_planner.plan_crew),
+        using this optimiser's robot config; min_separation defaults to its max stride width.
+        Returns a CrewPlan with per-robot timelines, makespan, energy and speedup.
+        """
+        return plan_crew(self.stride_index, robots, min_separation, self.config)
+
+    def _template_counts(self):
+        """
+        Returns (bricks, strides) in closed form for a wall built from periodic
+        course templates (see WallStore.extend_periodic) whose strides are, or
+        are about to be, the greedy engines' assignment; None for any other wall
+        or once the plan was changed (e.g. by replan), which need the index.
+        """
+        templates = self.store.templates
+        if templates is None or self.engine == "global":
+            return None
+        if self._assigned and self._greedy_version != self.store.stride_version:
+            return None
+        used = tuple(course_stride_usage(template.lengths, 0, self.stride_width) for template in templates)
+        return template_stride_counts(templates, used, self.store.num_rows, self.stride_height)
+
+    def _counts(self):
+        """
+        Returns (total bricks, total strides) of the current plan.
+        """
+        counts = self._template_counts()
+        if counts is None:
+            index = self.stride_index
+            counts = index.total_bricks, index.total_strides
+        return counts
 
     def get_stride_metrics(self):
         """
         Returns the number of bricks, number of strides, and average bricks per stride.
+        Untouched periodic walls are counted from their course templates without
+        assigning strides or building the stride index.
         """
-        stride_counts = {}
-        for row in self.wall_map:
-            for brick in row:
-                sid = brick["stride"]
-                stride_counts.setdefault(sid, 0)
-                stride_counts[sid] += 1
-
-        total_bricks = sum(stride_counts.values())
-        total_strides = len(stride_counts)
+        total_bricks, total_strides = self._counts()
         avg_per_stride = total_bricks / total_strides if total_strides else 0
 
         return total_bricks, total_strides, avg_per_stride
 
-    def estimate_time_and_energy(self, mode):
+    @timed("estimate")
+    def estimate_time_and_energy(self, mode, config=None):
         """
         Estimates total build time and energy use for the wall.
 
         Args:
             mode (str): Either 'stride' or 'sequential'
+            config (RobotConfig): Timing / energy parameters; defaults to the optimiser's.
+                Its stride limits are ignored: the current stride plan is costed.
 
         Returns:
             Tuple (time in seconds, energy in kWh)
         """
-        total_bricks = sum(len(row) for row in self.wall_map)
-        total_strides = len(set(b["stride"] for row in self.wall_map for b in row))
-        vertical_blocks = int(self.wall_height_mm // self.stride_height)
-        rows = len(self.wall_map)
-
-        # Time spent placing bricks and moving vertically
-        time = (
-            total_bricks * BRICK_PLACEMENT_TIME +
-            vertical_blocks * VERTICAL_MOVE_TIME
-        )
-
-        # Additional movement time and energy based on mode
-        if mode == "stride":
-            movement_time = total_strides * HORIZONTAL_MOVE_TIME
-            movement_energy = total_strides * MOVE_ENERGY_KWH
-        elif mode == "sequential":
-            movement_time = rows * 2 * HORIZONTAL_MOVE_TIME  # L–R–L zigzag
-            movement_energy = rows * 2 * MOVE_ENERGY_KWH
-        else:
-            raise ValueError("Invalid mode: use 'stride' or 'sequential'")
+        total_bricks, total_strides = self._counts()
+        return estimate_from_counts(total_bricks, total_strides, self.store.num_rows,
+                                    self.wall_height_mm, self.stride_height, mode, config or self.config)
 
-        time += movement_time
-        energy = time * ENERGY_PER_SECOND + movement_energy
 
-        return time, energy
+class StreamingStrideOptimiser:
+    """
+    Plans a wall from a stream of courses (see Wall.iter_courses) without
+    holding its bricks. Uses the same greedy stride rule as StrideOptimiser,
+    keeping only per-block stride counters, so memory stays constant in the
+    wall height. The stream is consumed once, on the first query. Periodic
+    bonds planned via from_wall are counted in closed form and never stream.
+    """
+
+    def __init__(self, courses, wall_height_mm,
+                 stride_width=None, stride_height=None,
+                 periodic=None, config=None):
+        self.config = config or DEFAULT_CONFIG
+        if stride_width is None:
+            stride_width = self.config.max_stride_width_mm
+        if stride_height is None:
+            stride_height = self.config.max_stride_height_mm
+        self.courses = courses
+        self.periodic = periodic       # Optional (bond type, width, rows) for closed-form counts
+        self.wall_height_mm = wall_height_mm
+        self.stride_width = stride_width
+        self.stride_height = stride_height
+        self.course_height = COURSE_HEIGHT
+        self.total_bricks = None
+        self.total_strides = None
+        self.rows = None
+
+    @classmethod
+    def from_wall(cls, wall, **kwargs):
+        """
+        Plans a (typically lazy) Wall by streaming its courses.
+        """
+        periodic = None
+        if wall.bond_type in PERIODIC_BONDS:
+            periodic = (wall.bond_type, wall.brick_row_length, wall.rows)
+        return cls(wall.iter_courses(), wall.wall_height, periodic=periodic, **kwargs)
+
+    def _consume(self):
+        if self.rows is not None:
+            return
+        if self.periodic:
+            bond_type, width, rows = self.periodic
+            self.total_bricks, self.total_strides, _ = periodic_stride_metrics(
+                bond_type, width, rows, self.stride_width, self.stride_height)
+            self.rows = rows
+            return
+        courses_per_stride = int(self.stride_height // self.course_height)
+        total_bricks = total_strides = rows = 0
+        block_strides = set()      # Stride numbers used by the current vertical block
+        run_cache = {}             # Small, bounded: periodic bonds only have two layouts
+
+        for types, _, lengths in self.courses:
+            if rows % courses_per_stride == 0:
+                total_strides += len(block_strides)
+                block_strides = set()
+            rows += 1
+
+            gap_length = 0
+            if types and types[0] == GAP:
+                gap_length = lengths[0]
+                lengths = lengths[1:]
+            if not lengths:
+                continue
+            signature = (gap_length, tuple(lengths))
+            used = run_cache.get(signature)
+            if used is None:
+                used = course_stride_usage(lengths, gap_length, self.stride_width)
+                if len(run_cache) >= 64:
+                    run_cache.clear()
+                run_cache[signature] = used
+            block_strides |= used
+            total_bricks += len(lengths)
+
+        self.total_bricks = total_bricks
+        self.total_strides = total_strides + len(block_strides)
+        self.rows = rows
+
+    def get_stride_metrics(self):
+        """
+        Returns the number of bricks, number of strides, and average bricks per stride.
+        """
+        self._consume()
+        avg_per_stride = self.total_bricks / self.total_strides if self.total_strides else 0
+        return self.total_bricks, self.total_strides, avg_per_stride
+
+    @timed("estimate")
+    def estimate_time_and_energy(self, mode, config=None):
+        """
+        Estimates total build time and energy use, as StrideOptimiser does.
+        """
+        self._consume()
+        return estimate_from_counts(self.total_bricks, self.total_strides, self.rows,
+                                    self.wall_height_mm, self.stride_height, mode, config or self.config)
@@ -0,0 +1,192 @@
+# stride_packing.py — Shared stride boundaries per vertical block via dynamic programming
+
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import chain, repeat
+from operator import sub
+from robot_config import DEFAULT_CONFIG
+from wall_store import GAP, GAP_STRIDE, stride_key
+
+
+def move_cost(config=DEFAULT_CONFIG):
+    """
+    Cost of one horizontal robot move in seconds: its travel time plus its
+    discrete energy cost converted to working-time equivalent.
+    """
+    return config.horizontal_move_time + config.move_energy_kwh / config.energy_per_second
+
+
+class PackingTimeout(Exception):
+    """
+    Raised when a block cannot be packed within the remaining time budget.
+    """
+
+
+def crossed_courses(positions, links):
+    """
+    Counts, for each candidate cut, the course pairs in which it splits a support.
+
+    Args:
+        positions: sorted candidate cut positions (distinct brick starts)
+        links: one list per adjacent course pair of (x1, x2) start positions of
+               a brick and a brick it rests on, x1 < x2
+
+    Returns:
+        List parallel to positions. A cut at p splits a support (x1, x2)
+        when x1 < p <= x2: the two bricks then fall in different strides.
+    """
+    count = len(positions)
+    where = {x: k for k, x in enumerate(positions)}
+    crossed = [0] * count
+    for pairs in links:
+        delta = [0] * (count + 1)
+        for x1, x2 in pairs:
+            delta[where[x1] + 1] += 1
+            delta[where[x2] + 1] -= 1
+        running = 0
+        for k in range(count):
+            running += delta[k]
+            if running:
+                crossed[k] += 1
+    return crossed
+
+
+def block_cut_positions(starts, ends, stride_width, deadline=None, links=(), cost_per_move=None):
+    """
+    Chooses stride boundaries shared by every course of one vertical block.
+
+    A brick belongs to the stride whose range contains its start x; a stride
+    is feasible if all its bricks, across every course of the block, fit in
+    stride_width. Candidate cuts are the distinct brick start positions, and
+    dynamic programming picks the feasible sequence of strides with the least
+    horizontal movement: one move into each stride, plus one move back across
+    a cut for every course pair in which it splits a support, since the robot
+    cannot finish a stride whose upper bricks rest on bricks of its neighbour
+    (see build_scheduler.schedule_build). Vertical moves, one per block, do
+    not depend on the cuts and are left out.
+
+    Args:
+        starts, ends: brick start / end x-positions (mm) over all courses of the block
+        deadline: perf_counter() value after which PackingTimeout is raised
+        links: supports between adjacent courses of the block (see crossed_courses)
+        cost_per_move (float): cost of one horizontal move (default: move_cost())
+
+    Returns:
+        Sorted list of cut positions; the first stride starts at cuts[0].
+    """
+    if not starts:
+        return []
+    if cost_per_move is None:
+        cost_per_move = move_cost()
+    # Furthest brick end for each distinct start position
+    reach = {}
+    for x, end in zip(starts, ends):
+        if end > reach.get(x, x):
+            reach[x] = end
+    positions = sorted(reach)
+    far = [reach[x] for x in positions]
+    count = len(positions)
+    # Cost of the stride that ends just before each position; the last one ends at the wall end
+    close = [cost_per_move * (1 + crossed) for crossed in crossed_courses(positions, links)]
+    close.append(cost_per_move)
+
+    inf = float("inf")
+    cost = [inf] * (count + 1)
+    back = [0] * (count + 1)
+    cost[0] = 0
+    for i in range(count):
+        if deadline is not None and time.perf_counter() > deadline:
+            raise PackingTimeout
+        if cost[i] == inf:
+            continue
+        base = positions[i]
+        max_end = far[i]
+        j = i + 1
+        while True:
+            # Stride covering positions[i:j]; a single start is always allowed
+            if cost[i] + close[j] < cost[j]:
+                cost[j] = cost[i] + close[j]
+                back[j] = i
+            if j == count:
+                break
+            max_end = max(max_end, far[j])
+            if max_end - base > stride_width:
+                break
+            j += 1
+
+    cuts = []
+    j = count
+    while j > 0:
+        j = back[j]
+        cuts.append(positions[j])
+    cuts.reverse()
+    return cuts
+
+
+def pack_block(store, first_row, end_row, block_number, stride_width, deadline=None, cost_per_move=None):
+    """
+    Assigns stride keys to the courses first_row .. end_row - 1 using shared cuts.
+    Returns the number of strides used.
+    """
+    types, xs, lengths, strides = store.type, store.x, store.length, store.stride
+    row_slices = []
+    starts, ends = [], []
+    links = []
+    lower = None
+    for row_index in range(first_row, end_row):
+        start, end = store.row_range(row_index)
+        if start < end and types[start] == GAP:
+            strides[start] = GAP_STRIDE
+            start += 1
+        row_slices.append((start, end))
+        row_xs = xs[start:end]
+        row_ends = [x + ln for x, ln in zip(row_xs, lengths[start:end])]
+        starts.extend(row_xs)
+        ends.extend(row_ends)
+        if lower is not None:
+            # Bricks of the course below overlapping each brick, as in build_scheduler.support_ranges
+            low_xs, low_ends = lower
+            pairs = []
+            for x, end_x in zip(row_xs, row_ends):
+                for k in range(bisect_right(low_ends, x), bisect_left(low_xs, end_x)):
+                    if low_xs[k] != x:
+                        pairs.append((x, low_xs[k]) if x < low_xs[k] else (low_xs[k], x))
+            links.append(pairs)
+        lower = row_xs, row_ends
+
+    cuts = block_cut_positions(starts, ends, stride_width, deadline, links, cost_per_move)
+    first_key = stride_key(block_number, 1)
+    for start, end in row_slices:
+        if start == end:
+            continue
+        row_xs = xs[start:end]
+        # Position of each cut within the row; bricks before cuts[1] go to stride 1
+        bounds = [0] + [bisect_left(row_xs, cut) for cut in cuts[1:]] + [end - start]
+        strides[start:end] = array("l", chain.from_iterable(
+            map(repeat, range(first_key, first_key + len(cuts)), map(sub, bounds[1:], bounds))
+        ))
+    return len(cuts)
+
+
+def pack_wall(store, stride_width, courses_per_stride, time_budget=None, config=DEFAULT_CONFIG):
+    """
+    Packs every vertical block of the wall with shared stride boundaries,
+    costing robot moves with the given config.
+    Stops at the first block that would exceed time_budget seconds.
+
+    Returns:
+        List of (first_row, end_row, block_number) blocks left unpacked, for a greedy fallback.
+    """
+    deadline = time.perf_counter() + time_budget if time_budget is not None else None
+    cost_per_move = move_cost(config)
+    blocks = [
+        (first_row, min(first_row + courses_per_stride, store.num_rows), n)
+        for n, first_row in enumerate(range(0, store.num_rows, courses_per_stride), start=1)
+    ]
+    for position, (first_row, end_row, block_number) in enumerate(blocks):
+        try:
+            pack_block(store, first_row, end_row, block_number, stride_width, deadline, cost_per_move)
+        except PackingTimeout:
+            return blocks[position:]
+    return []
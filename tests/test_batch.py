@@ -0,0 +1,47 @@
+# test_batch.py — Scenario grids and results of headless batch runs
+
+import json
+
+import pytest
+
+import batch
+import sweep
+from batch import RESULT_FIELDS, build_grid, load_scenarios, run_scenario
+from robot_config import DEFAULT_CONFIG, ROBOT_FIELDS
+
+
+def test_crew_columns_share_one_model():
+    one, two = (run_scenario(s) for s in build_grid(["wild"], [41], [2300], [800], [1300], [3], robots=[1, 2]))
+    assert one["crew_speedup"] == 1.0
+    # The two-robot speedup is measured against the one-robot crew makespan
+    assert two["crew_makespan"] * two["crew_speedup"] == pytest.approx(one["crew_makespan"], rel=1e-3)
+
+
+@pytest.mark.parametrize("robots", [0, -2])
+def test_grid_rejects_empty_crews(robots):
+    with pytest.raises(ValueError, match="robots"):
+        build_grid(["stretcher"], [10], [2300], [800], [1300], [0], robots=[robots])
+
+
+def test_scenario_file_rejects_empty_crews(tmp_path):
+    path = tmp_path / "scenarios.jsonl"
+    path.write_text(json.dumps({"robots": 0}) + "\n")
+    with pytest.raises(ValueError, match="scenario 0"):
+        load_scenarios(path)
+
+
+def test_robot_parameters_vary_and_are_recorded():
+    slow, fast = (run_scenario(s) for s in build_grid(["stretcher"], [10], [2300], [800], [1300], [0],
+                                                         brick_placement_time=[3, 1]))
+    assert slow["brick_placement_time"] == 3 and fast["brick_placement_time"] == 1
+    assert slow["stride_time"] - fast["stride_time"] == 2 * slow["bricks"]
+    assert set(RESULT_FIELDS) <= set(slow)
+
+
+def test_batch_and_sweep_share_robot_options():
+    argv = ["--placement-time", "1.5", "3", "--move-energy", "0.1"]
+    for args in (batch.parse_args(argv), sweep.parse_args(argv)):
+        assert args.brick_placement_time == [1.5, 3.0]
+        assert args.move_energy_kwh == [0.1]
+        assert args.vertical_move_time == [DEFAULT_CONFIG.vertical_move_time]
+        assert all(hasattr(args, name) for name in ROBOT_FIELDS)
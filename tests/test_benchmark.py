@@ -0,0 +1,19 @@
+# test_benchmark.py — Baseline comparison of benchmark runs
+
+from benchmark import compare
+
+
+def result(seconds, operation="generate"):
+    return {"operation": operation, "bond_type": "wild", "rows": 50, "wall_width": 10000, "seconds": seconds}
+
+
+def test_only_slow_cases_beyond_both_thresholds_regress():
+    baseline = {"results": [result(1.0), result(0.001, "mark_next")]}
+    assert compare([result(1.05)], baseline, threshold=0.1) == []
+    assert compare([result(1.5)], baseline, threshold=0.1) == [(result(1.5), 1.0, 1.5)]
+    # Twice as slow, but by less than min_delta seconds: timer noise
+    assert compare([result(0.002, "mark_next")], baseline, threshold=0.1, min_delta=0.01) == []
+
+
+def test_cases_missing_from_the_baseline_are_skipped():
+    assert compare([result(5.0, "display")], {"results": [result(1.0)]}, threshold=0.1) == []
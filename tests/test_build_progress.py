@@ -0,0 +1,71 @@
+# test_build_progress.py — Build cursor and progress counters
+
+from stride_optimiser import StrideOptimiser
+from wall import Wall
+from wall_store import GAP
+
+
+def make(bond_type="wild", rows=6):
+    wall = Wall(num_rows=rows, bond_type=bond_type, wall_width=2300, seed=1)
+    StrideOptimiser(wall.wall_map, wall.wall_width, wall.wall_height)
+    return wall
+
+
+def recount(store, progress):
+    """
+    Counters rebuilt from scratch, to compare with the incremental ones.
+    """
+    bricks = [i for i in range(len(store)) if store.type[i] != GAP]
+    rows = [progress.row_percent(r) for r in range(store.num_rows)]
+    return sum(store.built[i] for i in bricks), len(bricks), rows
+
+
+def test_mark_next_skips_gaps_and_built_bricks():
+    wall = make()
+    store, progress = wall.store, wall.progress
+    progress.mark(store.row_range(0)[0] + 1)
+    marked = [progress.mark_next() for _ in range(5)]
+    assert all(store.type[i] != GAP for i in marked)
+    assert len(set(marked)) == 5 and store.row_range(0)[0] + 1 not in marked
+    assert progress.built_count == 6
+
+
+def test_wall_completes_and_then_returns_none():
+    wall = make(rows=3)
+    progress = wall.progress
+    while progress.mark_next() is not None:
+        pass
+    assert progress.is_complete() and progress.percent_complete() == 100.0
+    assert progress.built_count == recount(wall.store, progress)[1]
+
+
+def test_stride_marking_stays_in_the_stride():
+    wall = make()
+    store, progress = wall.store, wall.progress
+    sid = store.stride[store.row_range(1)[0] + 1]
+    marked = []
+    while (index := progress.mark_next_in_stride(sid)) is not None:
+        marked.append(index)
+    assert marked and all(store.stride[i] == sid for i in marked)
+    assert progress.stride_percent(sid) == 100.0
+
+
+def test_undo_and_reset_restore_the_counters():
+    wall = make()
+    store, progress = wall.store, wall.progress
+    before = recount(store, progress)
+    for _ in range(7):
+        progress.mark_next()
+    sid = store.stride[progress.history[-1]]
+    progress.stride_percent(sid)
+    for _ in range(7):
+        progress.undo()
+    assert progress.undo() is None
+    assert recount(store, progress) == before and progress.built_count == 0
+    assert progress.stride_percent(sid) == 0.0
+    for _ in range(4):
+        progress.mark_next()
+    epoch = progress.epoch
+    progress.reset()
+    assert progress.epoch > epoch
+    assert recount(store, progress) == before and progress.cursor == 0
@@ -0,0 +1,58 @@
+# test_build_scheduler.py — Support-aware build ordering and its move costs
+
+import pytest
+
+from build_scheduler import schedule_build, support_ranges, validate_order
+from robot_config import DEFAULT_CONFIG
+from stride_optimiser import StrideOptimiser
+from wall import Wall
+from wall_store import GAP
+
+
+def make(bond_type, rows=24, width=3000):
+    wall = Wall(num_rows=rows, bond_type=bond_type, wall_width=width, seed=11)
+    StrideOptimiser(wall.wall_map, wall.wall_width, wall.wall_height)
+    return wall.store
+
+
+def bricks(store):
+    return [i for i in range(len(store)) if store.type[i] != GAP]
+
+
+@pytest.mark.parametrize("bond_type", ["stretcher", "flemish", "wild"])
+def test_schedule_places_every_brick_after_its_supports(bond_type):
+    store = make(bond_type)
+    order = schedule_build(store).order
+    assert sorted(order) == bricks(store)
+    assert validate_order(store, order) is None
+
+
+def test_validate_order_reports_a_floating_brick():
+    store = make("stretcher", rows=3)
+    upper = store.row_range(1)[0]
+    order = [upper] + [i for i in bricks(store) if i != upper]
+    assert validate_order(store, order) == upper
+
+
+def test_supports_overlap_the_brick():
+    store = make("wild", rows=6)
+    below_lo, below_hi, above_lo, above_hi = support_ranges(store)
+    for i in bricks(store):
+        if store.row[i] == 0:
+            assert below_lo[i] == below_hi[i]
+            continue
+        end = store.x[i] + store.length[i]
+        for k in range(below_lo[i], below_hi[i]):
+            assert store.x[k] < end and store.x[k] + store.length[k] > store.x[i]
+            assert above_lo[k] <= i < above_hi[k]
+
+
+def test_move_time_follows_config():
+    store = make("wild")
+    schedule = schedule_build(store)
+    slow = DEFAULT_CONFIG._replace(horizontal_move_time=30, vertical_move_time=45)
+    slow_schedule = schedule_build(store, config=slow)
+    assert slow_schedule.order == schedule.order
+    assert schedule.move_time == (schedule.horizontal_moves * DEFAULT_CONFIG.horizontal_move_time
+                                  + schedule.vertical_moves * DEFAULT_CONFIG.vertical_move_time)
+    assert slow_schedule.move_time == 3 * schedule.move_time
@@ -0,0 +1,57 @@
+# test_crew_planner.py — Splitting a stride plan across a robot crew
+
+import pytest
+
+from crew_planner import block_dependencies, stride_tasks
+from stride_optimiser import StrideOptimiser
+from wall import Wall
+
+
+def make(bond_type="wild", rows=40, width=8000):
+    wall = Wall(num_rows=rows, bond_type=bond_type, wall_width=width, seed=2)
+    return StrideOptimiser(wall.wall_map, wall.wall_width, wall.wall_height)
+
+
+def test_single_robot_has_no_speedup():
+    plan = make().plan_crew(1)
+    assert plan.speedup == 1.0 and plan.makespan == plan.single_robot_makespan
+    assert len(plan.timelines) == 1
+
+
+@pytest.mark.parametrize("robots", [2, 3])
+def test_crew_builds_every_stride_once_and_no_slower(robots):
+    optimiser = make()
+    plan = optimiser.plan_crew(robots)
+    built = [task.stride for timeline in plan.timelines for task in timeline]
+    assert sorted(built) == sorted(optimiser.stride_index.keys)
+    assert plan.makespan <= plan.single_robot_makespan
+    assert plan.speedup == pytest.approx(plan.single_robot_makespan / plan.makespan)
+
+
+def test_robot_timelines_do_not_overlap():
+    plan = make().plan_crew(3)
+    for timeline in plan.timelines:
+        for before, after in zip(timeline, timeline[1:]):
+            assert before.end <= after.start
+
+
+def test_empty_crew_is_rejected():
+    with pytest.raises(ValueError):
+        make().plan_crew(0)
+
+
+def test_strides_wait_for_their_supports_and_keep_clear():
+    optimiser = make()
+    plan = optimiser.plan_crew(3)
+    tasks = stride_tasks(optimiser.stride_index)
+    finished = {task.stride: task.end for timeline in plan.timelines for task in timeline}
+    running = [task for timeline in plan.timelines for task in timeline]
+    for sid, supports in block_dependencies(optimiser.store).items():
+        start = next(task.start for task in running if task.stride == sid)
+        assert all(finished[support] <= start for support in supports)
+    separation = optimiser.config.max_stride_width_mm
+    for a in running:
+        for b in running:
+            if a.stride < b.stride and a.start < b.end and b.start < a.end:
+                (a_min, a_max, _), (b_min, b_max, _) = tasks[a.stride], tasks[b.stride]
+                assert max(a_min, b_min) - min(a_max, b_max) >= separation
@@ -0,0 +1,76 @@
+# test_instruction_export.py — Controller instruction export and segment verification
+
+import json
+
+import pytest
+
+from instruction_export import (
+    RECORD, Checksum, End, Instruction, export_instructions, iter_instructions, read_binary, verify_segments,
+)
+from stride_optimiser import StrideOptimiser
+from wall import Wall
+
+
+def make(rows=40):
+    wall = Wall(num_rows=rows, bond_type="wild", wall_width=3000, seed=6)
+    optimiser = StrideOptimiser(wall.wall_map, wall.wall_width, wall.wall_height, stride_height=500)
+    return wall, optimiser
+
+
+def test_binary_export_round_trips_and_verifies(tmp_path):
+    wall, optimiser = make()
+    path = tmp_path / "plan.bin"
+    summary = export_instructions(path, wall, optimiser, fmt="binary")
+    header, records = read_binary(path)
+    records = list(records)
+    assert header["rows"] == wall.rows
+    assert records == list(iter_instructions(wall.store, optimiser.get_build_schedule().order))
+    assert sum(isinstance(r, Instruction) for r in records) == summary.instructions
+    results = list(verify_segments(records))
+    assert len(results) == summary.segments > 1
+    assert all(ok for _, _, ok in results)
+
+
+def test_jsonl_export_has_one_line_per_record(tmp_path):
+    wall, optimiser = make(rows=10)
+    path = tmp_path / "plan.jsonl"
+    summary = export_instructions(path, wall, optimiser)
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert lines[0]["op"] == "header" and lines[-1]["op"] == "end"
+    assert sum(line["op"] in ("place", "move") for line in lines) == summary.instructions
+    placed = [line["brick"] for line in lines if line["op"] == "place"]
+    assert placed == list(optimiser.get_build_schedule().order)
+
+
+def test_truncated_file_fails_verification(tmp_path):
+    wall, optimiser = make()
+    path = tmp_path / "plan.bin"
+    export_instructions(path, wall, optimiser, fmt="binary")
+    data = path.read_bytes()
+    path.write_bytes(data[:len(data) // 2 + RECORD.size // 2])
+    _, records = read_binary(path)
+    results = list(verify_segments(records))
+    assert not results[-1][2]
+    assert all(ok for _, _, ok in results[:-1])
+
+
+def test_corrupted_record_fails_its_segment():
+    wall, optimiser = make()
+    records = list(iter_instructions(wall.store, optimiser.get_build_schedule().order))
+    k = next(k for k, r in enumerate(records) if isinstance(r, Checksum)) + 3
+    records[k] = records[k]._replace(x=records[k].x + 1)
+    results = list(verify_segments(records))
+    assert [ok for _, _, ok in results].count(False) == 1
+    assert not results[1][2]
+
+
+@pytest.mark.parametrize("start_segment", [1, 3])
+def test_resume_matches_the_full_export(start_segment):
+    wall, optimiser = make()
+    order = optimiser.get_build_schedule().order
+    full = [r for r in iter_instructions(wall.store, order) if not isinstance(r, End)]
+    resumed = list(iter_instructions(wall.store, order, start_segment))
+    checksums = [r for r in full if isinstance(r, Checksum)]
+    assert [r for r in resumed if isinstance(r, Checksum)] == checksums[start_segment:]
+    assert resumed[-1] == End(len(checksums), sum(isinstance(r, Instruction) for r in resumed))
+    assert all(ok for _, _, ok in verify_segments(resumed, start_segment))
@@ -0,0 +1,35 @@
+# test_monte_carlo.py — Reproducible Monte Carlo cost statistics
+
+from monte_carlo import METRICS, monte_carlo, run_sample, sample_seed, summarise
+from robot_config import DEFAULT_CONFIG
+
+SETTINGS = dict(rows=6, wall_width=2300, master_seed=3, min_samples=8, max_samples=24, batch_size=8)
+
+
+def test_sample_seeds_depend_on_master_seed_and_index():
+    assert sample_seed(3, 5) == sample_seed(3, 5)
+    assert len({sample_seed(3, k) for k in range(50)}) == 50
+    assert sample_seed(3, 0) != sample_seed(4, 0)
+
+
+def test_results_do_not_depend_on_worker_count():
+    serial = monte_carlo(workers=1, **SETTINGS)
+    pooled = monte_carlo(workers=2, **SETTINGS)
+    assert (serial.samples, serial.converged, serial.metrics) == (pooled.samples, pooled.converged, pooled.metrics)
+
+
+def test_sampling_stops_once_precise():
+    loose = monte_carlo(workers=1, precision=0.5, **SETTINGS)
+    assert loose.converged and loose.samples == SETTINGS["min_samples"]
+    tight = monte_carlo(workers=1, precision=1e-9, **SETTINGS)
+    assert not tight.converged and tight.samples == SETTINGS["max_samples"]
+
+
+def test_summary_matches_the_samples():
+    values = [run_sample((6, 2300, DEFAULT_CONFIG, "batched", sample_seed(3, k)))[2] for k in range(8)]
+    result = monte_carlo(workers=1, precision=0.5, **SETTINGS)
+    assert set(result.metrics) == set(METRICS)
+    assert result.metrics["time"] == summarise(values)
+    summary = result.metrics["time"]
+    assert summary.ci_low <= summary.mean <= summary.ci_high
+    assert summary.p5 <= summary.p50 <= summary.p95
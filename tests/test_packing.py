@@ -0,0 +1,55 @@
+# test_packing.py — Shared stride boundaries chosen by the global engine
+
+import pytest
+
+from stride_packing import block_cut_positions, crossed_courses, move_cost
+from stride_optimiser import StrideOptimiser
+from robot_config import DEFAULT_CONFIG
+from wall import Wall
+from wall_store import GAP, stride_parts
+
+
+def test_crossed_courses_counts_split_supports():
+    positions = [0, 100, 200, 300]
+    links = [[(0, 200)], [(100, 200), (200, 300)]]
+    # Cut at 100 splits the first pair; 200 splits both course pairs; 300 the second
+    assert crossed_courses(positions, links) == [0, 1, 2, 1]
+
+
+def test_cuts_avoid_split_supports_when_stride_count_ties():
+    # Two strides are needed either way; only the cut at 300 keeps the brick
+    # starting at 200 in the same stride as the one at 0 it rests on
+    starts, ends = [0, 200, 300], [200, 300, 500]
+    links = [[(0, 200)]]
+    assert block_cut_positions(starts, ends, 400, links=links) == [0, 300]
+    assert len(block_cut_positions(starts, ends, 400)) == 2
+
+
+def test_move_cost_follows_config():
+    slow = DEFAULT_CONFIG._replace(horizontal_move_time=40)
+    assert move_cost(slow) - move_cost() == 30
+
+
+@pytest.mark.parametrize("bond_type", ["stretcher", "flemish", "wild"])
+def test_global_strides_fit_width(bond_type):
+    wall = Wall(num_rows=30, bond_type=bond_type, wall_width=6000, seed=2)
+    optimiser = StrideOptimiser(wall.wall_map, wall.wall_width, wall.wall_height, engine="global")
+    store = optimiser.store
+    optimiser.stride_index
+    extents = {}
+    for i in range(len(store)):
+        if store.type[i] == GAP:
+            continue
+        low, high = extents.get(store.stride[i], (store.x[i], 0))
+        extents[store.stride[i]] = (min(low, store.x[i]), max(high, store.x[i] + store.length[i]))
+    assert all(high - low <= optimiser.stride_width for low, high in extents.values())
+    assert all(stride_parts(sid)[1] >= 1 for sid in extents)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_global_engine_visits_each_flemish_stride_once(seed):
+    wall = Wall(num_rows=60, bond_type="flemish", wall_width=8000, seed=seed)
+    optimiser = StrideOptimiser(wall.wall_map, wall.wall_width, wall.wall_height, engine="global")
+    schedule = optimiser.get_build_schedule()
+    # Cuts that never split a support let the robot finish each stride in one visit
+    assert schedule.horizontal_moves < optimiser.stride_index.total_strides
@@ -0,0 +1,59 @@
+# test_plan_format.py — Saving and reopening binary wall plans
+
+from plan_format import STORE_COLUMNS, load_plan, save_plan
+from robot_config import DEFAULT_CONFIG
+from stride_optimiser import StrideOptimiser
+from sweep import plan_counts
+from wall import Wall
+
+
+def make(bond_type="wild", rows=20, width=3000, config=DEFAULT_CONFIG):
+    wall = Wall(num_rows=rows, bond_type=bond_type, wall_width=width, seed=3)
+    optimiser = StrideOptimiser(wall.wall_map, wall.wall_width, wall.wall_height, config=config)
+    optimiser.assign_strides()
+    for _ in range(25):
+        wall.progress.mark_next()
+    return wall, optimiser
+
+
+def test_round_trip_keeps_columns_and_history(tmp_path):
+    wall, optimiser = make()
+    path = tmp_path / "wall.plan"
+    save_plan(path, wall, optimiser)
+    loaded, loaded_optimiser = load_plan(path)
+    for name in STORE_COLUMNS:
+        assert bytes(getattr(loaded.store, name)) == bytes(getattr(wall.store, name))
+    assert list(loaded.progress.history) == list(wall.progress.history)
+    assert loaded_optimiser.get_stride_metrics() == optimiser.get_stride_metrics()
+
+
+def test_robot_config_round_trips(tmp_path):
+    config = DEFAULT_CONFIG._replace(brick_placement_time=3.5, move_energy_kwh=0.2)
+    wall, optimiser = make(config=config)
+    path = tmp_path / "wall.plan"
+    save_plan(path, wall, optimiser)
+    _, loaded_optimiser = load_plan(path)
+    assert loaded_optimiser.config == config
+
+
+def test_loaded_plan_can_be_saved_again(tmp_path):
+    wall, optimiser = make()
+    first, second = tmp_path / "first.plan", tmp_path / "second.plan"
+    save_plan(first, wall, optimiser)
+    loaded, loaded_optimiser = load_plan(first)
+    loaded.progress.mark_next()
+    save_plan(second, loaded, loaded_optimiser)
+    again, _ = load_plan(second)
+    assert list(again.progress.history) == list(loaded.progress.history)
+    assert bytes(again.store.built) == bytes(loaded.store.built)
+
+
+def test_sweep_counts_a_loaded_plan(tmp_path):
+    wall, optimiser = make()
+    path = tmp_path / "wall.plan"
+    save_plan(path, wall, optimiser)
+    loaded, _ = load_plan(path)
+    before = bytes(loaded.store.stride)
+    counts = plan_counts(loaded, [(600, 1000), (800, 1200)])
+    assert counts == plan_counts(wall, [(600, 1000), (800, 1200)])
+    assert bytes(loaded.store.stride) == before
@@ -0,0 +1,49 @@
+# test_playback.py — Frame-budgeted auto-build playback
+
+from playback import play
+
+
+class FakeClock:
+    """
+    Manual clock: time only moves when the player sleeps or a step is placed.
+    """
+
+    def __init__(self, step_cost=0.001):
+        self.now = 0.0
+        self.step_cost = step_cost
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def steps(labels, placed, clock):
+    def place(label):
+        placed.append(label)
+        clock.now += clock.step_cost
+    return [(label, lambda label=label: place(label)) for label in labels]
+
+
+def test_one_brick_per_frame_by_default():
+    clock, placed, drawn = FakeClock(), [], []
+    stats = play(steps(range(10), placed, clock), drawn.append, 10, fps=20, clock=clock, sleep=clock.sleep)
+    assert placed == list(range(10)) and drawn == list(range(10))
+    assert stats.frames == 10 and stats.bricks == 10
+
+
+def test_per_stride_draws_one_frame_per_stride():
+    clock, placed, drawn = FakeClock(), [], []
+    labels = ["a"] * 4 + ["b"] * 3 + ["c"] * 5
+    stats = play(steps(labels, placed, clock), drawn.append, len(labels), per_stride=True,
+                 clock=clock, sleep=clock.sleep)
+    assert placed == labels and drawn == ["a", "b", "c"] and stats.frames == 3
+
+
+def test_duration_bounds_the_frame_count():
+    clock, placed, drawn = FakeClock(), [], []
+    stats = play(steps(range(1000), placed, clock), drawn.append, 1000, fps=10, duration=2.0,
+                 clock=clock, sleep=clock.sleep)
+    assert placed == list(range(1000))
+    assert stats.frames <= 21 and clock.now <= 2.5
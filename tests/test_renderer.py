@@ -0,0 +1,84 @@
+# test_renderer.py — Incremental frames of the full-wall renderer and the viewport
+
+import re
+
+from ansi_colors import RESET
+from renderer import WallRenderer
+from stride_optimiser import StrideOptimiser
+from viewport import Viewport
+from wall import Wall
+
+
+COLOUR = re.compile(r"\x1b\[38;5;\d+m")
+
+
+def colour_runs(line):
+    """
+    Colour escapes of a rendered line with repeats of the same colour merged.
+    """
+    runs = []
+    for code in COLOUR.findall(line.replace(RESET, "")):
+        if not runs or runs[-1] != code:
+            runs.append(code)
+    return runs
+
+
+def fresh_cells(wall):
+    renderer = WallRenderer(wall)
+    renderer.render_rows()
+    return renderer._cells
+
+
+def test_incremental_frames_match_full_render():
+    wall = Wall(num_rows=6, bond_type="flemish")
+    renderer = WallRenderer(wall)
+    renderer.render_frame()
+    for _ in range(10):
+        wall.progress.mark_next()
+        renderer.render_frame()
+    assert renderer._cells == fresh_cells(wall)
+
+
+def test_undo_then_mark_between_frames_redraws():
+    wall = Wall(num_rows=6, bond_type="stretcher")
+    renderer = WallRenderer(wall)
+    progress = wall.progress
+    for index in (4, 30):
+        progress.mark(index)
+    renderer.render_frame()
+    # History length is unchanged, but brick 30 is no longer built
+    progress.undo()
+    progress.mark(12)
+    renderer.render_frame()
+    assert renderer._cells == fresh_cells(wall)
+
+
+def test_reset_redraws():
+    wall = Wall(num_rows=4)
+    renderer = WallRenderer(wall)
+    wall.progress.mark_next()
+    renderer.render_frame()
+    wall.progress.reset()
+    wall.progress.mark_next()
+    renderer.render_frame()
+    assert renderer._cells == fresh_cells(wall)
+
+
+def test_viewport_shows_built_bricks():
+    wall = Wall(num_rows=40, wall_width=20000)
+    view = Viewport(wall, width=40, height=10, colour_by_stride=False)
+    assert view.render_frame()
+    wall.progress.mark(0)
+    view.follow_build()
+    assert "▓" in view.render_rows()[-1]
+
+
+def test_viewport_colours_follow_renderer_parity():
+    # Wild courses start with a gap entry, which must not shift the shade pattern
+    wall = Wall(num_rows=8, bond_type="wild", seed=4)
+    StrideOptimiser(wall.wall_map, wall.wall_width, wall.wall_height, stride_width=500)
+    while wall.progress.mark_next() is not None:
+        pass
+    full = WallRenderer(wall).render_rows()
+    view = Viewport(wall, width=120, height=10).render_rows()
+    assert [colour_runs(line) for line in view] == [colour_runs(line) for line in full]
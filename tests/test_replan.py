@@ -0,0 +1,86 @@
+# test_replan.py — Incremental re-planning of partly built walls
+
+import pytest
+
+from build_scheduler import schedule_build, support_ranges
+from stride_index import StrideIndex
+from stride_optimiser import StrideOptimiser
+from wall import Wall
+from wall_store import GAP
+
+
+def make(bond_type="stretcher", rows=30, width=4000):
+    wall = Wall(num_rows=rows, bond_type=bond_type, wall_width=width, seed=5)
+    optimiser = StrideOptimiser(wall.wall_map, wall.wall_width, wall.wall_height)
+    optimiser.get_build_schedule()
+    return wall, optimiser
+
+
+def unbuilt(store):
+    return {i for i in range(len(store)) if store.type[i] != GAP and not store.built[i]}
+
+
+def assert_valid_order(store, order):
+    """
+    The order covers each unbuilt brick once and never places a brick before its supports.
+    """
+    assert len(order) == len(set(order)) and set(order) == unbuilt(store)
+    below_lo, below_hi, _, _ = support_ranges(store)
+    placed = {i for i in range(len(store)) if store.built[i]}
+    for i in order:
+        assert all(j in placed for j in range(below_lo[i], below_hi[i]))
+        placed.add(i)
+
+
+def build_partially(wall, bricks, floating=()):
+    """
+    Builds the first `bricks` bricks in row order plus some bricks further up
+    whose supports are not built.
+    """
+    for _ in range(bricks):
+        wall.progress.mark_next()
+    for index in floating:
+        wall.progress.mark(index)
+
+
+@pytest.mark.parametrize("bond_type", ["stretcher", "flemish", "wild"])
+def test_replan_with_brick_resting_on_unbuilt(bond_type):
+    wall, optimiser = make(bond_type)
+    store = wall.store
+    build_partially(wall, 150)
+    # A brick two courses above the built part rests on unbuilt bricks
+    top_row = store.row[wall.progress.history[-1]] + 2
+    start, end = store.row_range(top_row)
+    floating = [i for i in range(start, end) if store.type[i] != GAP][2]
+    wall.progress.mark(floating)
+
+    optimiser.replan()
+    assert_valid_order(store, optimiser.get_build_schedule().order)
+
+
+def test_schedule_skips_built_dependents():
+    wall, _ = make()
+    store = wall.store
+    build_partially(wall, 40)
+    start, end = store.row_range(5)
+    wall.progress.mark(start + 3)
+    schedule = schedule_build(store, skip_built=True)
+    assert_valid_order(store, schedule.order)
+
+
+@pytest.mark.parametrize("stride_width", [600, 1000])
+def test_replan_matches_fresh_index(stride_width):
+    wall, optimiser = make("wild", rows=40, width=5000)
+    build_partially(wall, 300)
+    result = optimiser.replan(stride_width=stride_width)
+    fresh = StrideIndex(wall.store)
+    assert optimiser.stride_index.total_strides == fresh.total_strides
+    assert result.dirty_blocks
+    assert_valid_order(wall.store, optimiser.get_build_schedule().order)
+
+
+def test_replan_of_fresh_wall_equals_plan():
+    wall, optimiser = make()
+    before = optimiser.estimate_time_and_energy("stride")
+    result = optimiser.replan()
+    assert (result.time, result.energy) == before and result.bricks_reassigned == 0
@@ -0,0 +1,81 @@
+# test_server.py — Pacing, validation and event streams of the build server
+
+import asyncio
+import time
+
+import pytest
+
+from server import BuildServer, Subscriber, validate_params
+
+
+def observed_rate(speed, window):
+    """
+    Runs one paced simulation and returns the brick events per second seen
+    during `window` seconds after it starts building.
+    """
+    async def run():
+        server = BuildServer(queue_size=100_000)
+        subscriber = Subscriber(queue_size=100_000)
+        server.subscribers.add(subscriber)
+        server.start_simulation({"rows": 60, "wall_width": 6000, "bricks_per_second": speed})
+        while (await subscriber.queue.get())["type"] != "started":
+            pass
+        start = time.monotonic()
+        await asyncio.sleep(window)
+        elapsed = time.monotonic() - start
+        bricks = 0
+        while not subscriber.queue.empty():
+            bricks += subscriber.queue.get_nowait()["type"] == "brick"
+        for task in server._tasks:
+            task.cancel()
+        return bricks / elapsed
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("speed", [5, 50, 300])
+def test_paced_rate_matches_request(speed):
+    window = 2.0 if speed < 20 else 1.0
+    rate = observed_rate(speed, window)
+    # One tick of slack either way: bricks are released in whole-tick steps
+    assert abs(rate - speed) <= max(0.1 * speed, 1.5 / window)
+
+
+@pytest.mark.parametrize("body", [[1, 2], 5, {"rows": -3}, {"rows": True}, {"engine": "fast"},
+                                  {"bond_type": "english"}, {"bricks_per_second": -1}, {"colour": 1}])
+def test_invalid_parameters_rejected(body):
+    with pytest.raises(ValueError):
+        validate_params(body)
+
+
+def test_defaults_fill_missing_parameters():
+    params = validate_params({"rows": 4})
+    assert params["rows"] == 4 and params["bond_type"] == "stretcher"
+
+
+async def request(port, raw):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(raw.encode())
+    await writer.drain()
+    data = await asyncio.wait_for(reader.read(), 10)
+    writer.close()
+    return data.decode()
+
+
+def test_events_for_unknown_and_finished_simulations():
+    async def run():
+        server = BuildServer()
+        listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            assert (await request(port, "GET /events?sim=7 HTTP/1.1\r\n\r\n")).startswith("HTTP/1.1 404")
+            body = '{"rows": 3, "bricks_per_second": 0}'
+            reply = await request(port, f"POST /simulations HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n{body}")
+            assert reply.startswith("HTTP/1.1 201")
+            while server.simulations[1]["state"] != "finished":
+                await asyncio.sleep(0.01)
+            # An ended simulation answers at once with its final event
+            reply = await request(port, "GET /events?sim=1 HTTP/1.1\r\n\r\n")
+            assert reply.rstrip().endswith("}") and '"type": "finished"' in reply
+
+    asyncio.run(run())
@@ -0,0 +1,53 @@
+# test_simulation.py — Discrete-event build simulation
+
+import pytest
+
+from robot_config import DEFAULT_CONFIG
+from simulation import move_time, simulate, summarise
+from stride_optimiser import StrideOptimiser
+from wall import Wall
+from wall_store import stride_key
+
+
+def make(bond_type="wild", rows=12, width=3000):
+    wall = Wall(num_rows=rows, bond_type=bond_type, wall_width=width, seed=4)
+    optimiser = StrideOptimiser(wall.wall_map, wall.wall_width, wall.wall_height)
+    return wall, optimiser
+
+
+def test_stocked_robot_never_idles():
+    wall, optimiser = make()
+    schedule = optimiser.get_build_schedule()
+    events = list(simulate(wall.store, schedule.order))
+    summary = summarise(events)
+    assert summary["idle_time"] == 0
+    assert [e.brick for e in events if e.kind == "place"] == list(schedule.order)
+    assert summary["place_time"] == len(schedule.order) * DEFAULT_CONFIG.brick_placement_time
+    # The first move only positions the robot; the rest follow the schedule's moves
+    assert summary["move_time"] == DEFAULT_CONFIG.horizontal_move_time + schedule.move_time
+    assert summary["time"] == summary["place_time"] + summary["move_time"]
+
+
+def test_slow_supply_makes_the_robot_idle():
+    wall, optimiser = make()
+    order = optimiser.get_build_schedule().order
+    interval = 3 * DEFAULT_CONFIG.brick_placement_time
+    summary = summarise(simulate(wall.store, order, supply_interval=interval, idle_power=0.1))
+    assert summary["idle_time"] > 0
+    assert summary["idle_energy"] == pytest.approx(summary["idle_time"] * 0.1)
+    assert summary["time"] >= len(order) * interval
+
+
+def test_built_bricks_are_skipped():
+    wall, optimiser = make()
+    order = optimiser.get_build_schedule().order
+    for i in order[:10]:
+        wall.progress.mark(i)
+    placed = [e.brick for e in simulate(wall.store, order) if e.kind == "place"]
+    assert placed == list(order[10:])
+
+
+def test_move_time_counts_columns_and_blocks():
+    config = DEFAULT_CONFIG
+    assert move_time(None, stride_key(3, 4)) == config.horizontal_move_time
+    assert move_time(stride_key(1, 1), stride_key(2, 4)) == 3 * config.horizontal_move_time + config.vertical_move_time
@@ -0,0 +1,67 @@
+# test_stride_optimiser.py — Stride assignment engines and their metrics
+
+import pytest
+
+from stride_optimiser import StrideOptimiser, periodic_stride_metrics
+from wall import Wall
+
+
+def make(bond_type, rows=30, width=4000, **kwargs):
+    wall = Wall(num_rows=rows, bond_type=bond_type, wall_width=width, seed=7)
+    return wall, StrideOptimiser(wall.wall_map, wall.wall_width, wall.wall_height, **kwargs)
+
+
+def strides_with(wall, engine, **kwargs):
+    StrideOptimiser(wall.wall_map, wall.wall_width, wall.wall_height, engine=engine, **kwargs)
+    return wall.store.stride.tobytes()
+
+
+def indexed_metrics(optimiser):
+    index = optimiser.stride_index
+    return index.total_bricks, index.total_strides
+
+
+@pytest.mark.parametrize("bond_type", ["stretcher", "flemish", "wild"])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("stride_width, stride_height", [(800, 1300), (430, 62.5), (1000, 250)])
+def test_batched_engine_matches_reference(bond_type, seed, stride_width, stride_height):
+    wall = Wall(num_rows=25, bond_type=bond_type, wall_width=3700, seed=seed)
+    kwargs = dict(stride_width=stride_width, stride_height=stride_height)
+    assert strides_with(wall, "batched", **kwargs) == strides_with(wall, "reference", **kwargs)
+
+
+def test_batched_engine_matches_reference_on_constrained_wild():
+    wall = Wall(num_rows=15, bond_type="wild", wall_width=2300, seed=9, constrained=True)
+    assert strides_with(wall, "batched") == strides_with(wall, "reference")
+
+
+@pytest.mark.parametrize("bond_type", ["stretcher", "flemish"])
+@pytest.mark.parametrize("engine", ["batched", "reference"])
+@pytest.mark.parametrize("rows, stride_width, stride_height", [
+    (1, 800, 1300), (7, 400, 62.5), (20, 1000, 500), (41, 800, 130),
+])
+def test_periodic_metrics_match_the_index(bond_type, engine, rows, stride_width, stride_height):
+    wall, optimiser = make(bond_type, rows, stride_width=stride_width, stride_height=stride_height,
+                           engine=engine)
+    bricks, strides, _ = optimiser.get_stride_metrics()
+    assert (bricks, strides) == indexed_metrics(optimiser)
+    assert optimiser.get_stride_metrics() == periodic_stride_metrics(bond_type, wall.brick_row_length, rows,
+                                                                     stride_width, stride_height)
+
+
+def test_geometry_change_is_counted_without_reassigning():
+    wall, optimiser = make("flemish")
+    version = wall.store.stride_version
+    optimiser.stride_width = 600
+    bricks, strides, _ = optimiser.get_stride_metrics()
+    assert wall.store.stride_version == version          # Counted from the templates alone
+    assert (bricks, strides) == indexed_metrics(optimiser)
+
+
+def test_replanned_wall_is_counted_from_the_index():
+    wall, optimiser = make("stretcher")
+    for i in optimiser.get_build_schedule().order[:40:3]:
+        wall.progress.mark(i)
+    optimiser.replan(stride_width=500)
+    assert optimiser.get_stride_metrics()[:2] == indexed_metrics(optimiser)
+    assert optimiser._template_counts() is None
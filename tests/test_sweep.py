@@ -0,0 +1,51 @@
+# test_sweep.py — Batched estimates over robot configuration grids
+
+import io
+
+import pytest
+
+from robot_config import DEFAULT_CONFIG
+from stride_optimiser import StrideOptimiser
+from sweep import SWEEP_FIELDS, config_grid, sweep, write_table
+from wall import Wall
+
+
+def expected(wall, config, engine="batched"):
+    optimiser = StrideOptimiser(wall.wall_map, wall.wall_width, wall.wall_height, engine=engine, config=config)
+    return (optimiser.estimate_time_and_energy("stride", config)
+            + optimiser.estimate_time_and_energy("sequential", config))
+
+
+def test_config_grid_covers_every_combination():
+    configs = config_grid(brick_placement_time=[1, 2], max_stride_width_mm=[600, 800, 1000])
+    assert len(configs) == 6 and len(set(configs)) == 6
+    assert all(c.vertical_move_time == DEFAULT_CONFIG.vertical_move_time for c in configs)
+
+
+@pytest.mark.parametrize("bond_type", ["stretcher", "flemish", "wild"])
+def test_sweep_matches_the_optimiser_estimates(bond_type):
+    wall = Wall(num_rows=30, bond_type=bond_type, wall_width=3500, seed=5)
+    configs = config_grid(horizontal_move_time=[5, 10], max_stride_width_mm=[600, 800],
+                          max_stride_height_mm=[650, 1300])
+    table = sweep(wall, configs)
+    for k, config in enumerate(configs):
+        row = tuple(table[name][k] for name in ("stride_time", "stride_energy",
+                                                "sequential_time", "sequential_energy"))
+        assert row == pytest.approx(expected(wall, config))
+
+
+def test_sweep_leaves_the_wall_plan_alone():
+    wall = Wall(num_rows=10, bond_type="wild", wall_width=2300, seed=1)
+    StrideOptimiser(wall.wall_map, wall.wall_width, wall.wall_height)
+    before = wall.store.stride.tobytes()
+    sweep(wall, config_grid(max_stride_width_mm=[500, 900]))
+    assert wall.store.stride.tobytes() == before
+
+
+def test_write_table_writes_one_row_per_config():
+    wall = Wall(num_rows=10)
+    table = sweep(wall, config_grid(brick_placement_time=[1, 2, 3]))
+    out = io.StringIO()
+    assert write_table(table, out, "csv") == 3
+    lines = out.getvalue().splitlines()
+    assert lines[0] == ",".join(SWEEP_FIELDS) and len(lines) == 4
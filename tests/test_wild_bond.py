@@ -0,0 +1,38 @@
+# test_wild_bond.py — Seeded wild bond courses and head-joint alignment
+
+from joints import JointIndex, aligned_joints, course_joints
+from wall import Wall
+from wall_store import GAP
+from wild_bond import iter_constrained_courses, wild_block, wild_course
+
+
+def test_courses_are_reproducible_and_random_access():
+    assert wild_course(5, 17, 2300) == wild_course(5, 17, 2300)
+    assert wild_course(5, 17, 2300) != wild_course(6, 17, 2300)
+    assert wild_block(5, 10, 20, 2300) == [wild_course(5, row, 2300) for row in range(10, 20)]
+
+
+def test_courses_fill_the_wall_without_overlap():
+    for row in range(30):
+        types, xs, lengths = wild_course(3, row, 2300)
+        bricks = [(x, ln) for t, x, ln in zip(types, xs, lengths) if t != GAP]
+        assert all(a + la < b for (a, la), (b, _) in zip(bricks, bricks[1:]))
+        assert bricks[-1][0] + bricks[-1][1] <= 2300
+
+
+def test_aligned_joints_uses_the_minimum_lap():
+    assert aligned_joints([100, 500, 900], [130, 480, 700], min_lap=25) == [480]
+    assert course_joints([GAP, 1, 1], [0, 10, 230], [10, 215, 215]) == [225]
+
+
+def test_constrained_walls_align_fewer_joints():
+    seed, rows, width = 8, 40, 4000
+    free = JointIndex.from_courses(wild_course(seed, row, width) for row in range(rows))
+    constrained = JointIndex.from_courses(iter_constrained_courses(seed, rows, width))
+    assert len(constrained.violations) < len(free.violations)
+
+
+def test_constrained_wall_matches_its_courses():
+    wall = Wall(num_rows=12, bond_type="wild", wall_width=3000, seed=2, constrained=True)
+    expected = JointIndex.from_courses(iter_constrained_courses(2, 12, 3000))
+    assert JointIndex.from_store(wall.store).violations == expected.violations
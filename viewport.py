@@ -0,0 +1,272 @@
+# viewport.py — Terminal-sized window onto a wall, with pan, zoom, overview and build following
+
+import math
+import shutil
+from bisect import bisect_right
+from ansi_colors import STRIDE_COLOR_PAIRS, RESET
+from brick import BRICK_LENGTH, HEAD_JOINT
+from instrumentation import count, timed
+from renderer import CLEAR_TO_EOL, move_to, stride_run_parity
+from wall_store import GAP
+
+# Millimetres per terminal column at zoom 1: a full brick and its joint span
+# four columns, as in the full-wall renderer
+COLUMN_MM = (BRICK_LENGTH + HEAD_JOINT) / 4
+
+# Cell characters for unbuilt / built bricks
+UNBUILT_CELL = "░"
+BUILT_CELL = "▓"
+
+# Terminal lines kept free below the view for status and prompts
+RESERVED_LINES = 8
+
+# Single-key view commands accepted between manual build steps
+VIEW_COMMANDS = {
+    "a": "pan left", "d": "pan right", "w": "pan up", "s": "pan down",
+    "+": "zoom in", "-": "zoom out", "o": "overview", "f": "follow build",
+}
+
+
+def fits_terminal(wall, reserved=RESERVED_LINES):
+    """
+    True if the whole wall can be drawn by the full-wall renderer without wrapping.
+    """
+    size = shutil.get_terminal_size()
+    columns = math.ceil(wall.wall_width / COLUMN_MM) + 3      # Widest wild start gap is 3 columns
+    return columns <= size.columns and wall.rows <= size.lines - reserved
+
+
+class Viewport:
+    """
+    Renders only the part of a wall that fits the terminal. Each cell is
+    looked up by bisecting the brick x-extents of its course, so a frame
+    costs O(width * height * log n) regardless of wall size. When zoomed out
+    several bricks share a cell and several courses share a line; the brick
+    under the centre of the cell and the top course of the band are shown.
+
+    By default the view follows the build: whenever the latest brick leaves
+    the view, it is re-centred on that brick (and so on the active stride).
+    Panning or zooming stops following until follow_build() is called.
+    """
+
+    def __init__(self, wall, width=None, height=None, colour_by_stride=True, origin_line=1):
+        size = shutil.get_terminal_size()
+        self.wall = wall
+        self.store = wall.store
+        self.width = width or size.columns                                  # Columns
+        self.height = height or max(1, size.lines - RESERVED_LINES)         # Lines
+        self.colour_by_stride = colour_by_stride
+        self.origin_line = origin_line       # Terminal line of the top of the view
+        self.mm_per_column = COLUMN_MM
+        self.rows_per_line = 1
+        self.left = 0.0                      # Wall x (mm) at the left edge of the view
+        self.top_row = self.store.num_rows - 1
+        self.following = True
+        self.stride_color_map = {}           # Stride key -> colour pair, stable across frames
+        self._parity = {}                    # Course -> colour parity per brick, for courses drawn
+        self._parity_version = None          # stride_version the parity cache was built for
+        self.frames = 0
+        self._lines = None                   # Lines shown by the previous frame
+
+    # === View geometry ===
+
+    def visible_lines(self):
+        return min(self.height, self.top_row // self.rows_per_line + 1)
+
+    def bottom_row(self):
+        return max(0, self.top_row - (self.visible_lines() - 1) * self.rows_per_line)
+
+    def right(self):
+        return self.left + self.width * self.mm_per_column
+
+    def _clamp(self):
+        span = self.width * self.mm_per_column
+        self.left = max(0.0, min(self.left, self.wall.wall_width + 3 * COLUMN_MM - span))
+        lowest_top = min(self.store.num_rows, self.height * self.rows_per_line) - 1
+        self.top_row = max(lowest_top, min(self.top_row, self.store.num_rows - 1))
+
+    def centre_on(self, x, row_index):
+        """
+        Moves the view so wall position x (mm) on the given course is in the middle.
+        """
+        self.left = x - self.width * self.mm_per_column / 2
+        self.top_row = row_index + (self.height // 2) * self.rows_per_line
+        self._clamp()
+
+    def is_visible(self, index):
+        store = self.store
+        x = store.x[index]
+        return (self.left <= x and x + store.length[index] <= self.right()
+                and self.bottom_row() <= store.row[index] <= self.top_row)
+
+    # === Navigation ===
+
+    def pan(self, columns=0, lines=0):
+        """
+        Scrolls by whole columns (positive = right) and lines (positive = down).
+        """
+        self.left += columns * self.mm_per_column
+        self.top_row -= lines * self.rows_per_line
+        self.following = False
+        self._clamp()
+
+    def zoom(self, factor):
+        """
+        Scales the view about its centre: factor > 1 zooms out, < 1 zooms in.
+        Zooming in never goes beyond one course per line and zoom 1 columns.
+        """
+        centre_x = self.left + self.width * self.mm_per_column / 2
+        centre_row = self.top_row - (self.height // 2) * self.rows_per_line
+        self.mm_per_column = max(COLUMN_MM, self.mm_per_column * factor)
+        self.rows_per_line = max(1, round(self.rows_per_line * factor))
+        self.following = False
+        self.centre_on(centre_x, max(0, centre_row))
+
+    def overview(self):
+        """
+        Downsamples the whole wall into the view.
+        """
+        self.mm_per_column = max(COLUMN_MM, (self.wall.wall_width + 3 * COLUMN_MM) / self.width)
+        self.rows_per_line = max(1, math.ceil(self.store.num_rows / self.height))
+        self.left = 0.0
+        self.top_row = self.store.num_rows - 1
+        self.following = False
+        self._clamp()
+
+    def follow_build(self):
+        """
+        Returns to zoom 1 and follows the most recently built brick again.
+        """
+        self.mm_per_column = COLUMN_MM
+        self.rows_per_line = 1
+        self.following = True
+        self._track()
+
+    def apply_command(self, text):
+        """
+        Applies a VIEW_COMMANDS key. Returns False if text is not a view command.
+        """
+        key = text.strip().lower()
+        if key not in VIEW_COMMANDS:
+            return False
+        step_columns, step_lines = max(1, self.width // 4), max(1, self.height // 4)
+        if key == "a":
+            self.pan(columns=-step_columns)
+        elif key == "d":
+            self.pan(columns=step_columns)
+        elif key == "w":
+            self.pan(lines=-step_lines)
+        elif key == "s":
+            self.pan(lines=step_lines)
+        elif key == "+":
+            self.zoom(0.5)
+        elif key == "-":
+            self.zoom(2)
+        elif key == "o":
+            self.overview()
+        else:
+            self.follow_build()
+        return True
+
+    def _track(self):
+        history = self.wall.progress.history
+        if self.following and history and not self.is_visible(history[-1]):
+            index = history[-1]
+            self.centre_on(self.store.x[index] + self.store.length[index] / 2, self.store.row[index])
+
+    # === Rendering ===
+
+    def _row_parity(self, row_index):
+        """
+        Returns a course's colour parity (same rule as the full-wall renderer),
+        cached for the courses in view until strides are reassigned.
+        """
+        if self._parity_version != self.store.stride_version or len(self._parity) > 4 * self.height:
+            self._parity, self._parity_version = {}, self.store.stride_version
+        parity = self._parity.get(row_index)
+        if parity is None:
+            parity = self._parity[row_index] = stride_run_parity(self.store, row_index)
+        return parity
+
+    def _colour(self, i, parity):
+        sid = self.store.stride[i]
+        pair = self.stride_color_map.get(sid)
+        if pair is None:
+            pair = STRIDE_COLOR_PAIRS[len(self.stride_color_map) % len(STRIDE_COLOR_PAIRS)]
+            self.stride_color_map[sid] = pair
+        return pair[parity]
+
+    def _line(self, row_index):
+        """
+        Renders the visible columns of one course.
+        """
+        store = self.store
+        types, xs, lengths, built = store.type, store.x, store.length, store.built
+        start, end = store.row_range(row_index)
+        first, shift = start, 0.0
+        if start < end and types[start] == GAP:
+            first, shift = start + 1, lengths[start] * COLUMN_MM     # Start gap is measured in columns
+        parity = self._row_parity(row_index) if self.colour_by_stride else None
+
+        parts, run, run_colour = [], [], None
+        for column in range(self.width):
+            x = self.left + (column + 0.5) * self.mm_per_column - shift
+            i = bisect_right(xs, x, first, end) - 1
+            char, colour = " ", None
+            if i >= first and x < xs[i] + lengths[i]:
+                if built[i]:
+                    char = BUILT_CELL
+                    colour = self._colour(i, parity[i - start]) if self.colour_by_stride else None
+                else:
+                    char = UNBUILT_CELL
+            if colour != run_colour and run:
+                parts.append(f"{run_colour}{''.join(run)}{RESET}" if run_colour else "".join(run))
+                run = []
+            run_colour = colour
+            run.append(char)
+        if run:
+            parts.append(f"{run_colour}{''.join(run)}{RESET}" if run_colour else "".join(run))
+        return "".join(parts).rstrip()
+
+    @timed("render")
+    def render_rows(self):
+        """
+        Renders the lines in view, top to bottom.
+        """
+        self._clamp()
+        return [self._line(self.top_row - n * self.rows_per_line) for n in range(self.visible_lines())]
+
+    def line_of(self, row_index):
+        """
+        Returns the terminal line a course is drawn on, clamped to just above or
+        below the view; line_of(-1) is the first line under the view.
+        """
+        offset = (self.top_row - row_index) // self.rows_per_line
+        return self.origin_line + max(-1, min(offset, self.visible_lines()))
+
+    @timed("render_frame")
+    def render_frame(self):
+        """
+        Returns the escape sequence that brings the terminal up to date,
+        rewriting only the lines that changed since the previous frame.
+        """
+        self._track()
+        lines = self.render_rows()
+        previous = self._lines if self.frames else None
+        self.frames += 1
+        count("frames_rendered")
+
+        out = []
+        for n, line in enumerate(lines):
+            if previous is None or n >= len(previous) or previous[n] != line:
+                out.append(f"{move_to(self.origin_line + n, 1)}{line}{CLEAR_TO_EOL}")
+        for n in range(len(lines), len(previous or ())):
+            out.append(f"{move_to(self.origin_line + n, 1)}{CLEAR_TO_EOL}")      # View got shorter
+        self._lines = lines
+        return "".join(out)
+
+    def invalidate(self):
+        """
+        Forces the next frame to rewrite every line, e.g. after the screen was cleared.
+        """
+        self.frames = 0
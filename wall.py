@@ -1,197 +1,163 @@
 # wall.py — Wall generation and visualisation with different bond types
 
-from ansi_colors import STRIDE_COLOR_PAIRS, RESET
-from brick import (
-    BRICK_LENGTH, HALF_BRICK_LENGTH, HEAD_JOINT,
-    FULL_BRICK_CHAR, HALF_BRICK_CHAR,
-    BUILT_FULL_CHAR, BUILT_HALF_CHAR,
-    BUILT_FRONT_CHAR, FRONT_BRICK_CHAR,
-)
+from bond_patterns import PERIODIC_BONDS, course_templates
+from brick import BRICK_LENGTH, HEAD_JOINT
+from build_progress import BuildProgress
+from instrumentation import count, timed
+from renderer import WallRenderer
+from wall_store import WallStore, WallMap
+from wild_bond import wild_course, iter_constrained_courses, iter_wild_blocks_parallel
 import random
 
 class Wall:
-    def __init__(self, num_rows=None, bond_type="stretcher"):
+    def __init__(self, num_rows=None, bond_type="stretcher", wall_width=2300,
+                 wall_height=2000, lazy=False, seed=None, constrained=False):
         # Basic geometry definitions
         self.brick_length = BRICK_LENGTH
         self.head_joint = HEAD_JOINT
         self.course_height = 62.5
-        self.wall_width = 2300  # total wall width in mm
+        self.wall_width = wall_width  # total wall width in mm
 
-        # Determine number of rows by height if not specified
-        self.rows = num_rows if num_rows is not None else int(2000 // self.course_height)
+        # Determine number of rows by height (mm) if not specified
+        self.rows = num_rows if num_rows is not None else int(wall_height // self.course_height)
         self.wall_height = self.rows * self.course_height
         self.brick_row_length = self.wall_width
         self.bond_type = bond_type
-
-        # Generate wall map based on bond type
-        if bond_type == "flemish":
-            self.wall_map = self._generate_flemish_bond()
-        elif bond_type == "wild":
-            self.wall_map = self._generate_wild_bond()
+        # Wild bond randomness is fully determined by the seed; record one if not given
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        # Constrained wild walls lay each course against the joints of the one
+        # below, so courses can only be generated in order (no parallel or random access)
+        self.constrained = constrained and bond_type == "wild"
+
+        # Brick store, its dict-like wall_map view and helpers; a lazy wall
+        # only streams courses via iter_courses() until materialise() is called
+        self.store = None
+        self.wall_map = None
+        self.progress = None
+        self.renderer = None
+        if not lazy:
+            self.materialise()
+
+    @timed("generate")
+    def materialise(self, workers=None, block_rows=64):
+        """
+        Generates every course into a WallStore and attaches the views and helpers.
+        With workers > 1, wild bond blocks of block_rows courses are generated in parallel
+        (except for constrained walls, which are generated in order).
+        """
+        store = WallStore()
+        if self.bond_type in PERIODIC_BONDS:
+            even, odd = course_templates(self.bond_type, self.brick_row_length)
+            store.extend_periodic(even, odd, self.rows)
+        elif self.bond_type == "wild" and workers and workers > 1 and not self.constrained:
+            for block in iter_wild_blocks_parallel(self.seed, self.rows, self.brick_row_length,
+                                                   block_rows, workers):
+                for types, xs, lengths in block:
+                    store.append_row(types, xs, lengths)
         else:
-            self.wall_map = self._generate_stretcher_bond()
+            for types, xs, lengths in self.iter_courses():
+                store.append_row(types, xs, lengths)
+        count("bricks_generated", len(store))
+        self.attach_store(store)
 
-    def _generate_stretcher_bond(self):
+    def attach_store(self, store, history=()):
         """
-        Standard brick pattern with alternating half-brick offsets per row.
+        Binds an already populated WallStore (e.g. a loaded plan) to this wall
+        and creates its views and helpers. history lists brick indices in the
+        order they were built, so undo and incremental rendering keep working.
         """
-        wall_map = []
-        for row in range(self.rows):
-            course = []
-            offset = HALF_BRICK_LENGTH + HEAD_JOINT if row % 2 == 1 else 0
-            remaining = self.brick_row_length - offset
-
-            if offset > 0:
-                course.append({"type": "half", "built": False})
+        self.store = store
+        self.wall_map = WallMap(store)
+        self.progress = BuildProgress(store)
+        self.progress.history.extend(history)
+        self.renderer = WallRenderer(self)
 
-            while remaining >= BRICK_LENGTH + HEAD_JOINT:
-                course.append({"type": "full", "built": False})
-                remaining -= (BRICK_LENGTH + HEAD_JOINT)
+    def iter_courses(self):
+        """
+        Yields courses bottom to top as (types, xs, lengths) lists, one course at
+        a time, so arbitrarily long or tall walls can be planned in constant memory.
+        """
+        if self.bond_type == "flemish":
+            return self._generate_flemish_bond()
+        if self.bond_type == "wild":
+            return self._generate_wild_bond()
+        return self._generate_stretcher_bond()
 
-            # Optionally add trailing half-brick if it fits
-            if row % 2 == 1 and remaining >= HALF_BRICK_LENGTH:
-                course.append({"type": "half", "built": False})
+    def iter_blocks(self, courses_per_block):
+        """
+        Yields lists of consecutive courses, one list per vertical stride block.
+        """
+        block = []
+        for course in self.iter_courses():
+            block.append(course)
+            if len(block) == courses_per_block:
+                yield block
+                block = []
+        if block:
+            yield block
 
-            wall_map.append(course)
-        return wall_map
+    def _generate_stretcher_bond(self):
+        """
+        Standard brick pattern with alternating half-brick offsets per row.
+        Yields one course at a time, reusing the cached even/odd templates.
+        """
+        even, odd = course_templates("stretcher", self.brick_row_length)
+        for row in range(self.rows):
+            yield odd if row % 2 == 1 else even
 
     def _generate_flemish_bond(self):
         """
         Alternates between full bricks and headers ("front" bricks),
-        staggered every row like Flemish bond.
+        staggered every row like Flemish bond. Yields one course at a time,
+        reusing the cached even/odd templates.
         """
-        wall_map = []
+        even, odd = course_templates("flemish", self.brick_row_length)
         for row_index in range(self.rows):
-            course = []
-            current_pos = 0
-
-            # Alternate offset for even/odd rows
-            offset = HALF_BRICK_LENGTH + HEAD_JOINT if row_index % 2 == 1 else 0
-            if offset > 0:
-                course.append({"type": "half", "built": False})
-                current_pos += offset
-
-            # Alternate between stretcher and header
-            while current_pos + BRICK_LENGTH + HEAD_JOINT <= self.brick_row_length:
-                if (len(course) + row_index) % 2 == 0:
-                    course.append({"type": "full", "built": False})
-                    current_pos += BRICK_LENGTH + HEAD_JOINT
-                else:
-                    course.append({"type": "front", "built": False})
-                    current_pos += HALF_BRICK_LENGTH + HEAD_JOINT
-
-            # Add any trailing brick if fits
-            remaining = self.brick_row_length - current_pos
-            if remaining >= BRICK_LENGTH:
-                course.append({"type": "full", "built": False})
-            elif remaining >= HALF_BRICK_LENGTH:
-                course.append({"type": "half", "built": False})
-
-            wall_map.append(course)
-        return wall_map
+            yield odd if row_index % 2 == 1 else even
 
     def _generate_wild_bond(self):
         """
         Randomised pattern per row with varying start gaps, offsets, and brick combinations.
+        Yields one course at a time; each course comes from its own seeded RNG stream.
+        A constrained wall also keeps head joints clear of the course below.
         """
-        wall_map = []
-        previous_offset = -1
-
+        if self.constrained:
+            yield from iter_constrained_courses(self.seed, self.rows, self.brick_row_length)
+            return
         for row in range(self.rows):
-            course = []
-
-            # Select a gap offset different from the last one
-            allowed_offsets = [i for i in [0, 1, 3] if i != previous_offset]
-            offset = random.choice(allowed_offsets)
-            previous_offset = offset
-
-            # Add initial gap to simulate physical offset (rendered as whitespace)
-            course.append({"type": "gap", "length": offset, "built": True})
-
-            # Optional brick offset (half brick on odd rows, 50/50 chance)
-            use_offset = row % 2 == 1 and random.choice([True, False])
-            offset = HALF_BRICK_LENGTH + HEAD_JOINT if use_offset else 0
-            current_pos = offset
-            last_type = "half" if use_offset else None
-
-            if use_offset:
-                course.append({"type": "half", "built": False})
-                current_pos += HALF_BRICK_LENGTH + HEAD_JOINT
+            yield wild_course(self.seed, row, self.brick_row_length)
 
-            # Fill the rest of the row randomly with full or half bricks
-            while current_pos + HALF_BRICK_LENGTH <= self.brick_row_length:
-                options = []
-                if current_pos + BRICK_LENGTH <= self.brick_row_length:
-                    options.append(("full", BRICK_LENGTH))
-                if current_pos + HALF_BRICK_LENGTH <= self.brick_row_length and last_type != "half":
-                    options.append(("half", HALF_BRICK_LENGTH))
-
-                if not options:
-                    break
-
-                typ, ln = random.choice(options)
-                course.append({"type": typ, "built": False})
-                current_pos += ln + HEAD_JOINT
-                last_type = typ
-
-            wall_map.append(course)
-        return wall_map
+    def course(self, row_index):
+        """
+        Regenerates a single course on its own, without generating the rows below it.
+        Returns (types, xs, lengths). A constrained wild course depends on every
+        course below it, so those are regenerated first.
+        """
+        if self.constrained:
+            for row, course in enumerate(iter_constrained_courses(self.seed, row_index + 1, self.brick_row_length)):
+                if row == row_index:
+                    return course
+        if self.bond_type == "wild":
+            return wild_course(self.seed, row_index, self.brick_row_length)
+        bond_type = self.bond_type if self.bond_type in PERIODIC_BONDS else "stretcher"
+        even, odd = course_templates(bond_type, self.brick_row_length)
+        return odd if row_index % 2 == 1 else even
 
     def mark_next_brick_built(self):
         """
         Marks the next unbuilt brick as 'built'. Used in simulation mode.
         """
-        for row in self.wall_map:
-            for brick in row:
-                if not brick["built"]:
-                    brick["built"] = True
-                    return True
-        return False
+        return self.progress.mark_next() is not None
 
-    def display(self, colour_by_stride=False):
+    def display(self, colour_by_stride=False, viewport=None):
         """
         Displays the current wall state in terminal.
         If colour_by_stride is enabled, assigns alternating colours to built bricks by stride.
+        With a viewport (see viewport.py), only the part of the wall in view is shown,
+        coloured as that viewport is configured.
         """
-        output = ""
-        stride_color_map = {}
-
-        # Print wall from top to bottom
-        for row in reversed(self.wall_map):
-            line = ""
-            stride_counters = {}
-
-            for brick in row:
-                # Get character for brick based on type and built state
-                if brick["type"] == "full":
-                    char = BUILT_FULL_CHAR if brick.get("built", False) else FULL_BRICK_CHAR
-                elif brick["type"] == "half":
-                    char = BUILT_HALF_CHAR if brick.get("built", False) else HALF_BRICK_CHAR
-                elif brick["type"] == "front":
-                    char = BUILT_FRONT_CHAR if brick.get("built", False) else FRONT_BRICK_CHAR
-                elif brick["type"] == "gap":
-                    gap_len = brick.get("length", 1)
-                    char = " " * gap_len
-                else:
-                    char = "????"
-
-                # Apply stride-based ANSI colour if enabled and brick is built
-                if colour_by_stride and brick.get("built", False) and brick["type"] != "gap":
-                    stride = brick.get("stride", "S0_0")
-                    stride_id = brick.get("stride_id", hash(stride))
-
-                    if stride_id not in stride_color_map:
-                        pair_index = len(stride_color_map) % len(STRIDE_COLOR_PAIRS)
-                        stride_color_map[stride_id] = STRIDE_COLOR_PAIRS[pair_index]
-
-                    color1, color2 = stride_color_map[stride_id]
-                    count = stride_counters.get(stride_id, 0)
-                    color = color1 if count % 2 == 0 else color2
-                    stride_counters[stride_id] = count + 1
-
-                    char = f"{color}{char}{RESET}"
-
-                line += char + ""
-            output += line.rstrip("") + "\n"
-
-        print(output)
+        if viewport is not None:
+            renderer = viewport
+        else:
+            renderer = self.renderer if colour_by_stride else WallRenderer(self, colour_by_stride=False)
+        print("\n".join(renderer.render_rows()) + "\n")
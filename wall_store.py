@@ -0,0 +1,273 @@
+# wall_store.py — Compact struct-of-arrays storage for wall bricks
+
+from array import array
+from itertools import accumulate, islice
+
+# === Brick Type Codes ===
+
+GAP = 0                    # Visual offset at the start of a wild bond row
+FULL = 1                   # Standard full brick
+HALF = 2                   # Half brick
+FRONT = 3                  # Flemish bond 'front' brick
+
+TYPE_NAMES = ("gap", "full", "half", "front")
+TYPE_CODES = {name: code for code, name in enumerate(TYPE_NAMES)}
+
+# === Stride Keys ===
+# Strides are stored as a single integer: the vertical block in the high bits
+# and the horizontal stride in the low bits. Sorting keys numerically gives
+# the correct (block, stride) order, so "S10_1" follows "S2_1".
+
+UNASSIGNED_STRIDE = 0      # Brick has not been given a stride yet
+GAP_STRIDE = -1            # Dummy stride used by 'gap' entries
+STRIDE_COL_BITS = 16
+STRIDE_COL_MASK = (1 << STRIDE_COL_BITS) - 1
+
+
+def stride_key(block, col):
+    """
+    Packs a (vertical block, horizontal stride) pair into one integer key.
+    """
+    return (block << STRIDE_COL_BITS) | col
+
+
+def stride_parts(key):
+    """
+    Splits a stride key back into its (vertical block, horizontal stride) pair.
+    """
+    return key >> STRIDE_COL_BITS, key & STRIDE_COL_MASK
+
+
+def stride_label(key):
+    """
+    Returns the human-readable label for a stride key, e.g. 'S1_2' or 'GAP'.
+    """
+    if key == GAP_STRIDE:
+        return "GAP"
+    block, col = stride_parts(key)
+    return f"S{block}_{col}"
+
+
+def parse_stride_label(label):
+    """
+    Converts a label such as 'S1_2' or 'GAP' back into a stride key.
+    """
+    if label == "GAP":
+        return GAP_STRIDE
+    block, col = label[1:].split("_")
+    return stride_key(int(block), int(col))
+
+
+def column_typecode(column):
+    """
+    Returns the array typecode of a store column. Columns are arrays, or
+    memoryviews of the same layout in a plan loaded with plan_format.load_plan.
+    """
+    return column.typecode if isinstance(column, array) else column.format
+
+
+class WallStore:
+    """
+    Holds every brick of a wall in parallel typed arrays, one entry per brick.
+    Bricks are stored row by row; row_start[r] is the index of the first brick
+    of row r and row_start[r + 1] is one past its last brick.
+    """
+
+    def __init__(self):
+        self.type = array("b")        # Brick type code (GAP, FULL, HALF, FRONT)
+        self.x = array("l")           # Start position along the row (mm)
+        self.length = array("H")      # Occupied length along the row (mm)
+        self.row = array("I")         # Course index, 0 = bottom
+        self.stride = array("l")      # Packed stride key
+        self.built = array("B")       # 1 once the brick has been placed
+        self.row_start = array("L", [0])
+        self.stride_version = 0       # Bumped whenever stride keys are reassigned
+        self.templates = None         # (even, odd) templates if every course came from extend_periodic
+
+    def __len__(self):
+        return len(self.type)
+
+    @property
+    def num_rows(self):
+        return len(self.row_start) - 1
+
+    def append_row(self, types, xs, lengths):
+        """
+        Appends one course given parallel sequences of type codes, x-offsets and lengths.
+        Gap entries are marked as built, matching their role as pure whitespace.
+        """
+        count = len(types)
+        row_index = self.num_rows
+        self.templates = None
+        self.type.extend(types)
+        self.x.extend(xs)
+        self.length.extend(lengths)
+        self.row.extend([row_index] * count)
+        self.stride.extend([UNASSIGNED_STRIDE] * count)
+        self.built.extend(1 if t == GAP else 0 for t in types)
+        self.row_start.append(len(self.type))
+
+    def extend_periodic(self, even, odd, rows):
+        """
+        Appends `rows` courses alternating between two gap-free course templates
+        (each with types, xs and lengths arrays), starting with `even`.
+        Columns are built by array repetition rather than brick by brick, so the
+        cost is a few bulk copies instead of per-brick generation. Every column
+        (type, x, length, row, stride and built) is still copied into this
+        store, about 15 bytes per brick; the templates themselves are shared
+        and never modified. A store filled by a single call keeps them in
+        `templates`, so its stride counts can be derived in closed form.
+        """
+        pairs, extra = divmod(rows, 2)
+        first_row = self.num_rows
+        self.templates = (even, odd) if first_row == 0 else None
+        for target, even_col, odd_col in (
+            (self.type, even.types, odd.types),
+            (self.x, even.xs, odd.xs),
+            (self.length, even.lengths, odd.lengths),
+        ):
+            target.extend((even_col + odd_col) * pairs)
+            if extra:
+                target.extend(even_col)
+
+        sizes = [len(even.types), len(odd.types)] * pairs + [len(even.types)] * extra
+        added = sum(sizes)
+        for row_index, size in enumerate(sizes, start=first_row):
+            self.row.extend(array("I", [row_index]) * size)
+        self.stride.extend(array("l", [UNASSIGNED_STRIDE]) * added)
+        self.built.frombytes(bytes(added))
+        self.row_start.extend(islice(accumulate(sizes, initial=self.row_start[-1]), 1, None))
+
+    def copy_column(self, name):
+        """
+        Returns a standalone array copy of a column, whether it is an array or a mapped memoryview.
+        """
+        column = getattr(self, name)
+        return array(column_typecode(column), column.tobytes())
+
+    def row_range(self, row_index):
+        """
+        Returns the (start, end) brick index range of a row.
+        """
+        return self.row_start[row_index], self.row_start[row_index + 1]
+
+
+class BrickView:
+    """
+    Dict-like view onto a single brick in a WallStore.
+    Supports the keys 'type', 'built', 'stride', 'length', 'x' and 'row'.
+    Only 'stride' can be assigned; 'built' is read-only because placing or
+    removing a brick must go through the wall's BuildProgress, which keeps
+    the counters, history and renderers in step.
+    """
+
+    __slots__ = ("store", "index")
+
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+
+    def __getitem__(self, key):
+        store, i = self.store, self.index
+        if key == "type":
+            return TYPE_NAMES[store.type[i]]
+        if key == "built":
+            return bool(store.built[i])
+        if key == "stride":
+            sid = store.stride[i]
+            if sid == UNASSIGNED_STRIDE:
+                raise KeyError(key)
+            return stride_label(sid)
+        if key == "length":
+            return store.length[i]
+        if key == "x":
+            return store.x[i]
+        if key == "row":
+            return store.row[i]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        store, i = self.store, self.index
+        if key == "stride":
+            store.stride[i] = parse_stride_label(value)
+            store.stride_version += 1
+        elif key == "built":
+            raise TypeError("'built' is read-only; use the wall's BuildProgress (mark / undo)")
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __repr__(self):
+        return f"BrickView({self.index}, type={self['type']!r}, built={self['built']})"
+
+
+class RowView:
+    """
+    Sequence view onto the bricks of one course.
+    """
+
+    __slots__ = ("store", "start", "end")
+
+    def __init__(self, store, row_index):
+        self.store = store
+        self.start, self.end = store.row_range(row_index)
+
+    def __len__(self):
+        return self.end - self.start
+
+    def __getitem__(self, pos):
+        if isinstance(pos, slice):
+            return [BrickView(self.store, self.start + p) for p in range(len(self))[pos]]
+        if pos < 0:
+            pos += len(self)
+        if not 0 <= pos < len(self):
+            raise IndexError("brick index out of range")
+        return BrickView(self.store, self.start + pos)
+
+    def __iter__(self):
+        store = self.store
+        for i in range(self.start, self.end):
+            yield BrickView(store, i)
+
+
+class WallMap:
+    """
+    Sequence of RowView objects, standing in for the old list-of-dicts wall map.
+    """
+
+    __slots__ = ("store",)
+
+    def __init__(self, store):
+        self.store = store
+
+    def __len__(self):
+        return self.store.num_rows
+
+    def __getitem__(self, row_index):
+        if isinstance(row_index, slice):
+            return [RowView(self.store, r) for r in range(len(self))[row_index]]
+        if row_index < 0:
+            row_index += len(self)
+        if not 0 <= row_index < len(self):
+            raise IndexError("row index out of range")
+        return RowView(self.store, row_index)
+
+    def __iter__(self):
+        for r in range(len(self)):
+            yield RowView(self.store, r)
+
+    def __reversed__(self):
+        for r in range(len(self) - 1, -1, -1):
+            yield RowView(self.store, r)
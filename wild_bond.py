@@ -0,0 +1,185 @@
+# wild_bond.py — Seeded, random-access wild bond course generation
+
+import random
+from concurrent.futures import ProcessPoolExecutor
+from brick import BRICK_LENGTH, HALF_BRICK_LENGTH, HEAD_JOINT
+from joints import MIN_LAP, course_joints, is_aligned
+from wall_store import GAP, FULL, HALF
+
+# Start gaps (rendered as whitespace) a wild bond course may begin with
+GAP_OFFSETS = (0, 1, 3)
+
+
+def course_rng(seed, row_index, stream):
+    """
+    Returns an independent RNG for one course and purpose ('offset' or 'bricks').
+    String seeds are hashed with SHA-512, so streams are stable across processes.
+    """
+    return random.Random(f"{seed}:{row_index}:{stream}")
+
+
+def course_offset(seed, row_index):
+    """
+    Returns the start gap of a course without generating any other course.
+    Even courses draw freely; odd courses avoid the gaps of both even
+    neighbours, so adjacent courses never share an offset.
+    """
+    if row_index % 2 == 0:
+        return course_rng(seed, row_index, "offset").choice(GAP_OFFSETS)
+    neighbours = {course_offset(seed, row_index - 1), course_offset(seed, row_index + 1)}
+    allowed = [offset for offset in GAP_OFFSETS if offset not in neighbours]
+    return course_rng(seed, row_index, "offset").choice(allowed)
+
+
+def _brick_options(current_pos, last_type, width):
+    """
+    Bricks that may be laid at current_pos: a full brick if it fits, and a
+    half brick if it fits and the previous brick was not a half.
+    """
+    options = []
+    if current_pos + BRICK_LENGTH <= width:
+        options.append(("full", BRICK_LENGTH))
+    if current_pos + HALF_BRICK_LENGTH <= width and last_type != "half":
+        options.append(("half", HALF_BRICK_LENGTH))
+    return options
+
+
+def _can_continue(current_pos, last_type, width):
+    """
+    True if _brick_options would offer at least one brick (without building the list).
+    """
+    return current_pos + BRICK_LENGTH <= width or (current_pos + HALF_BRICK_LENGTH <= width and last_type != "half")
+
+
+def _min_costs(width, below, min_lap, starts):
+    """
+    For every (position, last brick type) state reachable from the start
+    states, works out the fewest head joints the rest of the course must
+    align with `below`. States are solved right to left.
+
+    Returns:
+        dict {(position, last type): aligned joint count}
+    """
+    states, frontier = set(starts), list(starts)
+    while frontier:
+        pos, last = frontier.pop()
+        for typ, ln in _brick_options(pos, last, width):
+            state = (pos + ln + HEAD_JOINT, typ)
+            if state not in states:
+                states.add(state)
+                frontier.append(state)
+
+    cost = {}
+    for pos, last in sorted(states, reverse=True):
+        options = _brick_options(pos, last, width)
+        cost[pos, last] = min(
+            (_step_cost(pos + ln, typ, last is None, width, below, min_lap) + cost[pos + ln + HEAD_JOINT, typ]
+             for typ, ln in options),
+            default=0,
+        )
+    return cost
+
+
+def _step_cost(end, typ, first, width, below, min_lap):
+    """
+    Cost of a brick ending at `end`: 1 if it leaves a head joint aligned with
+    `below`, plus 1 for a half brick with joints on both sides, since those
+    two joints are only 110 mm apart and the course above cannot lap both.
+    The last brick of a course leaves no joint.
+    """
+    if not _can_continue(end + HEAD_JOINT, typ, width):
+        return 0
+    return int(is_aligned(below, end, min_lap)) + int(typ == "half" and not first)
+
+
+def wild_course(seed, row_index, width, below=None, min_lap=MIN_LAP):
+    """
+    Generates one wild bond course from its own RNG stream.
+    Returns (types, xs, lengths) lists, identical every time for the same arguments.
+
+    With below (the sorted head joints of the course underneath), each random
+    choice is restricted to bricks that keep the course at its lowest cost:
+    fewest head joints within min_lap of a joint below, counting each inner
+    half brick as one more because it forces an aligned joint in the course
+    above. Full and half bricks sit on a 110 mm grid, so some alignment is
+    unavoidable; the result is the minimum rather than always zero.
+    """
+    rng = course_rng(seed, row_index, "bricks")
+    types, xs, lengths = [], [], []
+    offset_end = 2 * HALF_BRICK_LENGTH + HEAD_JOINT      # End of the optional offset half brick
+    if below is not None:
+        cost = _min_costs(width, below, min_lap, [(0, None), (offset_end + HEAD_JOINT, "half")])
+
+    def extra(end, typ, first, state_cost):
+        # Cost a brick adds beyond the best achievable from the current state
+        return _step_cost(end, typ, first, width, below, min_lap) + cost[end + HEAD_JOINT, typ] - state_cost
+
+    # Add initial gap to simulate physical offset (rendered as whitespace)
+    types.append(GAP); xs.append(0); lengths.append(course_offset(seed, row_index))
+
+    # Optional brick offset (half brick on odd rows, 50/50 chance)
+    use_offset = row_index % 2 == 1 and rng.choice([True, False])
+    if below is not None and row_index % 2 == 1:
+        offset_cost = extra(offset_end, "half", True, cost[0, None])
+        if offset_cost:
+            use_offset = offset_cost < 0          # Take the offset only when it is cheaper
+    offset = HALF_BRICK_LENGTH + HEAD_JOINT if use_offset else 0
+    current_pos = offset
+    last_type = "half" if use_offset else None
+
+    if use_offset:
+        types.append(HALF); xs.append(current_pos); lengths.append(HALF_BRICK_LENGTH)
+        current_pos += HALF_BRICK_LENGTH + HEAD_JOINT
+
+    # Fill the rest of the row randomly with full or half bricks
+    while current_pos + HALF_BRICK_LENGTH <= width:
+        options = _brick_options(current_pos, last_type, width)
+        if not options:
+            break
+        if below is not None:
+            state_cost = cost[current_pos, last_type]
+            options = [(typ, ln) for typ, ln in options if not extra(current_pos + ln, typ, last_type is None, state_cost)]
+
+        typ, ln = rng.choice(options)
+        types.append(FULL if typ == "full" else HALF)
+        xs.append(current_pos); lengths.append(ln)
+        current_pos += ln + HEAD_JOINT
+        last_type = typ
+
+    return types, xs, lengths
+
+
+def iter_constrained_courses(seed, rows, width, min_lap=MIN_LAP):
+    """
+    Yields wild bond courses bottom to top, each generated against the joints
+    of the course below (see wild_course). Only the previous course's joints
+    are kept, so the wall is never rescanned and memory stays constant.
+    """
+    below = None
+    for row_index in range(rows):
+        course = wild_course(seed, row_index, width, below, min_lap)
+        below = course_joints(*course)
+        yield course
+
+
+def wild_block(seed, first_row, end_row, width):
+    """
+    Generates courses first_row .. end_row - 1 of a wild wall.
+    """
+    return [wild_course(seed, row_index, width) for row_index in range(first_row, end_row)]
+
+
+def iter_wild_blocks_parallel(seed, rows, width, block_rows, workers=None):
+    """
+    Generates a wild wall across a process pool, one vertical block per task,
+    and yields the blocks (lists of courses) in bottom-to-top order.
+    """
+    starts = range(0, rows, block_rows)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(
+            wild_block,
+            [seed] * len(starts),
+            starts,
+            [min(start + block_rows, rows) for start in starts],
+            [width] * len(starts),
+        )